@@ -17,8 +17,22 @@ adapting agent periodically flushes its live parameters to a separate
 "<checkpoint>_adapted.pt" file (every --autosave-every updates, plus once
 more on a clean shutdown). On the *next* startup, that adapted file is
 preferred over the original if present, so online adaptation actually
-accumulates across restarts instead of resetting every time. A2C/A3C are
+accumulates across restarts instead of resetting every time. With
+--persistent-replay their replay buffers persist the same way: each is a
+memory-mapped "<checkpoint>_replay.bin" file (MmapReplayBuffer) that a
+restart simply maps back in, so updates resume at once from all the
+experience gathered so far instead of waiting for BATCH_SIZE fresh
+outcomes. A2C/A3C are
 served frozen (see FrozenPolicyAgent) and never have anything to persist.
+When scripts/export_policies.py has written a "<checkpoint>.npz" for one
+of them at least as new as its checkpoint, that frozen policy is served
+by resaco/numpy_policy.py's NumpyPolicy instead of a torch agent: a few
+NumPy matmuls per decision, no tensor setup or op dispatch. Failing that,
+a fresh "<checkpoint>_scripted.pt" (resaco/scripted_policy.py, a frozen
+TorchScript graph) is served by ScriptedPolicy; only with neither is the
+A2CAgent itself built. With --quantize, every algo served through a torch
+agent decides with an int8 copy of its actor instead, wherever that copy
+passes resaco/quantized_policy.py's greedy-agreement gate.
 
 Protocol (newline-delimited ASCII, one request per line):
 
@@ -26,6 +40,13 @@ Protocol (newline-delimited ASCII, one request per line):
       -> "<action_int>"
          action in {0..N+1}: 0=device, 1..N=edge server index, N+1=cloud
 
+  ACTN <algo> <n> <request_id_1> ... <request_id_n> <state_1> ... <state_n>
+      -> "<action_1> ... <action_n>"
+         n decisions in one round trip and one batched forward pass
+         (select_actions); each state is STATE_DIM values as in ACT, and
+         each request_id gets its own OUTCOME later, exactly as if it had
+         come through ACT.
+
   OUTCOME <algo> <request_id> <reward> <done:0|1> <next_state...>
       -> "OK" | "IGNORED"
          IGNORED means request_id was never seen by ACT for this algo (e.g.
@@ -38,9 +59,11 @@ Protocol (newline-delimited ASCII, one request per line):
       -> "PONG"
 
 <algo> is one of RESACO, SAC_BASELINE, DDPG_BASELINE, A2C_BASELINE,
-A3C_BASELINE. If that algorithm's checkpoint wasn't found at startup, ACT
-returns "ERROR unknown algo ..." and the Java client falls back to its
-static heuristic for that decision -- same as if the whole bridge were
+A3C_BASELINE -- or a distilled "<NAME>_TREE" (DISTILLED_REGISTRY), served
+only if scripts/distill_policy.py has written its "<checkpoint>_tree.npz".
+If that algorithm's checkpoint wasn't found at startup, ACT returns
+"ERROR unknown algo ..." and the Java client falls back to its static
+heuristic for that decision -- same as if the whole bridge were
 unreachable.
 
 A missing/unreachable server should never crash the simulator: the Java
@@ -48,33 +71,59 @@ client (ReSACOBridgeClient) falls back to a static policy on any I/O error.
 """
 
 import argparse
+import importlib
 import os
 import signal
 import socketserver
 import sys
 import threading
 
-import torch
-
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from resaco import config
-from resaco.deploy import DeploymentAgent, FrozenPolicyAgent
-from resaco.sac import SACAgent
-from resaco.baselines.ddpg import DDPGAgent
-from resaco.baselines.a2c import A2CAgent
+from resaco.deploy import FrozenPolicyAgent
+from resaco.distill import TreePolicy
+from resaco.numpy_policy import NumpyPolicy
+
+
+def _deferred(module: str, attr: str):
+    """A factory for `module.attr` that imports the module on first call.
+    The torch-backed agents and runtimes are reached only through these,
+    so a bridge serving nothing but NumPy exports and trees starts (and
+    runs) without importing torch."""
+    def factory(*args, **kwargs):
+        target = importlib.import_module(module)
+        for name in attr.split("."):
+            target = getattr(target, name)
+        return target(*args, **kwargs)
+    return factory
+
 
 # name -> (checkpoint filename, agent factory, wrapper factory, persist)
 # persist=True means the wrapper is a DeploymentAgent that keeps adapting
 # theta_adapt online and needs its own "<checkpoint>_adapted.pt" save slot;
 # False means a FrozenPolicyAgent (A2C/A3C), which never changes at runtime
 # and so has nothing to persist.
+_SACAgent = _deferred("resaco.sac", "SACAgent")
+_DeploymentAgent = _deferred("resaco.deploy", "DeploymentAgent")
 ALGO_REGISTRY = {
-    "RESACO": ("theta_star.pt", SACAgent, DeploymentAgent, True),
-    "SAC_BASELINE": ("sac_no_meta.pt", SACAgent, DeploymentAgent, True),
-    "DDPG_BASELINE": ("ddpg.pt", DDPGAgent, DeploymentAgent, True),
-    "A2C_BASELINE": ("a2c.pt", A2CAgent, FrozenPolicyAgent, False),
-    "A3C_BASELINE": ("a3c.pt", A2CAgent, FrozenPolicyAgent, False),
+    "RESACO": ("theta_star.pt", _SACAgent, _DeploymentAgent, True),
+    "SAC_BASELINE": ("sac_no_meta.pt", _SACAgent, _DeploymentAgent, True),
+    "DDPG_BASELINE": ("ddpg.pt", _deferred("resaco.baselines.ddpg", "DDPGAgent"), _DeploymentAgent, True),
+    "A2C_BASELINE": ("a2c.pt", _deferred("resaco.baselines.a2c", "A2CAgent"), FrozenPolicyAgent, False),
+    "A3C_BASELINE": ("a3c.pt", _deferred("resaco.baselines.a2c", "A2CAgent"), FrozenPolicyAgent, False),
+}
+
+# Distilled serving tier: name -> the ALGO_REGISTRY algo whose actor
+# scripts/distill_policy.py distilled into "<checkpoint>_tree.npz"
+# (resaco/distill.py's TreePolicy). Always frozen, and only served when
+# that file exists -- there is no untrained fallback for a distillation.
+DISTILLED_REGISTRY = {
+    "RESACO_TREE": "RESACO",
+    "SAC_TREE": "SAC_BASELINE",
+    "DDPG_TREE": "DDPG_BASELINE",
+    "A2C_TREE": "A2C_BASELINE",
+    "A3C_TREE": "A3C_BASELINE",
 }
 
 _agents = {}  # algo name -> DeploymentAgent | FrozenPolicyAgent
@@ -85,7 +134,16 @@ _agents = {}  # algo name -> DeploymentAgent | FrozenPolicyAgent
 # would otherwise serialize every algo's ACT/OUTCOME behind, say, RESACO's
 # training step or its autosave's blocking torch.save() -- a request for
 # SAC_BASELINE has no reason to wait on that.
-_locks = {algo: threading.Lock() for algo in ALGO_REGISTRY}
+_locks = {algo: threading.Lock() for algo in [*ALGO_REGISTRY, *DISTILLED_REGISTRY]}
+# algo name -> "numpy" | "torchscript" | "int8" | "torch" | "tree": what load_agents() serves it with
+_runtimes = {}
+
+# exported-policy runtimes for frozen algos, in order of preference:
+# (runtime name, file suffix replacing the checkpoint's ".pt", loader)
+EXPORTED_RUNTIMES = (
+    ("numpy", ".npz", NumpyPolicy.load),
+    ("torchscript", "_scripted.pt", _deferred("resaco.scripted_policy", "ScriptedPolicy.load")),
+)
 
 
 def _parse_floats(tokens):
@@ -132,6 +190,20 @@ class Handler(socketserver.StreamRequestHandler):
                 action = agent.select_action(state, request_id=request_id)
             return str(action)
 
+        if cmd == "ACTN":
+            algo, n = parts[1], int(parts[2])
+            agent = _agents.get(algo)
+            if agent is None:
+                return f"ERROR unknown algo {algo}"
+            request_ids = parts[3:3 + n]
+            values = _parse_floats(parts[3 + n:])
+            if n < 1 or len(request_ids) != n or len(values) != n * config.STATE_DIM:
+                return f"ERROR expected {n} request ids and {n} x {config.STATE_DIM} state values"
+            states = [values[i * config.STATE_DIM:(i + 1) * config.STATE_DIM] for i in range(n)]
+            with _locks[algo]:
+                actions = agent.select_actions(states, request_ids=request_ids)
+            return " ".join(str(a) for a in actions)
+
         if cmd == "OUTCOME":
             algo, request_id = parts[1], parts[2]
             agent = _agents.get(algo)
@@ -157,6 +229,8 @@ class Handler(socketserver.StreamRequestHandler):
                 return f"ERROR unknown algo {algo}"
             with _locks[algo]:
                 if path:
+                    import torch
+
                     torch.save(agent.state_dict(), path)
                 elif not agent.save():
                     return "ERROR no save_path configured for this algo -- pass an explicit path"
@@ -175,6 +249,26 @@ def _adapted_path(original_path: str) -> str:
     return f"{root}_adapted{ext}"
 
 
+def _replay_path(original_path: str) -> str:
+    root, _ = os.path.splitext(original_path)
+    return f"{root}_replay.bin"
+
+
+def _export_path(original_path: str, ext: str) -> str:
+    root, _ = os.path.splitext(original_path)
+    return f"{root}{ext}"
+
+
+def _fresh_export(original_path: str, ext: str):
+    """The checkpoint's exported policy file, if one exists that is at
+    least as new as the checkpoint itself (else None: a stale export would
+    silently serve an older policy)."""
+    path = _export_path(original_path, ext)
+    if not os.path.exists(path) or not os.path.exists(original_path):
+        return None
+    return path if os.path.getmtime(path) >= os.path.getmtime(original_path) else None
+
+
 def save_all_agents():
     """Flushes every agent's theta_adapt to its configured save_path (a
     no-op for algos with none, i.e. FrozenPolicyAgent-served A2C/A3C).
@@ -193,24 +287,69 @@ def save_all_agents():
     return saved
 
 
-def load_agents(checkpoints_dir: str, autosave_every: int = 50):
+def load_agents(checkpoints_dir: str, autosave_every: int = 50, prioritized_replay: bool = False,
+                persistent_replay: bool = False, compact_replay: bool = False,
+                replay_capacity: int = config.REPLAY_BUFFER_SIZE, exported_policies: bool = True,
+                quantize: bool = False, min_agreement: float = config.QUANT_MIN_AGREEMENT,
+                algos=None):
     """Loads each algo's checkpoint, preferring a prior online-adapted
     checkpoint ("<checkpoint>_adapted.pt") over the original meta-trained
     one if it exists, so accumulated online learning (Algorithm 4) survives
     a bridge restart instead of resetting to theta_star every time. Persist-
     capable agents (DeploymentAgent) are wired with save_path pointing at
     that adapted file so future adaptation keeps accumulating there; the
-    original checkpoint itself is never overwritten.
+    original checkpoint itself is never overwritten. `prioritized_replay`
+    gives those same agents a PrioritizedReplayBuffer for online updates;
+    `persistent_replay` (opt-in) keeps their replay buffers in memory-mapped
+    "<checkpoint>_replay.bin" files that outlive the process, and
+    `compact_replay`/`replay_capacity` set their storage mode and size.
+    With `exported_policies`, frozen algos whose checkpoint has a fresh
+    export are served from the first one found in EXPORTED_RUNTIMES order
+    (see _runtimes). `quantize` gives every algo still served by a torch
+    agent an int8 actor copy, gated at `min_agreement` greedy agreement on
+    one shared recorded state sample (algos failing it serve float32).
+    Distilled "<NAME>_TREE" algos are served for every "<checkpoint>_tree.npz"
+    present, and reported only through _runtimes. `algos` restricts serving
+    to those names (either registry; default all): torch is imported only
+    if one of them is served through a torch agent or TorchScript export.
     """
     loaded, resumed, missing = [], [], []
+    selected = set(algos) if algos is not None else set(ALGO_REGISTRY) | set(DISTILLED_REGISTRY)
+    for algo in set(ALGO_REGISTRY) | set(DISTILLED_REGISTRY):
+        if algo not in selected:
+            _agents.pop(algo, None)
+            _runtimes.pop(algo, None)
+    gate_states = None
+    if quantize:
+        gate_states = _deferred("resaco.quantized_policy", "record_gate_states")()
+    if persistent_replay:
+        os.makedirs(checkpoints_dir, exist_ok=True)
     for algo, (filename, agent_cls, wrapper_cls, persist) in ALGO_REGISTRY.items():
+        if algo not in selected:
+            continue
         original_path = os.path.join(checkpoints_dir, filename)
         adapted_path = _adapted_path(original_path)
+        exported = None
+        if exported_policies and not persist:
+            exported = next(((runtime, path, loader) for runtime, suffix, loader in EXPORTED_RUNTIMES
+                             for path in [_fresh_export(original_path, suffix)] if path), None)
+        if exported:
+            runtime, path, loader = exported
+            _agents[algo] = wrapper_cls(loader(path))
+            _runtimes[algo] = runtime
+            loaded.append(algo)
+            continue
         agent = agent_cls()
+        _runtimes[algo] = "torch"
 
         wrapper_kwargs = {}
+        if quantize:
+            wrapper_kwargs = {"quantize": True, "gate_states": gate_states, "min_agreement": min_agreement}
         if persist:
-            wrapper_kwargs = {"save_path": adapted_path, "autosave_every": autosave_every}
+            wrapper_kwargs.update({"save_path": adapted_path, "autosave_every": autosave_every,
+                                   "prioritized_replay": prioritized_replay,
+                                   "replay_path": _replay_path(original_path) if persistent_replay else None,
+                                   "compact_replay": compact_replay, "replay_capacity": replay_capacity})
 
         if persist and os.path.exists(adapted_path):
             load_path, bucket = adapted_path, resumed
@@ -220,6 +359,8 @@ def load_agents(checkpoints_dir: str, autosave_every: int = 50):
             load_path, bucket = None, missing
 
         if load_path:
+            import torch
+
             params = torch.load(load_path, map_location="cpu")
             _agents[algo] = wrapper_cls(agent, params, **wrapper_kwargs)
         else:
@@ -228,7 +369,20 @@ def load_agents(checkpoints_dir: str, autosave_every: int = 50):
             # runnable even before all baselines are trained, at the cost
             # of that algo's decisions being meaningless until retrained.
             _agents[algo] = wrapper_cls(agent, None, **wrapper_kwargs)
+        if _agents[algo].quantized:
+            _runtimes[algo] = "int8"
         bucket.append(algo)
+
+    for name, source_algo in DISTILLED_REGISTRY.items():
+        if name not in selected:
+            continue
+        tree_path = _export_path(os.path.join(checkpoints_dir, ALGO_REGISTRY[source_algo][0]), "_tree.npz")
+        if os.path.exists(tree_path):
+            _agents[name] = FrozenPolicyAgent(TreePolicy.load(tree_path))
+            _runtimes[name] = "tree"
+        else:
+            _agents.pop(name, None)
+            _runtimes.pop(name, None)
     return loaded, resumed, missing
 
 
@@ -242,13 +396,56 @@ def main():
                          help="Flush online-adapted checkpoints to disk every N successful "
                               "updates (RESACO/SAC_BASELINE/DDPG_BASELINE only). Also saved "
                               "once more on a clean shutdown.")
+    parser.add_argument("--prioritized-replay", action="store_true",
+                         help="Sample online updates by TD-error priority (with importance-"
+                              "sampling correction) instead of uniformly.")
+    parser.add_argument("--persistent-replay", action="store_true",
+                         help="Keep replay buffers in memory-mapped <checkpoint>_replay.bin files "
+                              "that survive a restart, instead of in process memory only.")
+    parser.add_argument("--compact-replay", action="store_true",
+                         help="Store replay states normalized, as float16 (about half the memory "
+                              "per transition, so more algos/capacity fit on one box).")
+    parser.add_argument("--replay-capacity", type=int, default=config.REPLAY_BUFFER_SIZE,
+                         help="Transitions each adapting algo's replay buffer holds.")
+    parser.add_argument("--no-exported-policies", action="store_true",
+                         help="Serve A2C/A3C through torch agents even when scripts/export_policies.py "
+                              "has written fresh <checkpoint>.npz / _scripted.pt exports.")
+    parser.add_argument("--quantize", action="store_true",
+                         help="Decide with int8 dynamically quantized actors wherever they agree with "
+                              "the float actor's greedy action on --min-agreement of recorded states.")
+    parser.add_argument("--min-agreement", type=float, default=config.QUANT_MIN_AGREEMENT,
+                         help="Greedy-agreement threshold for --quantize.")
+    parser.add_argument("--algos", nargs="+", choices=[*ALGO_REGISTRY, *DISTILLED_REGISTRY],
+                         help="Serve only these algos (default: all). A bridge serving only algos "
+                              "with NumPy exports and/or distilled trees never imports torch.")
     args = parser.parse_args()
 
-    loaded, resumed, missing = load_agents(args.checkpoints_dir, autosave_every=args.autosave_every)
+    loaded, resumed, missing = load_agents(args.checkpoints_dir, autosave_every=args.autosave_every,
+                                           prioritized_replay=args.prioritized_replay,
+                                           persistent_replay=args.persistent_replay,
+                                           compact_replay=args.compact_replay,
+                                           replay_capacity=args.replay_capacity,
+                                           exported_policies=not args.no_exported_policies,
+                                           quantize=args.quantize, min_agreement=args.min_agreement,
+                                           algos=args.algos)
     if resumed:
         print(f"Resumed online-adapted checkpoints for: {', '.join(resumed)}")
     if loaded:
         print(f"Loaded trained checkpoints for: {', '.join(loaded)}")
+    restored = {algo: len(_agents[algo].agent.replay_buffer) for algo, (*_, persist) in ALGO_REGISTRY.items()
+                if persist and algo in _agents and len(_agents[algo].agent.replay_buffer)}
+    if restored:
+        print("Restored replay buffers: " + ", ".join(f"{algo} ({n:,} transitions)"
+                                                      for algo, n in restored.items()))
+    exported = [f"{algo} ({runtime})" for algo, runtime in _runtimes.items() if runtime != "torch"]
+    if exported:
+        print(f"Serving exported policies for: {', '.join(exported)}")
+    if args.quantize:
+        for algo, agent in _agents.items():
+            if agent.quantization_agreement is None:
+                continue
+            verdict = "serving int8" if agent.quantized else "below threshold, serving float32"
+            print(f"  {algo}: int8 greedy agreement {agent.quantization_agreement:.1%} -- {verdict}")
     if missing:
         print(f"WARNING: no checkpoint found for {', '.join(missing)} in {args.checkpoints_dir} "
               f"-- serving randomly-initialized (untrained) policies for them. "
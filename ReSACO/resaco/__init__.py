@@ -1,3 +1,13 @@
-from . import config, env, networks, replay_buffer, reptile, sac, scenario, deploy
+"""Submodules are imported on first attribute access (PEP 562), so that
+torch-free pieces such as resaco.numpy_policy can be imported without
+pulling in torch through the rest of the package."""
 
-__all__ = ["config", "env", "networks", "replay_buffer", "reptile", "sac", "scenario", "deploy"]
+import importlib
+
+__all__ = ["config", "env", "vec_env", "networks", "replay_buffer", "reptile", "sac", "scenario", "deploy"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
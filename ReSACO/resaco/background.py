@@ -0,0 +1,301 @@
+"""Alternative background-load engines for resaco/env.py.
+
+MECOffloadEnv's default background model (_inject_background_load) admits
+one Poisson-sized lump of load per step, split 80/20 edge/cloud and spread
+evenly over the edge servers. The engines here replace that lump with a
+more explicit model, selected with MECOffloadEnv(background_mode=...):
+
+  "devices"  DeviceLevelBackground -- every task of the scenario's other
+             (number_of_mobile_devices - 1) devices is simulated
+             individually: each device a Poisson arrival process, each
+             task exponentially sized, admitted to a random edge
+             server (80%) or the cloud (20%) and released after its own
+             processing time.
+
+  "fluid"    FluidBackground -- no individual tasks at all: each pool's
+             background utilization follows the mean-field (fluid-limit)
+             ODE of the lump model in closed form, so a step costs
+             the same at 200 devices as at 2,000.
+
+An engine owns its background tasks' outstanding releases; the env keeps
+owning the agent's own tasks (its release heap) and the shared
+utilization array both write into.
+"""
+
+import bisect
+import heapq
+
+import numpy as np
+
+from . import config
+
+# Same 80/20 edge/cloud mix and saturation ceiling as
+# MECOffloadEnv._inject_background_load.
+EDGE_SHARE = 0.8
+
+
+class FluidBackground:
+    """Mean-field background load: the deterministic limit of
+    MECOffloadEnv._inject_background_load.
+
+    Background tasks reach an edge server at rate
+    lambda_e = 0.8 * D / (N * poisson_interarrival) and the cloud at
+    lambda_c = 0.2 * D / poisson_interarrival (D = number_of_mobile_devices
+    - 1), each holding vm_utilization_on_X = u percent. Each pool's
+    background utilization B follows
+
+        dB/dt = lambda * u - B / T,   so   B* = lambda * u * T,
+
+    which integrates exactly over a step of length dt:
+
+        B(t + dt) = B* + (B(t) - B*) * exp(-dt / T).
+
+    T is how long one background task shows up in the agent's state
+    under the lump model, which is not just its processing time
+    tau_X = task_length / X_MIPS. Each lump carries a whole inter-arrival
+    window of arrivals and is injected at the window's end. It stays
+    visible until the step after it expires, so T = tau_X + 2 * the mean
+    inter-arrival time. With that T, B* matches the lump model's mean
+    observed utilization below saturation (scripts/
+    validate_fluid_background.py checks it).
+
+    advance() applies the update to every pool at once, then clips so that
+    a pool's total utilization, including the agent's own tasks, stays
+    under the saturation ceiling, like the lump model's admission cap. The
+    mean is kept; the step-to-step noise is not.
+    """
+
+    def __init__(self, scenario, num_edge_servers: int, saturation_ceiling: float):
+        p = scenario.app_profile
+        devices = max(scenario.number_of_mobile_devices - 1, 0)
+        interarrival = max(p.poisson_interarrival, 0.1)
+        rate = devices / interarrival
+        self.n_slots = num_edge_servers + 2
+        self.ceiling = saturation_ceiling
+
+        edge_share = EDGE_SHARE if num_edge_servers > 0 else 0.0
+        self._exposure = np.full(self.n_slots, 2.0 * interarrival)
+        self._exposure[1:-1] += p.task_length / config.EDGE_VM_MIPS
+        self._exposure[-1] += p.task_length / config.CLOUD_VM_MIPS
+        self._equilibrium = np.zeros(self.n_slots)
+        if num_edge_servers > 0:
+            self._equilibrium[1:-1] = (edge_share * rate / num_edge_servers
+                                       * p.vm_utilization_on_edge * self._exposure[1:-1])
+        self._equilibrium[-1] = (1.0 - edge_share) * rate * p.vm_utilization_on_cloud * self._exposure[-1]
+
+        self.reset()
+
+    def reset(self):
+        self._time = 0.0
+        self.level = np.zeros(self.n_slots)
+
+    def advance(self, until: float, util: np.ndarray):
+        """Moves every pool's background utilization forward to time
+        `until`, updating the shared utilization array `util` in place."""
+        elapsed = until - self._time
+        self._time = until
+        if elapsed <= 0:
+            return
+        decay = np.exp(-elapsed / self._exposure)
+        level = self._equilibrium + (self.level - self._equilibrium) * decay
+        # cap: background may only fill what the agent's tasks leave free
+        # under the ceiling (and never goes negative)
+        np.clip(level, 0.0, np.maximum(0.0, self.ceiling - (util - self.level)), out=level)
+        util += level - self.level
+        self.level = level
+
+    def getstate(self):
+        return (self._time, self.level.copy())
+
+    def setstate(self, state):
+        self._time, level = state
+        self.level = level.copy()
+
+
+class DeviceLevelBackground:
+    """Vectorized discrete-event simulation of every background device.
+
+    State is a clock and a handful of arrays, never anything per device:
+    arrivals are drawn from the devices' merged arrival stream (see
+    _arrivals), and outstanding background tasks live in a release queue
+    of flat (release_time, slot, delta) arrays kept sorted by release
+    time -- the array form of a release heap: expiring is a prefix slice,
+    and a window's new releases are merged in with one searchsorted +
+    insert.
+    advance() handles a whole window of simulated time at once:
+
+      1. draw every arrival in the window from the merged stream: one
+         Poisson count and one vectorized draw of uniform times;
+      2. route each arrival (edge server chosen uniformly / cloud) and draw
+         its length, hence its would-be release time;
+      3. decide admission (see _admit) exactly as an arrival-by-arrival
+         event loop would, visiting only the slots that are contended;
+      4. queue the admitted tasks' releases and expire everything that has
+         finished by the window's end.
+
+    Cost grows with the number of events in the window (and past
+    saturation only with the admitted ones), not with the device count.
+    Admission sees the window-start utilization of the
+    agent's own tasks (their releases are the env's business and land at
+    its next step), but tracks background arrivals and releases to the
+    exact event time.
+    """
+
+    def __init__(self, scenario, num_edge_servers: int, saturation_ceiling: float, seed: int = None):
+        p = scenario.app_profile
+        self.n_devices = max(scenario.number_of_mobile_devices - 1, 0)
+        self.n_edge = num_edge_servers
+        self.n_slots = num_edge_servers + 2
+        self.ceiling = saturation_ceiling
+        self.rng = np.random.default_rng(seed)
+
+        self._interarrival = max(p.poisson_interarrival, 0.1)
+        self._arrival_rate = self.n_devices / self._interarrival  # merged over all D devices
+        self._mean_length = max(p.task_length, 1.0)
+        # per-slot admission size / speed, slot layout as MECOffloadEnv's
+        self._mu_required = np.array([0.0] + [p.vm_utilization_on_edge] * self.n_edge
+                                     + [p.vm_utilization_on_cloud])
+        self._mips = np.array([config.MOBILE_VM_MIPS] + [config.EDGE_VM_MIPS] * self.n_edge
+                              + [config.CLOUD_VM_MIPS], dtype=np.float64)
+
+        self.reset()
+
+    def reset(self):
+        self._time = 0.0  # background events are simulated up to here
+        self._rel_time = np.empty(0)
+        self._rel_slot = np.empty(0, dtype=np.int64)
+        self._rel_delta = np.empty(0)
+
+    @property
+    def pending(self) -> int:
+        return len(self._rel_time)
+
+    # ------------------------------------------------------------------
+    def _release(self, until: float, util: np.ndarray):
+        # the queue is time-sorted, so everything due is a prefix
+        n_due = int(np.searchsorted(self._rel_time, until, side="right"))
+        if n_due == 0:
+            return
+        util -= np.bincount(self._rel_slot[:n_due], weights=self._rel_delta[:n_due],
+                            minlength=self.n_slots)
+        np.maximum(util, 0.0, out=util)
+        self._rel_time = self._rel_time[n_due:]
+        self._rel_slot = self._rel_slot[n_due:]
+        self._rel_delta = self._rel_delta[n_due:]
+
+    def _arrivals(self, until: float) -> np.ndarray:
+        """Arrival times (unsorted) of every background task in
+        (last advance, until].
+
+        The D devices' arrival processes are independent and identical
+        Poisson processes, so their merged stream is exactly one Poisson
+        process of rate D / poisson_interarrival: the window holds a
+        Poisson-distributed count of arrivals at uniform times. That is
+        the time-ordered arrival queue with the per-device clocks
+        integrated out -- drawing it touches only the window's arrivals,
+        never the D devices.
+        """
+        elapsed = until - self._time
+        if elapsed <= 0:
+            return np.empty(0)
+        self._time = until
+        n = self.rng.poisson(self._arrival_rate * elapsed)
+        return until - elapsed * self.rng.random(n)
+
+    def _admit(self, arrivals, slots, release, util) -> np.ndarray:
+        """Boolean mask of the (time-sorted) arrivals an arrival-by-arrival
+        event loop would admit: arrival i gets in iff, at its arrival time,
+        its slot has room for one more task under the saturation ceiling --
+        counting the slot's window-start headroom, queued background tasks
+        that have finished by then, and earlier admitted arrivals that have.
+
+        A slot whose window arrivals all fit in its window-start headroom
+        admits them all at once (the usual case below saturation). Only a
+        contended slot runs the event loop, and even then it only visits
+        admissions and releases: while the slot is full, every arrival up to
+        the next release is rejected in one bisect. Admissions per window
+        are bounded by the slot's service capacity, so past saturation the
+        cost stops growing with device count.
+        """
+        n = len(arrivals)
+        admitted = np.ones(n, dtype=bool)
+        room = np.maximum(0.0, self.ceiling - util)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            capacity = np.where(self._mu_required > 0, np.floor(room / self._mu_required), 0.0)
+        counts = np.bincount(slots, minlength=self.n_slots)
+        contended = np.flatnonzero(counts > capacity)
+        if not len(contended):
+            return admitted
+
+        n_queued = int(np.searchsorted(self._rel_time, arrivals[-1], side="right"))
+        queued_time = self._rel_time[:n_queued]
+        queued_slot = self._rel_slot[:n_queued]
+        for slot in contended.tolist():
+            idx = np.flatnonzero(slots == slot)
+            times = arrivals[idx].tolist()
+            ends = release[idx].tolist()
+            running = queued_time[queued_slot == slot].tolist()  # already sorted: a valid heap
+            free = int(capacity[slot])
+            keep = []
+            i, m = 0, len(times)
+            # Finished tasks are popped lazily: a full slot still admits an
+            # arrival if its earliest-ending task is done by then, which
+            # just takes that task's place in the heap.
+            while i < m:
+                if free > 0:
+                    free -= 1
+                    heapq.heappush(running, ends[i])
+                elif not running:
+                    break
+                elif running[0] <= times[i]:
+                    heapq.heapreplace(running, ends[i])
+                else:
+                    i = bisect.bisect_left(times, running[0], i + 1)
+                    continue
+                keep.append(i)
+                i += 1
+            rejected = np.ones(m, dtype=bool)
+            rejected[keep] = False
+            admitted[idx[rejected]] = False
+        return admitted
+
+    def advance(self, until: float, util: np.ndarray):
+        """Simulates every background event up to time `until`, updating
+        the shared utilization array `util` (MECOffloadEnv's slot layout)
+        in place."""
+        if self.n_devices == 0:
+            return
+        arrivals = self._arrivals(until)
+        n = len(arrivals)
+        if n:
+            arrivals.sort()
+            if self.n_edge > 0:
+                to_edge = self.rng.random(n) < EDGE_SHARE
+                slots = np.where(to_edge, 1 + self.rng.integers(0, self.n_edge, n), self.n_slots - 1)
+            else:
+                slots = np.full(n, self.n_slots - 1)
+            lengths = np.maximum(self.rng.standard_exponential(n) * self._mean_length, 1.0)
+            release = arrivals + lengths / self._mips[slots]
+
+            admitted = self._admit(arrivals, slots, release, util)
+            slots, release = slots[admitted], release[admitted]
+            delta = self._mu_required[slots]
+            util += np.bincount(slots, weights=delta, minlength=self.n_slots)
+
+            by_release = np.argsort(release, kind="stable")
+            release, slots, delta = release[by_release], slots[by_release], delta[by_release]
+            at = np.searchsorted(self._rel_time, release, side="right")
+            self._rel_time = np.insert(self._rel_time, at, release)
+            self._rel_slot = np.insert(self._rel_slot, at, slots)
+            self._rel_delta = np.insert(self._rel_delta, at, delta)
+        self._release(until, util)
+
+    # ------------------------------------------------------------------
+    def getstate(self):
+        return (self.rng.bit_generator.state, self._time,
+                self._rel_time.copy(), self._rel_slot.copy(), self._rel_delta.copy())
+
+    def setstate(self, state):
+        generator_state, self._time, rel_time, rel_slot, rel_delta = state
+        self.rng.bit_generator.state = generator_state
+        self._rel_time, self._rel_slot, self._rel_delta = rel_time.copy(), rel_slot.copy(), rel_delta.copy()
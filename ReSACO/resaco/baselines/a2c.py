@@ -14,6 +14,7 @@ import torch
 import torch.nn as nn
 
 from .. import config
+from ..flat_params import FLAT_FORMAT, flatten_parameters, is_flat, load_parameter_vector, parameter_vector
 from ..networks import Actor
 from ..normalize import normalize_state
 
@@ -37,12 +38,19 @@ class ValueCritic(nn.Module):
 
 
 class A2CAgent:
+    """`flat_params=True` keeps the actor and critic in one contiguous
+    buffer each (resaco/flat_params.py), as for SACAgent."""
+
     def __init__(self, state_dim=config.STATE_DIM, action_dim=config.ACTION_DIM,
                  hidden_sizes=config.HIDDEN_SIZES, device="cpu",
-                 rollout_len: int = 20, entropy_coef: float = 0.01):
+                 rollout_len: int = 20, entropy_coef: float = 0.01, flat_params: bool = False):
         self.device = torch.device(device)
         self.actor = Actor(state_dim, action_dim, hidden_sizes).to(self.device)
         self.critic = ValueCritic(state_dim, hidden_sizes).to(self.device)
+        self.flat_params = flat_params
+        self._flat = {}
+        if flat_params:
+            self._flat = {"actor": flatten_parameters(self.actor), "critic": flatten_parameters(self.critic)}
 
         self.actor_optim = torch.optim.Adam(self.actor.parameters(), lr=config.A2C_LR)
         self.critic_optim = torch.optim.Adam(self.critic.parameters(), lr=config.A2C_LR)
@@ -53,12 +61,19 @@ class A2CAgent:
 
     # ------------------------------------------------------------------
     def get_params(self):
+        if self.flat_params:
+            return {"format": FLAT_FORMAT, "actor": parameter_vector(self.actor, self._flat["actor"]),
+                    "critic": parameter_vector(self.critic, self._flat["critic"])}
         return {
             "actor": copy.deepcopy(self.actor.state_dict()),
             "critic": copy.deepcopy(self.critic.state_dict()),
         }
 
     def load_params(self, params):
+        if is_flat(params):
+            for name in ("actor", "critic"):
+                load_parameter_vector(getattr(self, name), params[name], self._flat.get(name))
+            return
         self.actor.load_state_dict(params["actor"])
         self.critic.load_state_dict(params["critic"])
 
@@ -72,6 +87,17 @@ class A2CAgent:
                 action, _, _ = self.actor.sample(state_t)
         return int(action.item())
 
+    def select_actions(self, states, greedy: bool = False):
+        """select_action() for a (B, STATE_DIM) batch of states in one
+        forward pass. Returns a (B,) int64 NumPy array."""
+        states_t = torch.as_tensor(normalize_state(states), dtype=torch.float32, device=self.device)
+        with torch.no_grad():
+            if greedy:
+                actions = self.actor.act_greedy(states_t)
+            else:
+                actions, _, _ = self.actor.sample(states_t)
+        return actions.cpu().numpy()
+
     # ------------------------------------------------------------------
     def _rollout(self, env, state):
         states, actions, rewards, dones = [], [], [], []
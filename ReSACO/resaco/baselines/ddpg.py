@@ -21,6 +21,8 @@ import torch.nn as nn
 import torch.nn.functional as F
 
 from .. import config
+from ..compiled import CompiledOrEager
+from ..flat_params import FLAT_FORMAT, flatten_parameters, is_flat, load_parameter_vector, parameter_vector
 from ..networks import Actor
 from ..normalize import normalize_state
 from ..replay_buffer import ReplayBuffer
@@ -45,9 +47,16 @@ class QCritic(nn.Module):
 
 
 class DDPGAgent:
+    """`use_compile=True` runs the critic and actor losses through
+    torch.compile (resaco/compiled.py), and `flat_params=True` keeps each
+    network (and target) in one contiguous buffer (resaco/flat_params.py),
+    as for SACAgent."""
+
     def __init__(self, state_dim=config.STATE_DIM, action_dim=config.ACTION_DIM,
                  hidden_sizes=config.HIDDEN_SIZES, device="cpu",
-                 epsilon_start=1.0, epsilon_end=0.05, epsilon_decay_steps=5000):
+                 epsilon_start=1.0, epsilon_end=0.05, epsilon_decay_steps=5000,
+                 use_compile: bool = False, compile_backend: str = config.COMPILE_BACKEND,
+                 flat_params: bool = False):
         self.device = torch.device(device)
         self.action_dim = action_dim
 
@@ -55,6 +64,11 @@ class DDPGAgent:
         self.critic = QCritic(state_dim, action_dim, hidden_sizes).to(self.device)
         self.target_actor = copy.deepcopy(self.actor)
         self.target_critic = copy.deepcopy(self.critic)
+        self.flat_params = flat_params
+        self._flat = {}
+        if flat_params:
+            self._flat = {name: flatten_parameters(getattr(self, name))
+                          for name in ("actor", "critic", "target_actor", "target_critic")}
 
         self.actor_optim = torch.optim.Adam(self.actor.parameters(), lr=config.DDPG_ACTOR_LR)
         self.critic_optim = torch.optim.Adam(self.critic.parameters(), lr=config.DDPG_CRITIC_LR)
@@ -67,14 +81,25 @@ class DDPGAgent:
         self.epsilon_end = epsilon_end
         self.epsilon_decay = (epsilon_start - epsilon_end) / max(epsilon_decay_steps, 1)
 
+        self._critic_loss_fn = CompiledOrEager(self._critic_loss, use_compile, compile_backend)
+        self._actor_loss_fn = CompiledOrEager(self._actor_loss, use_compile, compile_backend)
+
     # ------------------------------------------------------------------
     def get_params(self):
+        if self.flat_params:
+            return {"format": FLAT_FORMAT, "actor": parameter_vector(self.actor, self._flat["actor"]),
+                    "critic": parameter_vector(self.critic, self._flat["critic"])}
         return {
             "actor": copy.deepcopy(self.actor.state_dict()),
             "critic": copy.deepcopy(self.critic.state_dict()),
         }
 
     def load_params(self, params):
+        if is_flat(params):
+            for name, group in (("actor", "actor"), ("critic", "critic"),
+                                ("target_actor", "actor"), ("target_critic", "critic")):
+                load_parameter_vector(getattr(self, name), params[group], self._flat.get(name))
+            return
         self.actor.load_state_dict(params["actor"])
         self.critic.load_state_dict(params["critic"])
         self.target_actor.load_state_dict(params["actor"])
@@ -89,6 +114,20 @@ class DDPGAgent:
             action = self.actor.act_greedy(state_t)
         return int(action.item())
 
+    def select_actions(self, states, greedy: bool = False):
+        """select_action() for a (B, STATE_DIM) batch of states: one greedy
+        forward pass, then (unless greedy) each row independently replaced
+        by a uniform random action with probability epsilon. Returns a (B,)
+        int64 NumPy array."""
+        states_t = torch.as_tensor(normalize_state(states), dtype=torch.float32, device=self.device)
+        with torch.no_grad():
+            actions = self.actor.act_greedy(states_t).cpu().numpy()
+        if not greedy:
+            for i in range(len(actions)):
+                if random.random() < self.epsilon:
+                    actions[i] = random.randrange(self.action_dim)
+        return actions
+
     def _decay_epsilon(self):
         self.epsilon = max(self.epsilon_end, self.epsilon - self.epsilon_decay)
 
@@ -97,30 +136,30 @@ class DDPGAgent:
         if len(self.replay_buffer) < batch_size:
             return None
 
-        state, action, reward, next_state, done = self.replay_buffer.sample(batch_size)
-        state = torch.as_tensor(normalize_state(state), dtype=torch.float32, device=self.device)
+        batch = self.replay_buffer.sample(batch_size)
+        state, action, reward, next_state, done = batch[:5]
+        if not self.replay_buffer.prenormalized:  # compact buffers normalize once, on push
+            state, next_state = normalize_state(state), normalize_state(next_state)
+        state = torch.as_tensor(state, dtype=torch.float32, device=self.device)
         action = torch.as_tensor(action, dtype=torch.long, device=self.device)
         reward = torch.as_tensor(reward, dtype=torch.float32, device=self.device)
-        next_state = torch.as_tensor(normalize_state(next_state), dtype=torch.float32, device=self.device)
+        next_state = torch.as_tensor(next_state, dtype=torch.float32, device=self.device)
         done = torch.as_tensor(done, dtype=torch.float32, device=self.device)
 
         # --- critic update ---
-        with torch.no_grad():
-            next_action_vec = F.softmax(self.target_actor.logits(next_state), dim=-1)
-            target_q = self.target_critic(next_state, next_action_vec)
-            y = reward + self.gamma * (1.0 - done) * target_q
-
-        action_one_hot = F.one_hot(action, num_classes=self.action_dim).float()
-        q = self.critic(state, action_one_hot)
-        critic_loss = F.mse_loss(q, y)
+        weights = None
+        if self.replay_buffer.prioritized:
+            weights = torch.as_tensor(batch[5], dtype=torch.float32, device=self.device)
+        critic_loss, td_error = self._critic_loss_fn(state, action, reward, next_state, done, weights)
+        if weights is not None:
+            self.replay_buffer.update_priorities(batch[6], td_error.cpu().numpy())
 
         self.critic_optim.zero_grad()
         critic_loss.backward()
         self.critic_optim.step()
 
         # --- actor update: maximize Q(s, softmax(actor(s))) ---
-        action_vec = F.softmax(self.actor.logits(state), dim=-1)
-        actor_loss = -self.critic(state, action_vec).mean()
+        actor_loss = self._actor_loss_fn(state)
 
         self.actor_optim.zero_grad()
         actor_loss.backward()
@@ -128,14 +167,36 @@ class DDPGAgent:
 
         # --- soft-update targets ---
         with torch.no_grad():
-            for tp, p in zip(self.target_actor.parameters(), self.actor.parameters()):
-                tp.mul_(self.rho).add_(p, alpha=1 - self.rho)
-            for tp, p in zip(self.target_critic.parameters(), self.critic.parameters()):
-                tp.mul_(self.rho).add_(p, alpha=1 - self.rho)
+            if self.flat_params:
+                self._flat["target_actor"].mul_(self.rho).add_(self._flat["actor"], alpha=1 - self.rho)
+                self._flat["target_critic"].mul_(self.rho).add_(self._flat["critic"], alpha=1 - self.rho)
+            else:
+                for tp, p in zip(self.target_actor.parameters(), self.actor.parameters()):
+                    tp.mul_(self.rho).add_(p, alpha=1 - self.rho)
+                for tp, p in zip(self.target_critic.parameters(), self.critic.parameters()):
+                    tp.mul_(self.rho).add_(p, alpha=1 - self.rho)
 
         self._decay_epsilon()
         return {"critic_loss": float(critic_loss.item()), "actor_loss": float(actor_loss.item())}
 
+    def _critic_loss(self, state, action, reward, next_state, done, weights=None):
+        with torch.no_grad():
+            next_action_vec = F.softmax(self.target_actor.logits(next_state), dim=-1)
+            target_q = self.target_critic(next_state, next_action_vec)
+            y = reward + self.gamma * (1.0 - done) * target_q
+
+        action_one_hot = F.one_hot(action, num_classes=self.action_dim).float()
+        q = self.critic(state, action_one_hot)
+        if weights is None:
+            critic_loss = F.mse_loss(q, y)
+        else:
+            critic_loss = (weights * (q - y) ** 2).mean()
+        return critic_loss, (q - y).abs().detach()
+
+    def _actor_loss(self, state):
+        action_vec = F.softmax(self.actor.logits(state), dim=-1)
+        return -self.critic(state, action_vec).mean()
+
     # ------------------------------------------------------------------
     def train_loop(self, env, num_transitions: int):
         state = env.reset()
@@ -0,0 +1,59 @@
+"""Opt-in torch.compile for the agents' loss computations.
+
+A SAC or DDPG update is a chain of small ops on tiny tensors (BATCH_SIZE=64,
+128-wide MLPs), so Python dispatch costs more than the FLOPs. Compiling the
+loss functions -- forward pass plus, via AOTAutograd, the matching backward
+graph -- fuses that chain. Only the pure loss functions are compiled; the
+optimizer steps and soft target updates stay eager, so a compiled function
+has no side effects and can always be re-run eagerly.
+
+CompiledOrEager falls back to eager silently and for good: when
+torch.compile doesn't exist, when wrapping fails, or when the first
+compiled call raises (no C compiler for inductor, an unsupported op, ...).
+After that first call succeeds, only a compiler error (a recompile failing)
+falls back; any other exception is a real error in the loss and is
+re-raised. A real error on the first call surfaces too, from the eager
+re-run.
+"""
+
+import torch
+
+from . import config
+
+
+class CompiledOrEager:
+    """Calls `fn` through torch.compile(fn, backend=backend) if `enabled`,
+    falling back to plain `fn` on any compilation failure. `active` tells
+    whether the compiled path is (still) in use.
+
+    torch.compile caches its compiled graphs per function and guards them
+    on the identity of the modules/parameters they read, so reuse the same
+    agent (as reptile.outer_loop does) rather than building a new one, or
+    every new agent pays compilation again."""
+
+    def __init__(self, fn, enabled: bool = False, backend: str = config.COMPILE_BACKEND):
+        self.fn = fn
+        self._compiled = None
+        self._first_call = True
+        if enabled and hasattr(torch, "compile"):
+            try:
+                self._compiled = torch.compile(fn, backend=backend, dynamic=False)
+            except Exception:
+                self._compiled = None
+
+    @property
+    def active(self) -> bool:
+        return self._compiled is not None
+
+    def __call__(self, *args):
+        if self._compiled is not None:
+            try:
+                result = self._compiled(*args)
+            except Exception as exc:
+                if not (self._first_call or isinstance(exc, torch._dynamo.exc.TorchDynamoException)):
+                    raise
+                self._compiled = None
+            else:
+                self._first_call = False
+                return result
+        return self.fn(*args)
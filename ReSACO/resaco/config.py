@@ -65,6 +65,12 @@ NUM_META_SCENARIOS = 10   # M
 NUM_OUTER_ITERATIONS = 300  # K
 NUM_INNER_SAC_UPDATES = 50  # N
 
+# Batched Reptile (reptile.outer_loop): Inner Loops per outer step, all from
+# the same theta, and the worker processes that run them. 1 and 0 are the
+# paper's serial Algorithm 1.
+META_BATCH_SIZE = 1
+META_NUM_WORKERS = 0
+
 HIDDEN_SIZES = (128, 128)
 
 # ----------------------------------------------------------------------------
@@ -85,3 +91,37 @@ DDPG_CRITIC_LR = 1e-3
 # LR is the typical choice for both (used here by both A2C and the A2CAgent
 # A3C's global model gets wrapped into).
 A2C_LR = 7e-4
+
+# ----------------------------------------------------------------------------
+# Warm-start cache (resaco/warm_start.py): burned-in env states reset() can
+# start from instead of an empty cluster.
+# ----------------------------------------------------------------------------
+WARM_START_BURN_IN_STEPS = 300  # env steps before the first recorded state
+WARM_START_NUM_STATES = 64      # states kept per (app, device count)
+WARM_START_STRIDE = 10          # env steps between recorded states
+
+# ----------------------------------------------------------------------------
+# Prioritized replay (resaco/replay_buffer.py's PrioritizedReplayBuffer),
+# opt-in for online adaptation in the bridge.
+# ----------------------------------------------------------------------------
+PER_ALPHA = 0.6          # how strongly priorities skew sampling (0 = uniform)
+PER_BETA_START = 0.4     # initial importance-sampling correction exponent
+PER_BETA_STEPS = 10_000  # sample() calls over which beta anneals to 1
+PER_EPS = 1e-6           # keeps zero-TD-error transitions sampleable
+
+# ----------------------------------------------------------------------------
+# Opt-in compiled update step (resaco/compiled.py; SACAgent/DDPGAgent
+# use_compile=True). "inductor" generates fused C++ kernels on CPU; it needs
+# a C compiler and tens of seconds of one-time compilation per process.
+# ----------------------------------------------------------------------------
+COMPILE_BACKEND = "inductor"
+
+# ----------------------------------------------------------------------------
+# Opt-in int8 serving (resaco/quantized_policy.py): a dynamically quantized
+# actor copy is only served if its greedy actions agree with the float
+# actor's on at least QUANT_MIN_AGREEMENT of a recorded state sample.
+# ----------------------------------------------------------------------------
+QUANT_MIN_AGREEMENT = 0.98
+QUANT_GATE_STATES = 2000   # states recorded from MECOffloadEnv rollouts for the gate
+QUANT_GATE_SCENARIOS = 8   # sample_scenario_pool() scenarios those rollouts cover
+QUANT_REFRESH_EVERY = 50   # DeploymentAgent: re-quantize (and re-gate) every N online updates
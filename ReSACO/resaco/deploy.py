@@ -6,11 +6,14 @@ online-update rule.
 These wrap the object the Java-side inference bridge
 (bridge/inference_server.py) uses at runtime -- one instance per served
 algorithm (ReSACO, SAC baseline, DDPG baseline, A2C baseline, A3C baseline).
-"""
 
-import torch
+torch and resaco/quantized_policy.py are imported only where they are
+used (save(), quantize=True), so FrozenPolicyAgent can wrap a torch-free
+runtime (NumpyPolicy, TreePolicy) without importing torch.
+"""
 
 from . import config
+from .replay_buffer import make_replay_buffer
 
 
 class DeploymentAgent:
@@ -28,23 +31,91 @@ class DeploymentAgent:
     theta_adapt back to disk every N successful updates, and `save()` can
     also be called directly (e.g. from a shutdown handler) to flush
     whatever's been learned so far.
+
+    `prioritized_replay=True` swaps the agent's uniform replay buffer for a
+    PrioritizedReplayBuffer of the same capacity: each update then replays
+    the transitions the critics currently get most wrong (importance-
+    weighted to stay unbiased), so online adaptation gets more out of every
+    gradient step taken on the serving path.
+
+    `replay_path` backs the replay buffer with a memory-mapped file
+    (MmapReplayBuffer) instead, so the experience it has gathered survives
+    a restart along with theta_adapt; save() flushes it to disk as well.
+    `compact_replay` stores it prenormalized in float16 (about half the
+    bytes per transition), and `replay_capacity` overrides its size.
+
+    `quantize=True` makes decisions with an int8 copy of the actor
+    (resaco/quantized_policy.py) while updates keep training the float
+    one. The copy is rebuilt every `requantize_every` online updates, and
+    each rebuild must pass the greedy-agreement gate on `gate_states`
+    (recorded env states; recorded here if not given) -- while it doesn't,
+    decisions fall back to the float actor. `quantization_agreement` holds
+    the last gate result.
     """
 
     def __init__(self, agent, params: dict = None, save_path: str = None,
-                 autosave_every: int = 50):
+                 autosave_every: int = 50, prioritized_replay: bool = False,
+                 replay_path: str = None, compact_replay: bool = False,
+                 replay_capacity: int = None, quantize: bool = False, gate_states=None,
+                 min_agreement: float = config.QUANT_MIN_AGREEMENT,
+                 requantize_every: int = config.QUANT_REFRESH_EVERY):
         self.agent = agent
+        if prioritized_replay or replay_path or compact_replay or replay_capacity:
+            self.agent.replay_buffer = make_replay_buffer(
+                replay_capacity or agent.replay_buffer.capacity, prioritized_replay, replay_path,
+                prenormalized=compact_replay)
         if params is not None:
             self.agent.load_params(params)  # theta* -> theta_adapt (line 1)
         self._pending = {}  # correlate an in-flight decision with its later outcome
         self.save_path = save_path
         self.autosave_every = autosave_every
         self._updates_since_save = 0
+        self.quantize = quantize
+        self.min_agreement = min_agreement
+        self.requantize_every = requantize_every
+        if quantize and gate_states is None:
+            from .quantized_policy import record_gate_states
+
+            gate_states = record_gate_states()
+        self.gate_states = gate_states
+        self.quantization_agreement = None
+        self._policy = self.agent  # what decisions run on: the agent, or its gated int8 copy
+        self._updates_since_quantize = 0
+        if quantize:
+            self._requantize()
+
+    def _requantize(self):
+        from .quantized_policy import QuantizationGateError, QuantizedPolicy
+
+        epsilon_from = self.agent if hasattr(self.agent, "epsilon") else None
+        try:
+            self._policy = QuantizedPolicy.gated(self.agent.actor, self.gate_states, self.min_agreement,
+                                                 epsilon_from=epsilon_from)
+            self.quantization_agreement = self._policy.agreement
+        except QuantizationGateError as exc:
+            self._policy = self.agent
+            self.quantization_agreement = exc.agreement
+        self._updates_since_quantize = 0
+
+    @property
+    def quantized(self) -> bool:
+        """Whether decisions currently run on the int8 actor copy."""
+        return self._policy is not self.agent
 
     def select_action(self, state, request_id, greedy: bool = False) -> int:
-        action = self.agent.select_action(state, greedy=greedy)
+        action = self._policy.select_action(state, greedy=greedy)
         self._pending[request_id] = (state, action)
         return action
 
+    def select_actions(self, states, request_ids, greedy: bool = False):
+        """select_action() for several in-flight requests at once, with one
+        forward pass of the agent's select_actions(). Returns a list of
+        ints, one per request id."""
+        actions = self._policy.select_actions(states, greedy=greedy).tolist()
+        for request_id, state, action in zip(request_ids, states, actions):
+            self._pending[request_id] = (state, action)
+        return actions
+
     def report_outcome(self, request_id, reward: float, next_state, done: bool = False,
                         min_buffer_before_update: int = config.BATCH_SIZE):
         """Called once a task's real outcome (success/failure, service time)
@@ -70,16 +141,24 @@ class DeploymentAgent:
         if len(self.agent.replay_buffer) >= min_buffer_before_update:
             update_result = self.agent.update()
             self._updates_since_save += 1
+            self._updates_since_quantize += 1
+            if self.quantize and self._updates_since_quantize >= self.requantize_every:
+                self._requantize()
             if self.save_path and self.autosave_every and self._updates_since_save >= self.autosave_every:
                 self.save()
         return {"recorded": True, "update": update_result}
 
     def save(self) -> bool:
-        """Flushes theta_adapt to `self.save_path`. Returns False (no-op)
-        if no save_path was configured."""
+        """Flushes theta_adapt to `self.save_path` (and a memory-mapped
+        replay buffer to its file). Returns False (no-op) if no save_path
+        was configured."""
         if not self.save_path:
             return False
+        import torch
+
         torch.save(self.agent.get_params(), self.save_path)
+        if hasattr(self.agent.replay_buffer, "flush"):
+            self.agent.replay_buffer.flush()
         self._updates_since_save = 0
         return True
 
@@ -96,17 +175,43 @@ class FrozenPolicyAgent:
     arbitrarily-delayed, possibly-out-of-order outcome callback from the
     simulator), so report_outcome here is a no-op: the served policy stays
     exactly as trained by scripts/train_baselines.py.
+
+    `quantize=True` serves an int8 copy of the actor instead, if it passes
+    the greedy-agreement gate on `gate_states` (see DeploymentAgent);
+    otherwise the float actor keeps serving. `quantization_agreement`
+    holds the gate result.
     """
 
-    def __init__(self, agent, params: dict = None):
+    def __init__(self, agent, params: dict = None, quantize: bool = False, gate_states=None,
+                 min_agreement: float = config.QUANT_MIN_AGREEMENT):
         self.agent = agent
         if params is not None:
             self.agent.load_params(params)
         self._seen = set()  # request ids we actually decided, for accurate IGNORED reporting
+        self._policy = self.agent
+        self.quantization_agreement = None
+        if quantize:
+            from .quantized_policy import QuantizationGateError, QuantizedPolicy, record_gate_states
+
+            try:
+                self._policy = QuantizedPolicy.gated(
+                    self.agent.actor, gate_states if gate_states is not None else record_gate_states(),
+                    min_agreement)
+                self.quantization_agreement = self._policy.agreement
+            except QuantizationGateError as exc:
+                self.quantization_agreement = exc.agreement
+
+    @property
+    def quantized(self) -> bool:
+        return self._policy is not self.agent
 
     def select_action(self, state, request_id, greedy: bool = True) -> int:
         self._seen.add(request_id)
-        return self.agent.select_action(state, greedy=greedy)
+        return self._policy.select_action(state, greedy=greedy)
+
+    def select_actions(self, states, request_ids, greedy: bool = True):
+        self._seen.update(request_ids)
+        return self._policy.select_actions(states, greedy=greedy).tolist()
 
     def report_outcome(self, request_id, reward: float, next_state, done: bool = False):
         if request_id not in self._seen:
@@ -0,0 +1,172 @@
+"""Policy distillation: a trained actor's greedy policy as a compact
+decision tree, for serving where even a small MLP forward is too slow.
+
+collect_states() rolls MECOffloadEnv across a sample_scenario_pool with
+the teacher acting (epsilon-mixed with uniform random actions, so states
+just off the teacher's own trajectories are covered too); the teacher's
+greedy select_actions() labels them; fit_tree() grows a CART
+classification tree (Gini impurity, axis-aligned thresholds on raw
+state features) in plain NumPy. TreePolicy evaluates the result with a
+few array lookups per level, has the agents' select_action /
+select_actions interface, and saves to / loads from a small .npz --
+importing it needs no torch, like resaco/numpy_policy.py. Greedy
+agreement with the teacher on held-out states is the distillation's
+quality measure (scripts/distill_policy.py reports it).
+"""
+
+import numpy as np
+
+from . import config
+from .env import MECOffloadEnv
+from .scenario import sample_scenario_pool
+
+TREE_FORMAT = "tree-policy-v1"
+_LEAF = -1
+
+
+def collect_states(teacher, num_states: int, num_scenarios: int = 8, seed: int = 0,
+                   epsilon: float = 0.2) -> np.ndarray:
+    """(num_states, STATE_DIM) raw states visited by `teacher`'s greedy
+    policy, with probability `epsilon` per step of a uniform random action
+    instead; an equal share from each of `num_scenarios` scenarios."""
+    rng = np.random.default_rng(seed)
+    scenarios = sample_scenario_pool(num_scenarios, seed=seed)
+    per_scenario = -(-num_states // num_scenarios)
+    states = []
+    for i, scenario in enumerate(scenarios):
+        env = MECOffloadEnv(scenario, seed=seed + i)
+        state = env.reset()
+        for _ in range(per_scenario):
+            states.append(state)
+            if rng.random() < epsilon:
+                action = int(rng.integers(config.ACTION_DIM))
+            else:
+                action = teacher.select_action(state, greedy=True)
+            state, _, done, _ = env.step(action)
+            if done:
+                state = env.reset()
+    return np.asarray(states[:num_states], dtype=np.float32)
+
+
+def _best_split(x, y, num_classes, min_samples_leaf):
+    """(feature, threshold, gini gain) of the best axis-aligned split of
+    (x, y), or None if no split leaves min_samples_leaf on both sides and
+    lowers impurity."""
+    n = len(y)
+    total = np.bincount(y, minlength=num_classes).astype(np.float64)
+    parent = 1.0 - np.sum((total / n) ** 2)
+    best = None
+    sizes = np.arange(1, n, dtype=np.float64)  # left-side size after each sorted prefix
+    for feature in range(x.shape[1]):
+        order = np.argsort(x[:, feature], kind="stable")
+        xs = x[order, feature]
+        # left-side class counts after each prefix of the sorted samples
+        left = np.cumsum(np.eye(num_classes)[y[order]], axis=0)[:-1]
+        right = total - left
+        gini_left = 1.0 - np.sum((left / sizes[:, None]) ** 2, axis=1)
+        gini_right = 1.0 - np.sum((right / (n - sizes)[:, None]) ** 2, axis=1)
+        impurity = (sizes * gini_left + (n - sizes) * gini_right) / n
+        valid = (xs[1:] > xs[:-1]) & (sizes >= min_samples_leaf) & (n - sizes >= min_samples_leaf)
+        if not valid.any():
+            continue
+        impurity = np.where(valid, impurity, np.inf)
+        i = int(np.argmin(impurity))
+        gain = parent - impurity[i]
+        if gain > 1e-12 and (best is None or gain > best[2]):
+            best = (feature, float((xs[i] + xs[i + 1]) / 2), gain)
+    return best
+
+
+def fit_tree(states, labels, max_depth: int = 10, min_samples_leaf: int = 5,
+             num_classes: int = config.ACTION_DIM) -> "TreePolicy":
+    """Grows a CART classifier on raw (N, STATE_DIM) `states` and integer
+    action `labels`, depth-first, to at most `max_depth` levels."""
+    x = np.asarray(states, dtype=np.float32)
+    y = np.asarray(labels, dtype=np.int64)
+    feature, threshold, left, right, value = [], [], [], [], []
+
+    def grow(idx, depth):
+        node = len(feature)
+        counts = np.bincount(y[idx], minlength=num_classes)
+        feature.append(_LEAF)
+        threshold.append(0.0)
+        left.append(_LEAF)
+        right.append(_LEAF)
+        value.append(int(np.argmax(counts)))
+        if depth >= max_depth or counts.max() == len(idx) or len(idx) < 2 * min_samples_leaf:
+            return node
+        split = _best_split(x[idx], y[idx], num_classes, min_samples_leaf)
+        if split is None:
+            return node
+        feature[node], threshold[node] = split[0], split[1]
+        go_left = x[idx, split[0]] <= split[1]
+        left[node] = grow(idx[go_left], depth + 1)
+        right[node] = grow(idx[~go_left], depth + 1)
+        return node
+
+    grow(np.arange(len(y)), 0)
+    return TreePolicy(feature, threshold, left, right, value)
+
+
+class TreePolicy:
+    """A fitted decision tree over raw states. Decisions are always the
+    tree's (greedy) action; `greedy` is accepted for interface parity."""
+
+    def __init__(self, feature, threshold, left, right, value):
+        self.feature = np.asarray(feature, dtype=np.int64)
+        self.threshold = np.asarray(threshold, dtype=np.float32)
+        self.left = np.asarray(left, dtype=np.int64)
+        self.right = np.asarray(right, dtype=np.int64)
+        self.value = np.asarray(value, dtype=np.int64)
+        # plain lists for the per-decision Python loop: faster to index than arrays
+        self._nodes = list(zip(self.feature.tolist(), self.threshold.tolist(),
+                               self.left.tolist(), self.right.tolist(), self.value.tolist()))
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.feature)
+
+    @property
+    def depth(self) -> int:
+        depths = np.zeros(self.num_nodes, dtype=np.int64)
+        for node in range(self.num_nodes):  # children always come after their parent
+            if self.feature[node] != _LEAF:
+                depths[self.left[node]] = depths[self.right[node]] = depths[node] + 1
+        return int(depths.max())
+
+    def select_action(self, state, greedy: bool = True) -> int:
+        nodes = self._nodes
+        feature, threshold, left, right, value = nodes[0]
+        while feature != _LEAF:
+            feature, threshold, left, right, value = nodes[left if state[feature] <= threshold else right]
+        return value
+
+    def select_actions(self, states, greedy: bool = True):
+        """(B,) int64 actions for a (B, STATE_DIM) batch, every row
+        descending one level per vectorized step."""
+        x = np.asarray(states, dtype=np.float32)
+        node = np.zeros(len(x), dtype=np.int64)
+        rows = np.arange(len(x))
+        while True:
+            feature = self.feature[node]
+            inner = feature != _LEAF
+            if not inner.any():
+                return self.value[node]
+            go_left = x[rows[inner], feature[inner]] <= self.threshold[node[inner]]
+            node[inner] = np.where(go_left, self.left[node[inner]], self.right[node[inner]])
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            np.savez(f, format=np.array(TREE_FORMAT), feature=self.feature, threshold=self.threshold,
+                     left=self.left, right=self.right, value=self.value)
+
+    @classmethod
+    def load(cls, path: str):
+        with np.load(path) as data:
+            if str(data["format"]) != TREE_FORMAT:
+                raise ValueError(f"{path} is not a {TREE_FORMAT} policy")
+            return cls(data["feature"], data["threshold"], data["left"], data["right"], data["value"])
+
+    def get_params(self):
+        return {"format": TREE_FORMAT, "feature": self.feature, "threshold": self.threshold,
+                "left": self.left, "right": self.right, "value": self.value}
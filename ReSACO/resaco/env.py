@@ -13,6 +13,9 @@ Action: a_t in {0..N+1}: 0 = device, 1..N = edge servers, N+1 = cloud
 Reward: r_t = -T on success (Eq. 9), -(Tmax+1) on failure
 """
 
+import array
+import heapq
+import itertools
 import math
 import random
 from dataclasses import dataclass
@@ -20,6 +23,8 @@ from dataclasses import dataclass
 import numpy as np
 
 from . import config
+from .background import DeviceLevelBackground, FluidBackground
+from .rng import BlockRandom
 from .scenario import Scenario
 
 
@@ -38,6 +43,23 @@ class Task:
     required_core: int
 
 
+@dataclass
+class EnvSnapshot:
+    """Everything MECOffloadEnv.restore() needs to put an env back exactly
+    where snapshot() found it: clock, utilization, outstanding releases,
+    RNG state and the task/bandwidth currently awaiting a decision."""
+
+    clock: float
+    utilization: array.array
+    pending_release: list
+    release_seq: int
+    rng_state: object
+    current_task: Task
+    current_bw: tuple
+    current_state: np.ndarray
+    background_state: object = None
+
+
 class MECOffloadEnv:
     """One "MD" generating tasks against N edge servers + 1 cloud + itself.
 
@@ -50,23 +72,57 @@ class MECOffloadEnv:
     """
 
     def __init__(self, scenario: Scenario, num_edge_servers: int = config.NUM_EDGE_SERVERS,
-                 seed: int = None):
+                 seed: int = None, rng_backend: str = "python", copy: bool = True,
+                 background_mode: str = "poisson", warm_start=None):
         self.scenario = scenario
         self.n_edge = num_edge_servers
-        self.rng = random.Random(seed)
+        # "python" (default): random.Random, seed-compatible with every
+        # trajectory this env has ever produced. "block": resaco/rng.py's
+        # BlockRandom, which pre-draws variates from numpy in blocks --
+        # cheaper per step, but a different stream for the same seed.
+        if rng_backend == "python":
+            self.rng = random.Random(seed)
+        elif rng_backend == "block":
+            self.rng = BlockRandom(seed)
+        else:
+            raise ValueError(f"unknown rng_backend {rng_backend!r} (expected 'python' or 'block')")
 
         # utilization[0] = single mobile VM, utilization[1..N] = one
-        # representative VM per edge server (least-loaded proxy), utilization[-1] = cloud
-        self.mu_mobile = 0.0
-        self.mu_edge = [0.0] * self.n_edge
-        self.mu_cloud = 0.0
-
-        # (utilization_delta, release_time) queues so occupied capacity is
-        # freed once a task's processing time elapses.
+        # representative VM per edge server (least-loaded proxy), utilization[-1] = cloud.
+        # Slot i is exactly the VM action i targets. One preallocated
+        # float64 array.array, so per-task bookkeeping is plain-float
+        # indexing, plus a zero-copy numpy view of the same memory for the
+        # vector work (building the state, snapshots). Float64 rather than
+        # float32 so occupy/release arithmetic -- and therefore every
+        # seeded trajectory -- is unchanged; only the state vector handed
+        # to the agent is float32. mu_mobile/mu_edge/mu_cloud are views.
+        self._n_slots = self.n_edge + 2
+        self._util = array.array("d", bytes(8 * self._n_slots))
+        self._util_np = np.frombuffer(self._util, dtype=np.float64)
+
+        # Two reusable float32 state buffers, written alternately by
+        # _build_state. With copy=False, reset()/step() return the buffer
+        # itself instead of a fresh copy -- no allocation per step -- and
+        # alternating means the state returned by the previous call stays
+        # valid until the *next* one, so the usual
+        # (state, action, reward, next_state) bookkeeping still works; hold
+        # on to a state any longer than that and it must be copied.
+        self.copy = copy
+        self._state_buffers = np.zeros((2, 4 + self.n_edge + 1 + 3), dtype=np.float32)
+        self._state_index = 0
+
+        # Min-heap of (release_time, seq, slot, delta) so occupied
+        # capacity is freed once a task's processing time elapses. Keyed by
+        # release time, each step only pops what has actually expired
+        # instead of rescanning every outstanding task; seq (insertion
+        # order) breaks ties and lets _release_expired apply a step's
+        # expired releases in the exact order they were occupied.
         self.clock = 0.0
-        self._pending_release = []  # list of (release_time, layer, index, delta)
+        self._pending_release = []
+        self._release_seq = itertools.count()
 
         self.current_task: Task = None
+        self._current_bw = None
         self._current_state = None
 
         # Background contention: the scenario's other (number_of_mobile_devices - 1)
@@ -82,6 +138,44 @@ class MECOffloadEnv:
         # -- which the agent does observe in its state -- rise with device
         # count exactly the way real contention would.
         self._background_devices = max(self.scenario.number_of_mobile_devices - 1, 0)
+        # background_mode="poisson" (default) is that lump-per-step model;
+        # "devices" instead simulates every background device's own
+        # arrivals and releases with resaco/background.py's vectorized
+        # DeviceLevelBackground (its own numpy stream, seeded from `seed`,
+        # so this env's rng -- and the agent's task stream -- is untouched).
+        # "fluid" replaces the lump with FluidBackground's closed-form
+        # mean-field update: same long-run load, constant cost per step.
+        if background_mode == "poisson":
+            self._background = None
+        elif background_mode == "devices":
+            self._background = DeviceLevelBackground(scenario, num_edge_servers,
+                                                     _SATURATION_CEILING, seed=seed)
+        elif background_mode == "fluid":
+            self._background = FluidBackground(scenario, num_edge_servers, _SATURATION_CEILING)
+        else:
+            raise ValueError(f"unknown background_mode {background_mode!r} "
+                             "(expected 'poisson', 'devices' or 'fluid')")
+        self.background_mode = background_mode
+
+        # Optional resaco/warm_start.py WarmStartStates: reset() then starts
+        # from a burned-in state instead of an empty cluster. The cached
+        # states come from the default background model, whose load lives
+        # entirely in utilization + releases; the other engines keep
+        # background state of their own that a cached state can't fill in.
+        if warm_start is not None and self._background is not None:
+            raise ValueError("warm_start is only supported with background_mode='poisson'")
+        self.warm_start = warm_start
+
+        # Per-slot constants for step_all_actions()'s vectorized pass.
+        p = self.scenario.app_profile
+        self._mu_required_np = np.array(
+            [p.vm_utilization_on_mobile] + [p.vm_utilization_on_edge] * self.n_edge
+            + [p.vm_utilization_on_cloud], dtype=np.float64,
+        )
+        self._mips_np = np.array(
+            [config.MOBILE_VM_MIPS] + [config.EDGE_VM_MIPS] * self.n_edge + [config.CLOUD_VM_MIPS],
+            dtype=np.float64,
+        )
 
     # ------------------------------------------------------------------
     def _sample_task(self) -> Task:
@@ -97,6 +191,10 @@ class MECOffloadEnv:
         return Task(length=max(length, 1.0), data_upload=max(upload, 1.0),
                     data_download=max(download, 1.0), required_core=p.required_core)
 
+    def _next_interarrival(self) -> float:
+        """Time until this device's next task arrives."""
+        return self.rng.expovariate(1.0 / max(self.scenario.app_profile.poisson_interarrival, 0.1))
+
     def _bandwidth(self) -> tuple:
         """Sample current available bandwidth (Mbps), degraded by load."""
         wlan = config.WLAN_BANDWIDTH_MBPS * (1.0 - 0.5 * self.rng.random())
@@ -104,35 +202,71 @@ class MECOffloadEnv:
         wan = config.WAN_BANDWIDTH_MBPS * (1.0 - 0.5 * self.rng.random())
         return wlan, man, wan
 
+    # ------------------------------------------------------------------
+    @property
+    def mu_mobile(self) -> float:
+        return self._util[0]
+
+    @mu_mobile.setter
+    def mu_mobile(self, value: float):
+        self._util[0] = value
+
+    @property
+    def mu_edge(self) -> np.ndarray:
+        return self._util_np[1:1 + self.n_edge]
+
+    @mu_edge.setter
+    def mu_edge(self, values):
+        self._util_np[1:1 + self.n_edge] = values
+
+    @property
+    def mu_cloud(self) -> float:
+        return self._util[self._n_slots - 1]
+
+    @mu_cloud.setter
+    def mu_cloud(self, value: float):
+        self._util[self._n_slots - 1] = value
+
+    # ------------------------------------------------------------------
     def _release_expired(self):
-        still_pending = []
-        for release_time, layer, index, delta in self._pending_release:
-            if release_time <= self.clock:
-                if layer == "mobile":
-                    self.mu_mobile = max(0.0, self.mu_mobile - delta)
-                elif layer == "edge":
-                    self.mu_edge[index] = max(0.0, self.mu_edge[index] - delta)
-                elif layer == "cloud":
-                    self.mu_cloud = max(0.0, self.mu_cloud - delta)
-            else:
-                still_pending.append((release_time, layer, index, delta))
-        self._pending_release = still_pending
+        pending = self._pending_release
+        if not pending or pending[0][0] > self.clock:
+            return
+        expired = []
+        while pending and pending[0][0] <= self.clock:
+            expired.append(heapq.heappop(pending))
+        # Heap order is release-time order; re-sort into occupy order so the
+        # clamped subtractions below happen in the same sequence as a plain
+        # insertion-ordered scan would, keeping results bit-identical.
+        expired.sort(key=lambda entry: entry[1])
+        util = self._util
+        for _, _, slot, delta in expired:
+            util[slot] = max(0.0, util[slot] - delta)
 
     def _build_state(self, task: Task, bw) -> np.ndarray:
-        wlan, man, wan = bw
-        return np.array(
-            [task.length, task.data_upload, task.data_download, self.mu_mobile]
-            + list(self.mu_edge)
-            + [self.mu_cloud, wlan, man, wan],
-            dtype=np.float32,
-        )
+        """Writes s_t into the next of the two reusable state buffers and
+        returns it (or a copy of it, unless copy=False)."""
+        self._state_index ^= 1
+        state = self._state_buffers[self._state_index]
+        state[0] = task.length
+        state[1] = task.data_upload
+        state[2] = task.data_download
+        state[3:3 + self._n_slots] = self._util_np
+        state[3 + self._n_slots:] = bw
+        return state.copy() if self.copy else state
 
     def reset(self) -> np.ndarray:
         self.clock = 0.0
-        self.mu_mobile = 0.0
-        self.mu_edge = [0.0] * self.n_edge
-        self.mu_cloud = 0.0
+        self._util_np[:] = 0.0
         self._pending_release = []
+        if self.warm_start is not None:
+            utilization, releases = self.warm_start.state(int(self.rng.random() * len(self.warm_start)))
+            self._util_np[:] = utilization
+            self._pending_release = [(offset, next(self._release_seq), slot, delta)
+                                     for offset, slot, delta in releases]
+            heapq.heapify(self._pending_release)
+        if self._background is not None:
+            self._background.reset()
         self.current_task = self._sample_task()
         bw = self._bandwidth()
         self._current_bw = bw
@@ -149,23 +283,21 @@ class MECOffloadEnv:
         wlan, man, wan = self._current_bw
 
         if action == 0:
-            layer, index = "mobile", 0
+            slot = 0
             mu_required = p.vm_utilization_on_mobile
-            mu_current = self.mu_mobile
             mips = config.MOBILE_VM_MIPS
             delay = 0.0  # local execution: no data ever leaves the device
         elif 1 <= action <= self.n_edge:
-            layer, index = "edge", action - 1
+            slot = action
             mu_required = p.vm_utilization_on_edge
-            mu_current = self.mu_edge[index]
             mips = config.EDGE_VM_MIPS
             delay = self._transfer_delay(task, wlan) + self._transfer_delay(task, man) * 0.1
         else:
-            layer, index = "cloud", 0
+            slot = self._n_slots - 1
             mu_required = p.vm_utilization_on_cloud
-            mu_current = self.mu_cloud
             mips = config.CLOUD_VM_MIPS
             delay = self._transfer_delay(task, wlan) + self._transfer_delay(task, wan)
+        mu_current = self._util[slot]
 
         network_fail = delay > config.TMAX_SECONDS
         vm_fail = (mu_current + mu_required) > 100.0
@@ -177,14 +309,17 @@ class MECOffloadEnv:
         else:
             process_time = task.length / mips  # T_process(i) ~= L_i / mu*  (paper Eq. after (1))
             service_time = process_time + delay
-            self._occupy(layer, index, mu_required, process_time)
+            self._occupy(slot, mu_required, process_time)
             reward = -service_time
             done_info = {"failed": False, "service_time": service_time, "delay": delay}
 
         # advance the environment clock by the per-task Poisson inter-arrival time
-        elapsed = self.rng.expovariate(1.0 / max(p.poisson_interarrival, 0.1))
+        elapsed = self._next_interarrival()
         self.clock += elapsed
-        self._inject_background_load(elapsed)
+        if self._background is None:
+            self._inject_background_load(elapsed)
+        else:
+            self._background.advance(self.clock, self._util_np)
 
         self.current_task = self._sample_task()
         self._current_bw = self._bandwidth()
@@ -193,6 +328,60 @@ class MECOffloadEnv:
 
         return next_state, reward, False, done_info
 
+    def step_all_actions(self):
+        """Counterfactual one-step evaluation of the current task against
+        every offloading target at once: returns (rewards, failed), two
+        arrays of shape (N+2,) indexed by action, holding exactly the reward
+        and failure flag step(action) would produce for each action. Does
+        not advance the env -- only applies the releases step() would apply
+        first anyway, which doesn't change what step() then does."""
+        self._release_expired()
+        task = self.current_task
+        wlan, man, wan = self._current_bw
+        d_wlan = self._transfer_delay(task, wlan)
+        delay = np.empty(self._n_slots)
+        delay[0] = 0.0
+        delay[1:-1] = d_wlan + self._transfer_delay(task, man) * 0.1
+        delay[-1] = d_wlan + self._transfer_delay(task, wan)
+
+        failed = (delay > config.TMAX_SECONDS) | (self._util_np + self._mu_required_np > 100.0)
+        rewards = np.where(failed, -(config.TMAX_SECONDS + 1.0), -(task.length / self._mips_np + delay))
+        return rewards, failed
+
+    # ------------------------------------------------------------------
+    def snapshot(self) -> EnvSnapshot:
+        """Cheap copy of all mutable env state (O(outstanding releases), no
+        deep copies) -- see restore()."""
+        current_state = self._current_state
+        if not self.copy and current_state is not None:
+            current_state = current_state.copy()  # the live buffer gets overwritten
+        return EnvSnapshot(
+            clock=self.clock,
+            utilization=self._util[:],
+            pending_release=list(self._pending_release),
+            release_seq=next(self._release_seq),
+            rng_state=self.rng.getstate(),
+            current_task=self.current_task,
+            current_bw=self._current_bw,
+            current_state=current_state,
+            background_state=self._background.getstate() if self._background is not None else None,
+        )
+
+    def restore(self, snapshot: EnvSnapshot):
+        """Rewinds this env to `snapshot`. A snapshot can be restored any
+        number of times (nothing in it is handed over by reference)."""
+        self.clock = snapshot.clock
+        self._util[:] = snapshot.utilization
+        self._pending_release = list(snapshot.pending_release)
+        self._release_seq = itertools.count(snapshot.release_seq)
+        self.rng.setstate(snapshot.rng_state)
+        self.current_task = snapshot.current_task
+        self._current_bw = snapshot.current_bw
+        self._current_state = snapshot.current_state
+        if self._background is not None:
+            self._background.setstate(snapshot.background_state)
+
+    # ------------------------------------------------------------------
     def _inject_background_load(self, elapsed: float):
         """Admits a Poisson-sampled batch of background tasks (from the
         scenario's other devices) straight into the edge/cloud pools,
@@ -234,15 +423,16 @@ class MECOffloadEnv:
             per_server = edge_share / self.n_edge
             process_time = p.task_length / config.EDGE_VM_MIPS
             desired = per_server * p.vm_utilization_on_edge
-            for index in range(self.n_edge):
-                room = max(0.0, _SATURATION_CEILING - self.mu_edge[index])
-                self._occupy("edge", index, min(desired, room), process_time)
+            util = self._util
+            for slot in range(1, self.n_edge + 1):
+                room = max(0.0, _SATURATION_CEILING - util[slot])
+                self._occupy(slot, min(desired, room), process_time)
 
         if cloud_share > 0:
             process_time = p.task_length / config.CLOUD_VM_MIPS
             desired = cloud_share * p.vm_utilization_on_cloud
-            room = max(0.0, _SATURATION_CEILING - self.mu_cloud)
-            self._occupy("cloud", 0, min(desired, room), process_time)
+            room = max(0.0, _SATURATION_CEILING - self._util[self._n_slots - 1])
+            self._occupy(self._n_slots - 1, min(desired, room), process_time)
 
     def _poisson_sample(self, lam: float) -> int:
         """Knuth's algorithm for small lambda; normal approximation for
@@ -261,15 +451,13 @@ class MECOffloadEnv:
             if p <= limit:
                 return k - 1
 
-    def _occupy(self, layer, index, mu_required, process_time):
+    def _occupy(self, slot, mu_required, process_time):
+        """Occupies `mu_required` percent of utilization slot `slot` (0 =
+        device, 1..N = edge servers, N+1 = cloud) for `process_time`."""
         release_time = self.clock + process_time
-        self._pending_release.append((release_time, layer, index, mu_required))
-        if layer == "mobile":
-            self.mu_mobile += mu_required
-        elif layer == "edge":
-            self.mu_edge[index] += mu_required
-        elif layer == "cloud":
-            self.mu_cloud += mu_required
+        heapq.heappush(self._pending_release,
+                       (release_time, next(self._release_seq), slot, mu_required))
+        self._util[slot] += mu_required
 
     @staticmethod
     def _transfer_delay(task: Task, bandwidth_mbps: float) -> float:
@@ -0,0 +1,67 @@
+"""Flat contiguous parameter storage for the agents' networks.
+
+By default every nn.Parameter owns its own small tensor, so the soft target
+update, a get_params() snapshot and Reptile's theta + alpha*(theta_k -
+theta) each loop over a dozen tensors (and get_params deep-copies nested
+state_dicts). flatten_parameters() instead moves a module's parameters
+into one contiguous 1-D tensor and rebinds each parameter to a view of its
+slice: optimizers, forward passes and autograd see the same Parameter
+objects as before, but the whole network can also be read, written or
+blended as that single tensor.
+
+Agents built with flat_params=True keep one such buffer per network and
+return their get_params() in the flat checkpoint format:
+{"format": FLAT_FORMAT, "<group>": 1-D tensor, ...}. Every agent's
+load_params() accepts both that and the nested per-module state_dicts,
+flat or not, so old checkpoints keep loading and flat checkpoints load
+into default agents too -- a group's vector is simply the concatenation
+of module.parameters() in order.
+"""
+
+import torch
+
+FLAT_FORMAT = "flat-v1"
+
+
+def is_flat(params) -> bool:
+    return isinstance(params, dict) and params.get("format") == FLAT_FORMAT
+
+
+def flatten_parameters(module: torch.nn.Module) -> torch.Tensor:
+    """Copies `module`'s parameters into one new contiguous tensor and
+    makes each parameter a view of its slice. Returns that tensor. Call
+    after any .to(device); moving the module later would break the views."""
+    params = list(module.parameters())
+    flat = torch.cat([p.detach().reshape(-1) for p in params])
+    offset = 0
+    for p in params:
+        n = p.numel()
+        p.data = flat[offset:offset + n].view_as(p)
+        offset += n
+    return flat
+
+
+def parameter_vector(module: torch.nn.Module, flat: torch.Tensor = None) -> torch.Tensor:
+    """A copy of `module`'s parameters as one 1-D tensor: a single clone if
+    the module was flattened (pass its buffer as `flat`), else a cat."""
+    if flat is not None:
+        return flat.detach().clone()
+    return torch.cat([p.detach().reshape(-1) for p in module.parameters()])
+
+
+def load_parameter_vector(module: torch.nn.Module, vector: torch.Tensor, flat: torch.Tensor = None):
+    """Writes a parameter_vector() back into `module` (one copy_ if it was
+    flattened)."""
+    total = sum(p.numel() for p in module.parameters())
+    if vector.numel() != total:
+        raise ValueError(f"flat parameter vector has {vector.numel()} values, "
+                         f"{type(module).__name__} expects {total}")
+    with torch.no_grad():
+        if flat is not None:
+            flat.copy_(vector)
+            return
+        offset = 0
+        for p in module.parameters():
+            n = p.numel()
+            p.copy_(vector[offset:offset + n].view_as(p))
+            offset += n
@@ -0,0 +1,273 @@
+"""Multi-agent variant of resaco/env.py's MECOffloadEnv.
+
+MECOffloadEnv has one agent-controlled device whose only competition is
+injected background load. MultiAgentMECOffloadEnv instead puts K
+controlled devices on the *same* edge servers and cloud -- the situation
+the bridge actually serves, where one policy answers ACT requests for
+many simulated devices at once. Every tick each of the K devices has one
+task awaiting a decision; step(actions) takes all K decisions as one (K,)
+array, resolves them against the shared pools in a single vectorized
+pass, and returns (K, STATE_DIM) observations. It doubles as batched
+policy evaluation: one forward pass over the (K, STATE_DIM) states scores
+K devices per tick.
+
+Each device keeps its own mobile VM, task stream and bandwidth draw; only
+mu_edge/mu_cloud are shared, and every device's state shows the same
+values for them. Same state/action/reward/failure model as MECOffloadEnv
+otherwise (see its module docstring).
+"""
+
+import numpy as np
+
+from . import config
+from .env import _SATURATION_CEILING
+from .scenario import Scenario
+
+
+class MultiAgentMECOffloadEnv:
+    """K controlled devices of one scenario sharing N edge servers + cloud.
+
+    Utilization lives in one flat array, `utilization`, laid out as
+    [mobile_0 .. mobile_{K-1}, edge_1 .. edge_N, cloud] (mu_mobile,
+    mu_edge and mu_cloud are views into it), so "the VM device k's
+    action targets" is one integer per device and occupying, releasing
+    and failure checks are all fancy-indexing and bincounts.
+
+    When several devices pick the same edge server or the cloud in one
+    tick, they are admitted in a random order (redrawn every tick, so no
+    device is systematically first) as if their tasks arrived one after
+    another: each is checked against the utilization left by those
+    admitted before it. A tick is one task from every controlled device,
+    so the shared clock advances by one of the scenario's inter-arrival
+    gaps per tick. The scenario's remaining (number_of_mobile_devices - K)
+    devices still contribute MECOffloadEnv-style background load.
+
+    step() returns (states, rewards, dones, info) with states of shape
+    (K, STATE_DIM) float32, rewards/dones of shape (K,), and info a dict of
+    (K,) arrays: "failed", "network_fail", "vm_fail", "service_time" and
+    "delay" (the last two NaN wherever the task failed).
+    """
+
+    def __init__(self, scenario: Scenario, num_agents: int,
+                 num_edge_servers: int = config.NUM_EDGE_SERVERS, seed: int = None):
+        if num_agents < 1:
+            raise ValueError("MultiAgentMECOffloadEnv needs at least one agent")
+        self.scenario = scenario
+        self.num_agents = num_agents
+        self.n_edge = num_edge_servers
+        self.n_slots = num_edge_servers + 2  # action targets: device + N edge + cloud
+        self.rng = np.random.default_rng(seed)
+
+        p = scenario.app_profile
+        self._interarrival = max(p.poisson_interarrival, 0.1)
+        self._task_means = np.array([max(p.task_length, 1.0), max(p.data_upload, 1.0),
+                                     max(p.data_download, 1.0)])
+        self._mu_required = np.array([p.vm_utilization_on_mobile] + [p.vm_utilization_on_edge] * self.n_edge
+                                     + [p.vm_utilization_on_cloud], dtype=np.float64)
+        self._mips = np.array([config.MOBILE_VM_MIPS] + [config.EDGE_VM_MIPS] * self.n_edge
+                              + [config.CLOUD_VM_MIPS], dtype=np.float64)
+        self._bw_max = np.array([config.WLAN_BANDWIDTH_MBPS, config.MAN_BANDWIDTH_MBPS,
+                                 config.WAN_BANDWIDTH_MBPS], dtype=np.float64)
+        self._background_devices = max(scenario.number_of_mobile_devices - num_agents, 0)
+        self._agents = np.arange(num_agents)
+
+        k = num_agents
+        self.utilization = np.zeros(k + self.n_edge + 1)
+        self.mu_mobile = self.utilization[:k]
+        self.mu_edge = self.utilization[k:k + self.n_edge]
+        self._cloud = k + self.n_edge
+        self.clock = 0.0
+        self.tasks = np.zeros((k, 3))      # L, U, D
+        self.bandwidth = np.zeros((k, 3))  # b_wlan, b_man, b_wan
+
+        # Pending-release table, grown by doubling as in VecMECOffloadEnv;
+        # only the first _n_pending entries are live.
+        self._rel_time = np.empty(0)
+        self._rel_index = np.empty(0, dtype=np.int64)  # into utilization
+        self._rel_delta = np.empty(0)
+        self._n_pending = 0
+
+    @property
+    def mu_cloud(self) -> float:
+        return float(self.utilization[self._cloud])
+
+    def _targets(self, actions: np.ndarray) -> np.ndarray:
+        """utilization index each device's action occupies."""
+        return np.where(actions == 0, self._agents, self.num_agents + actions - 1)
+
+    # ------------------------------------------------------------------
+    def _sample_tasks(self):
+        draws = self.rng.standard_exponential((self.num_agents, 3)) * self._task_means
+        np.maximum(draws, 1.0, out=self.tasks)
+
+    def _sample_bandwidth(self):
+        self.bandwidth[:] = self._bw_max * (1.0 - 0.5 * self.rng.random((self.num_agents, 3)))
+
+    def _build_states(self) -> np.ndarray:
+        k, n = self.num_agents, self.n_edge
+        states = np.empty((k, 4 + n + 1 + 3), dtype=np.float32)
+        states[:, 0:3] = self.tasks
+        states[:, 3] = self.mu_mobile
+        states[:, 4:4 + n + 1] = self.utilization[k:]
+        states[:, 4 + n + 1:] = self.bandwidth
+        return states
+
+    def _occupy(self, index, delta, release_time):
+        np.add.at(self.utilization, index, delta)
+        n = len(index)
+        if n == 0:
+            return
+        end = self._n_pending + n
+        if end > len(self._rel_time):
+            capacity = max(2 * len(self._rel_time), end, 1024)
+            for name in ("_rel_time", "_rel_index", "_rel_delta"):
+                old = getattr(self, name)
+                grown = np.empty(capacity, dtype=old.dtype)
+                grown[:self._n_pending] = old[:self._n_pending]
+                setattr(self, name, grown)
+        self._rel_time[self._n_pending:end] = release_time
+        self._rel_index[self._n_pending:end] = index
+        self._rel_delta[self._n_pending:end] = delta
+        self._n_pending = end
+
+    def _release_expired(self):
+        n = self._n_pending
+        if n == 0:
+            return
+        index = self._rel_index[:n]
+        expired = self._rel_time[:n] <= self.clock
+        if not expired.any():
+            return
+        self.utilization -= np.bincount(index[expired], weights=self._rel_delta[:n][expired],
+                                        minlength=len(self.utilization))
+        np.maximum(self.utilization, 0.0, out=self.utilization)
+        keep = ~expired
+        kept = int(keep.sum())
+        self._rel_time[:kept] = self._rel_time[:n][keep]
+        self._rel_index[:kept] = index[keep]
+        self._rel_delta[:kept] = self._rel_delta[:n][keep]
+        self._n_pending = kept
+
+    def _delays(self):
+        """(K, N+2) network delay of every device's task to every target."""
+        upload, download = self.tasks[:, 1], self.tasks[:, 2]
+        data_mbit = (upload + download) / 1000.0 * 8.0
+        d_wlan, d_man, d_wan = (config.WAN_PROPAGATION_DELAY + data_mbit[:, None] / self.bandwidth).T
+        delay = np.empty((self.num_agents, self.n_slots))
+        delay[:, 0] = 0.0
+        delay[:, 1:-1] = (d_wlan + d_man * 0.1)[:, None]
+        delay[:, -1] = d_wlan + d_wan
+        return delay
+
+    # ------------------------------------------------------------------
+    def reset(self) -> np.ndarray:
+        self.utilization[:] = 0.0
+        self.clock = 0.0
+        self._n_pending = 0
+        self._sample_tasks()
+        self._sample_bandwidth()
+        return self._build_states()
+
+    def step(self, actions):
+        """Applies one offloading decision per controlled device. `actions`
+        is an int array of shape (K,) with values in {0..N+1}."""
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.num_agents,):
+            raise ValueError(f"expected actions of shape ({self.num_agents},), got {actions.shape}")
+        if actions.min() < 0 or actions.max() >= self.n_slots:
+            raise ValueError(f"actions must be in 0..{self.n_slots - 1}, got {actions.min()}..{actions.max()}")
+        self._release_expired()
+
+        agents = self._agents
+        delay = self._delays()[agents, actions]
+        mu_required = self._mu_required[actions]
+        targets = self._targets(actions)
+        network_fail = delay > config.TMAX_SECONDS
+
+        # Admission against the shared pools: order the devices that reach
+        # their VM by (target, random priority), and check each against the
+        # target's utilization plus everything admitted ahead of it on the
+        # same target. Tasks are the same size per target, so once one is
+        # refused every later one on that target is too -- the running sum
+        # over all contenders equals the running sum over admitted ones
+        # exactly up to the first refusal, which is all the check needs.
+        contenders = np.flatnonzero(~network_fail)
+        priority = self.rng.permutation(self.num_agents)[contenders]
+        order = contenders[np.lexsort((priority, targets[contenders]))]
+        ordered_targets = targets[order]
+        running = np.cumsum(mu_required[order])
+        group_first = np.searchsorted(ordered_targets, ordered_targets, side="left")
+        ahead_or_self = running - (running[group_first] - mu_required[order][group_first])
+        vm_fail = np.zeros(self.num_agents, dtype=bool)
+        vm_fail[order] = (self.utilization[ordered_targets] + ahead_or_self) > 100.0
+        failed = network_fail | vm_fail
+
+        process_time = self.tasks[:, 0] / self._mips[actions]
+        service_time = process_time + delay
+        rewards = np.where(failed, -(config.TMAX_SECONDS + 1.0), -service_time)
+
+        ok = ~failed
+        self._occupy(targets[ok], mu_required[ok], self.clock + process_time[ok])
+
+        elapsed = self.rng.standard_exponential() * self._interarrival
+        self.clock += elapsed
+        self._inject_background_load(elapsed)
+
+        self._sample_tasks()
+        self._sample_bandwidth()
+
+        info = {
+            "failed": failed,
+            "network_fail": network_fail,
+            "vm_fail": vm_fail,
+            "service_time": np.where(failed, np.nan, service_time),
+            "delay": np.where(failed, np.nan, delay),
+        }
+        return self._build_states(), rewards, np.zeros(self.num_agents, dtype=bool), info
+
+    def step_all_actions(self):
+        """MECOffloadEnv.step_all_actions for every device at once: returns
+        (rewards, failed) of shape (K, N+2), each device's row scoring its
+        task against every target on its own -- i.e. ignoring what the
+        other controlled devices pick this tick, which step() resolves."""
+        self._release_expired()
+        k = self.num_agents
+        delay = self._delays()
+        util = np.empty((k, self.n_slots))
+        util[:, 0] = self.mu_mobile
+        util[:, 1:] = self.utilization[k:]
+        failed = (delay > config.TMAX_SECONDS) | (util + self._mu_required > 100.0)
+        rewards = np.where(failed, -(config.TMAX_SECONDS + 1.0),
+                           -(self.tasks[:, :1] / self._mips + delay))
+        return rewards, failed
+
+    # ------------------------------------------------------------------
+    def _inject_background_load(self, elapsed: float):
+        """MECOffloadEnv._inject_background_load for the devices not under
+        control: one Poisson batch, split 80/20 edge/cloud, edge share
+        spread evenly over the N servers, capped at _SATURATION_CEILING."""
+        if self._background_devices <= 0 or elapsed <= 0:
+            return
+        p = self.scenario.app_profile
+        n_arrivals = self.rng.poisson(self._background_devices / self._interarrival * elapsed)
+        if n_arrivals <= 0:
+            return
+        edge_share = int(round(n_arrivals * 0.8))
+        cloud_share = n_arrivals - edge_share
+        k = self.num_agents
+
+        index, amount, release = [], [], []
+        if edge_share > 0 and self.n_edge > 0:
+            desired = edge_share / self.n_edge * p.vm_utilization_on_edge
+            index.append(np.arange(k, k + self.n_edge))
+            amount.append(np.minimum(desired, np.maximum(0.0, _SATURATION_CEILING - self.mu_edge)))
+            release.append(np.full(self.n_edge, self.clock + p.task_length / config.EDGE_VM_MIPS))
+        if cloud_share > 0:
+            desired = cloud_share * p.vm_utilization_on_cloud
+            index.append(np.array([self._cloud]))
+            amount.append(np.array([min(desired, max(0.0, _SATURATION_CEILING - self.mu_cloud))]))
+            release.append(np.array([self.clock + p.task_length / config.CLOUD_VM_MIPS]))
+        if index:
+            index, amount, release = np.concatenate(index), np.concatenate(amount), np.concatenate(release)
+            positive = amount > 0
+            self._occupy(index[positive], amount[positive], release[positive])
@@ -58,3 +58,51 @@ class Critic(nn.Module):
 
     def forward(self, state):
         return self.net(state)
+
+
+class CriticEnsemble(nn.Module):
+    """`num_critics` independent Critics evaluated together: each layer's
+    weights are stacked into one (E, in, out) tensor and biases into
+    (E, 1, out), so one batched matmul (baddbmm) per layer computes every
+    member's Q-values -- forward() returns (E, B, action_dim). Members are
+    initialized by building that many ordinary Critics and stacking their
+    weights, so the init is exactly Critic's (same RNG draws, in order).
+
+    member_state_dict(i) / load_member_state_dict(i, sd) convert member i
+    to and from a plain Critic's state_dict ("net.0.weight", ...), which is
+    what SACAgent's "critic1"/"critic2" checkpoint entries stay in.
+    """
+
+    def __init__(self, state_dim, action_dim, hidden_sizes=(128, 128), num_critics=2):
+        super().__init__()
+        members = [Critic(state_dim, action_dim, hidden_sizes) for _ in range(num_critics)]
+        linears = [[m for m in member.net if isinstance(m, nn.Linear)] for member in members]
+        self._keys = [f"net.{i}" for i, m in enumerate(members[0].net) if isinstance(m, nn.Linear)]
+        self.weights = nn.ParameterList(
+            nn.Parameter(torch.stack([layers[l].weight.detach().t() for layers in linears]))
+            for l in range(len(self._keys)))
+        self.biases = nn.ParameterList(
+            nn.Parameter(torch.stack([layers[l].bias.detach().unsqueeze(0) for layers in linears]))
+            for l in range(len(self._keys)))
+
+    def forward(self, state):
+        x = state.unsqueeze(0).expand(len(self.weights[0]), -1, -1)
+        last = len(self.weights) - 1
+        for l, (weight, bias) in enumerate(zip(self.weights, self.biases)):
+            x = torch.baddbmm(bias, x, weight)
+            if l < last:
+                x = torch.relu(x)
+        return x
+
+    def member_state_dict(self, index: int) -> dict:
+        sd = {}
+        for key, weight, bias in zip(self._keys, self.weights, self.biases):
+            sd[f"{key}.weight"] = weight[index].detach().t().clone()
+            sd[f"{key}.bias"] = bias[index, 0].detach().clone()
+        return sd
+
+    def load_member_state_dict(self, index: int, state_dict: dict):
+        with torch.no_grad():
+            for key, weight, bias in zip(self._keys, self.weights, self.biases):
+                weight[index].copy_(state_dict[f"{key}.weight"].t())
+                bias[index, 0].copy_(state_dict[f"{key}.bias"])
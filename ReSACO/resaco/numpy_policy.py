@@ -0,0 +1,96 @@
+"""Torch-free runtime for exported actors.
+
+Serving a frozen policy only ever runs Actor.net -- Linear, ReLU, Linear,
+ReLU, Linear -- on normalize_state(state), yet through an agent that
+means torch's import, an optimizer, target critics and a replay buffer,
+plus per-call tensor setup and op dispatch. export_actor() writes an
+Actor's layers to a .npz with normalize._SCALE folded into the first
+layer's weights (W / _SCALE, so raw physical states go straight in), and
+NumpyPolicy evaluates that file with a handful of NumPy matmuls.
+
+NumpyPolicy has the agents' select_action/select_actions interface, so
+FrozenPolicyAgent can serve it unchanged (bridge/inference_server.py
+does, for A2C/A3C, when a checkpoint's .npz is present). This module
+imports NumPy only: `from resaco.numpy_policy import NumpyPolicy` loads
+no torch (the resaco package imports its submodules lazily).
+"""
+
+import numpy as np
+
+from .normalize import _SCALE
+
+NPZ_FORMAT = "actor-npz-v1"
+
+
+def actor_layers(actor):
+    """[(weight (out, in), bias (out,)), ...] of `actor`'s Linear layers, as
+    float64 NumPy arrays, with the state normalization folded into the
+    first layer."""
+    layers = [(m.weight.detach().cpu().double().numpy(), m.bias.detach().cpu().double().numpy())
+              for m in actor.net if hasattr(m, "weight")]
+    first_w, first_b = layers[0]
+    layers[0] = (first_w / _SCALE[None, :], first_b)
+    return layers
+
+
+def export_actor(actor, path: str):
+    """Writes `actor` (a networks.Actor) to `path` as a NumpyPolicy .npz."""
+    arrays = {"format": np.array(NPZ_FORMAT)}
+    for i, (w, b) in enumerate(actor_layers(actor)):
+        # stored (in, out) so the runtime's x @ w needs no transpose
+        arrays[f"w{i}"] = np.ascontiguousarray(w.T, dtype=np.float32)
+        arrays[f"b{i}"] = b.astype(np.float32)
+    with open(path, "wb") as f:
+        np.savez(f, **arrays)
+
+
+class NumpyPolicy:
+    """An exported actor: raw state(s) -> logits, greedy or sampled actions."""
+
+    def __init__(self, weights, biases, seed: int = None):
+        self.weights = [np.asarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        self.action_dim = self.biases[-1].shape[0]
+        self.rng = np.random.default_rng(seed)
+
+    @classmethod
+    def load(cls, path: str, seed: int = None):
+        with np.load(path) as data:
+            if str(data["format"]) != NPZ_FORMAT:
+                raise ValueError(f"{path} is not an {NPZ_FORMAT} actor export")
+            n = sum(1 for key in data.files if key.startswith("w"))
+            return cls([data[f"w{i}"] for i in range(n)], [data[f"b{i}"] for i in range(n)], seed=seed)
+
+    def logits(self, states):
+        """(STATE_DIM,) -> (A,) or (B, STATE_DIM) -> (B, A), raw states in."""
+        x = np.asarray(states, dtype=np.float32)
+        for w, b in zip(self.weights[:-1], self.biases[:-1]):
+            x = x @ w
+            x += b
+            x = np.maximum(x, 0.0)
+        x = x @ self.weights[-1]
+        x += self.biases[-1]
+        return x
+
+    def select_action(self, state, greedy: bool = True) -> int:
+        if greedy:
+            return int(self.logits(state).argmax())
+        return int(self.select_actions(state, greedy=False))
+
+    def select_actions(self, states, greedy: bool = True):
+        """A (B,) int64 array of actions for a (B, STATE_DIM) batch (or a
+        0-d array for one state)."""
+        logits = self.logits(states)
+        if greedy:
+            return np.argmax(logits, axis=-1)
+        z = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        cdf = np.cumsum(z, axis=-1)
+        u = self.rng.random(cdf.shape[:-1] + (1,)) * cdf[..., -1:]
+        return np.minimum((cdf < u).sum(axis=-1), self.action_dim - 1)
+
+    def get_params(self):
+        """The exported arrays, in the same w<i>/b<i> layout as the .npz."""
+        params = {"format": NPZ_FORMAT}
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            params[f"w{i}"], params[f"b{i}"] = w, b
+        return params
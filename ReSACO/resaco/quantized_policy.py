@@ -0,0 +1,125 @@
+"""Opt-in int8 serving of actors, behind an accuracy gate.
+
+quantize_actor() returns a copy of an Actor whose Linear layers are
+dynamically quantized to int8 (torch.ao.quantization.quantize_dynamic:
+int8 weights, activations quantized per call), keeping Actor's
+act_greedy/sample methods. QuantizedPolicy.gated() builds one and first
+compares its greedy actions with the float actor's on a recorded state
+sample (record_gate_states(): MECOffloadEnv rollouts across a
+sample_scenario_pool); below `min_agreement` it raises
+QuantizationGateError instead of returning a policy that would serve
+measurably different decisions. FrozenPolicyAgent and DeploymentAgent
+(quantize=True) catch that and keep serving the float actor.
+"""
+
+import copy
+import random
+import warnings
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from . import config
+from .env import MECOffloadEnv
+from .normalize import normalize_state
+from .scenario import sample_scenario_pool
+
+
+class QuantizationGateError(ValueError):
+    """The quantized actor's greedy agreement with the float one is too low."""
+
+    def __init__(self, agreement: float, min_agreement: float):
+        super().__init__(f"int8 actor agrees with the float actor on {agreement:.1%} of gate states, "
+                         f"below the {min_agreement:.1%} threshold")
+        self.agreement = agreement
+
+
+def record_gate_states(num_states: int = config.QUANT_GATE_STATES,
+                       num_scenarios: int = config.QUANT_GATE_SCENARIOS, seed: int = 0) -> np.ndarray:
+    """(num_states, STATE_DIM) raw states from uniformly random-action
+    rollouts, an equal share from each of `num_scenarios` scenarios."""
+    rng = np.random.default_rng(seed)
+    scenarios = sample_scenario_pool(num_scenarios, seed=seed)
+    per_scenario = -(-num_states // num_scenarios)
+    states = []
+    for i, scenario in enumerate(scenarios):
+        env = MECOffloadEnv(scenario, seed=seed + i)
+        state = env.reset()
+        for _ in range(per_scenario):
+            states.append(state)
+            state, _, done, _ = env.step(int(rng.integers(config.ACTION_DIM)))
+            if done:
+                state = env.reset()
+    return np.asarray(states[:num_states], dtype=np.float32)
+
+
+def quantize_actor(actor):
+    """An int8 dynamically quantized copy of `actor` (CPU only)."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)  # torch.ao.quantization's migration notice
+        warnings.simplefilter("ignore", UserWarning)
+        return torch.ao.quantization.quantize_dynamic(copy.deepcopy(actor).cpu(), {nn.Linear},
+                                                      dtype=torch.qint8)
+
+
+def _greedy_actions(actor, states_t):
+    param = next(actor.parameters(), None)  # a quantized actor has none left: CPU
+    with torch.no_grad():
+        return actor.act_greedy(states_t.to(param.device) if param is not None else states_t).cpu()
+
+
+def greedy_agreement(actor_a, actor_b, states) -> float:
+    """Fraction of raw `states` on which the two actors' greedy actions agree."""
+    states_t = torch.as_tensor(normalize_state(states), dtype=torch.float32)
+    return float((_greedy_actions(actor_a, states_t) == _greedy_actions(actor_b, states_t)).float().mean())
+
+
+class QuantizedPolicy:
+    """An int8 actor with the agents' select_action/select_actions interface.
+    Non-greedy decisions sample the actor's softmax, as SACAgent/A2CAgent
+    do -- or, given `epsilon_from` (a DDPGAgent), are epsilon-greedy with
+    that agent's current epsilon, as DDPGAgent's are."""
+
+    def __init__(self, actor, agreement: float = None, epsilon_from=None):
+        self.actor = actor
+        self.agreement = agreement
+        self.epsilon_from = epsilon_from
+
+    @classmethod
+    def gated(cls, float_actor, gate_states, min_agreement: float = config.QUANT_MIN_AGREEMENT,
+              epsilon_from=None):
+        """Quantizes `float_actor` and returns the policy only if its greedy
+        actions match on at least `min_agreement` of `gate_states`; raises
+        QuantizationGateError otherwise."""
+        quantized = quantize_actor(float_actor)
+        agreement = greedy_agreement(float_actor, quantized, gate_states)
+        if agreement < min_agreement:
+            raise QuantizationGateError(agreement, min_agreement)
+        return cls(quantized, agreement, epsilon_from)
+
+    def select_action(self, state, greedy: bool = False) -> int:
+        if not greedy and self.epsilon_from is not None:
+            if random.random() < self.epsilon_from.epsilon:
+                return random.randrange(self.epsilon_from.action_dim)
+            greedy = True
+        state_t = torch.as_tensor(normalize_state(state), dtype=torch.float32).unsqueeze(0)
+        with torch.no_grad():
+            if greedy:
+                action = self.actor.act_greedy(state_t)
+            else:
+                action, _, _ = self.actor.sample(state_t)
+        return int(action.item())
+
+    def select_actions(self, states, greedy: bool = False):
+        states_t = torch.as_tensor(normalize_state(states), dtype=torch.float32)
+        with torch.no_grad():
+            if greedy or self.epsilon_from is not None:
+                actions = self.actor.act_greedy(states_t).numpy()
+            else:
+                actions = self.actor.sample(states_t)[0].numpy()
+        if not greedy and self.epsilon_from is not None:
+            for i in range(len(actions)):
+                if random.random() < self.epsilon_from.epsilon:
+                    actions[i] = random.randrange(self.epsilon_from.action_dim)
+        return actions
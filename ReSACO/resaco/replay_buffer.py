@@ -1,23 +1,319 @@
-"""Replay buffer D used by SAC-Update (Algorithm 3)."""
+"""Replay buffer D used by SAC-Update (Algorithm 3), plus a prioritized
+variant and a memory-mapped, restart-surviving variant for online
+adaptation (Algorithm 4)."""
 
-import random
-from collections import deque
+import os
 
 import numpy as np
 
+from . import config
+from .normalize import normalize_state
+
 
 class ReplayBuffer:
-    def __init__(self, capacity: int):
+    """Fixed-capacity ring buffer over preallocated NumPy columns.
+
+    States and next states are float32 (capacity, state_dim) arrays,
+    actions int32, rewards float32 and done flags bool -- about 150 bytes
+    per transition at STATE_DIM=18, instead of a tuple of Python objects.
+    The columns are allocated on the first push(), once state_dim is known
+    (_allocate() is the hook subclasses override to put them somewhere
+    other than the heap). push() overwrites the oldest transition once
+    full, like the deque(maxlen=capacity) it replaces.
+
+    sample() draws min(batch_size, len) indices uniformly *with*
+    replacement and gathers every column with one fancy-index each, so its
+    cost depends only on the batch size, never on how full the buffer is.
+
+    `prenormalized=True` is the compact storage mode: push() runs
+    normalize_state() once per transition and states are stored as
+    `state_dtype` (float16 unless given -- normalized features are O(1),
+    well inside its precision), with int16 actions; sample() upcasts only
+    the gathered rows to float32. That is ~80 bytes per transition, and
+    agents skip their per-batch normalize_state() when they see the flag.
+    """
+
+    prioritized = False  # sample() returns (batch..., weights, indices) when True
+
+    def __init__(self, capacity: int, seed: int = None, prenormalized: bool = False,
+                 state_dtype=None):
         self.capacity = capacity
-        self.buffer = deque(maxlen=capacity)
+        self.rng = np.random.default_rng(seed)
+        self.prenormalized = prenormalized
+        if state_dtype is None:
+            state_dtype = np.float16 if prenormalized else np.float32
+        self.state_dtype = np.dtype(state_dtype)
+        self._cursor = 0  # next slot push() writes
+        self._size = 0
+        self.state = None  # columns, created by _allocate()
+
+    def _allocate(self, state_dim: int):
+        self.state = np.zeros((self.capacity, state_dim), dtype=self.state_dtype)
+        self.next_state = np.zeros((self.capacity, state_dim), dtype=self.state_dtype)
+        self.action = np.zeros(self.capacity, dtype=np.int16 if self.prenormalized else np.int32)
+        self.reward = np.zeros(self.capacity, dtype=np.float32)
+        self.done = np.zeros(self.capacity, dtype=bool)
+
+    def _restored(self, count: int):
+        """Called once a subclass has loaded `count` pre-existing
+        transitions into slots [0, count) (see MmapReplayBuffer)."""
 
     def push(self, state, action, reward, next_state, done):
-        self.buffer.append((state, action, reward, next_state, done))
+        if self.state is None:
+            self._allocate(len(state))
+        if self.prenormalized:
+            state, next_state = normalize_state(state), normalize_state(next_state)
+        i = self._cursor
+        self.state[i] = state
+        self.action[i] = action
+        self.reward[i] = reward
+        self.next_state[i] = next_state
+        self.done[i] = done
+        self._cursor = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
 
     def sample(self, batch_size: int):
-        batch = random.sample(self.buffer, min(batch_size, len(self.buffer)))
-        state, action, reward, next_state, done = map(np.array, zip(*batch))
-        return state, action, reward, next_state, done
+        idx = self.rng.integers(0, self._size, size=min(batch_size, self._size))
+        return self._gather(idx)
+
+    def sample_many(self, num_batches: int, batch_size: int):
+        """`num_batches` independent sample()s in one index draw: every
+        column comes back with a leading (num_batches,) axis."""
+        idx = self.rng.integers(0, self._size, size=(num_batches, min(batch_size, self._size)))
+        return self._gather(idx)
+
+    def _gather(self, idx):
+        return (self.state[idx].astype(np.float32, copy=False), self.action[idx], self.reward[idx],
+                self.next_state[idx].astype(np.float32, copy=False), self.done[idx].astype(np.float32))
 
     def __len__(self):
-        return len(self.buffer)
+        return self._size
+
+
+class SumTree:
+    """Array-backed binary sum tree over `capacity` non-negative leaf
+    values: node i's children are 2i and 2i+1, the root is node 1 and the
+    leaves sit at [size, 2*size) with size the next power of two. Both
+    update() and find() take one vectorized pass per tree level, so they
+    cost O(batch * log capacity) regardless of how many leaves are set;
+    set() is the scalar single-leaf update.
+    """
+
+    def __init__(self, capacity: int):
+        self.size = 1 << max(int(capacity) - 1, 0).bit_length()
+        self.tree = np.zeros(2 * self.size, dtype=np.float64)
+
+    @property
+    def total(self) -> float:
+        return float(self.tree[1])
+
+    def leaves(self, indices):
+        return self.tree[np.asarray(indices) + self.size]
+
+    def update(self, indices, values):
+        nodes = np.asarray(indices, dtype=np.int64) + self.size
+        self.tree[nodes] = values  # last write wins for a repeated index
+        # every leaf is at the same depth, so each pass moves all of them up
+        # one level; a repeated parent just gets the same sum written twice
+        nodes >>= 1
+        while nodes[0] >= 1:
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+            nodes >>= 1
+
+    def set(self, index: int, value: float):
+        """update() for one leaf, in plain Python -- push()'s per-transition
+        path, where NumPy's per-call overhead would dominate."""
+        tree = self.tree
+        node = index + self.size
+        tree[node] = value
+        node >>= 1
+        while node:
+            tree[node] = tree[2 * node] + tree[2 * node + 1]
+            node >>= 1
+
+    def find(self, targets):
+        """Leaf index whose prefix-sum interval contains each target in
+        [0, total)."""
+        targets = np.array(targets, dtype=np.float64)
+        nodes = np.ones(len(targets), dtype=np.int64)
+        while nodes[0] < self.size:
+            left = 2 * nodes
+            left_sum = self.tree[left]
+            go_right = targets >= left_sum
+            targets -= np.where(go_right, left_sum, 0.0)
+            nodes = left + go_right
+        return nodes - self.size
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """Proportional prioritized replay (Schaul et al. 2016) over the same
+    ring-buffer columns.
+
+    Transition i is drawn with probability p_i^alpha / sum_j p_j^alpha,
+    where p_i = |TD error| + eps from the last update that sampled it; new
+    transitions enter at the highest priority seen so far, so each one is
+    replayed at least once soon after it arrives. Sampling is stratified:
+    the total mass is cut into batch_size equal segments with one draw per
+    segment. The bias this introduces is corrected by importance-sampling
+    weights (N * P(i))^-beta, normalized by the batch maximum, with beta
+    annealed linearly to 1 over `beta_steps` sample() calls.
+
+    sample() returns the usual five columns plus (weights, indices); feed
+    the new |TD errors| back through update_priorities(indices, errors).
+    """
+
+    prioritized = True
+
+    def __init__(self, capacity: int, alpha: float = config.PER_ALPHA,
+                 beta: float = config.PER_BETA_START, beta_steps: int = config.PER_BETA_STEPS,
+                 eps: float = config.PER_EPS, seed: int = None, **kwargs):
+        super().__init__(capacity, seed=seed, **kwargs)
+        self.alpha = alpha
+        self.beta_start = beta
+        self.beta_steps = beta_steps
+        self.eps = eps
+        self.tree = SumTree(capacity)
+        self._max_priority = 1.0
+        self._samples = 0
+
+    def _restored(self, count: int):
+        if count:
+            self.tree.update(np.arange(count), self._max_priority ** self.alpha)
+
+    @property
+    def beta(self) -> float:
+        frac = min(self._samples / max(self.beta_steps, 1), 1.0)
+        return self.beta_start + frac * (1.0 - self.beta_start)
+
+    def push(self, state, action, reward, next_state, done):
+        i = self._cursor
+        super().push(state, action, reward, next_state, done)
+        self.tree.set(i, self._max_priority ** self.alpha)
+
+    def sample(self, batch_size: int):
+        n = min(batch_size, self._size)
+        total = self.tree.total
+        targets = (np.arange(n) + self.rng.random(n)) * (total / n)
+        # rounding in the descent can overshoot into the empty tail of a
+        # not-yet-full buffer; clamp back onto a stored transition
+        idx = np.minimum(self.tree.find(np.minimum(targets, np.nextafter(total, 0.0))), self._size - 1)
+        probs = self.tree.leaves(idx) / total
+        weights = (self._size * probs) ** -self.beta
+        weights /= weights.max()
+        self._samples += 1
+        return self._gather(idx) + (weights.astype(np.float32), idx)
+
+    def update_priorities(self, indices, td_errors):
+        priorities = np.abs(np.asarray(td_errors, dtype=np.float64)) + self.eps
+        self._max_priority = max(self._max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
+
+
+class MmapReplayBuffer(ReplayBuffer):
+    """ReplayBuffer whose columns live in a memory-mapped file, so the
+    bridge's accumulated experience survives a restart the same way
+    theta_adapt does (bridge/inference_server.py --persistent-replay opens
+    one next to each "<checkpoint>_adapted.pt").
+
+    File layout: a 72-byte header of int64s -- magic, version, capacity,
+    state_dim, write cursor, count, prenormalized flag, state itemsize,
+    pending slot -- then `capacity` fixed-width records of [state,
+    next_state, action, reward, done], all float32 (states float16 in the
+    compact prenormalized mode). The columns are strided views into those
+    records, so push() and sample() are the ring buffer's own code.
+
+    push() records the slot it is about to write as pending, writes the
+    record, bumps the header's cursor/count and only then clears the
+    pending slot. Until the buffer is full a torn slot lies past `count`
+    anyway; once full, every write overwrites a counted slot, so reopening
+    a file with a pending slot drops that record (the last slot's record
+    is moved into it and count shrinks by one). A crash mid-push loses at
+    most that one transition and never exposes a half-written one.
+    Reopening an existing file is otherwise just mapping it -- no
+    unpickling, no copy. A file whose capacity, state_dim or storage mode
+    doesn't match, or an older header version, is stale and is recreated
+    empty.
+
+    Writes reach the OS page cache immediately (surviving a process
+    crash); flush() forces them to disk.
+    """
+
+    MAGIC = 0x5245504C4159  # b"REPLAY"
+    VERSION = 3
+    HEADER_WORDS = 9
+    _NO_PENDING = -1
+
+    def __init__(self, path: str, capacity: int, state_dim: int = config.STATE_DIM,
+                 seed: int = None, **kwargs):
+        super().__init__(capacity, seed=seed, **kwargs)
+        self.path = path
+        self.state_dim = state_dim
+        self._record = np.dtype([("state", self.state_dtype, (state_dim,)),
+                                 ("next_state", self.state_dtype, (state_dim,)),
+                                 ("action", np.float32), ("reward", np.float32), ("done", np.float32)])
+        expected = [capacity, state_dim, int(self.prenormalized), self.state_dtype.itemsize]
+        header = self._read_header(path)
+        if header is None or header[2:4] + header[6:8] != expected:
+            self._create(path)
+        self._header = np.memmap(path, dtype=np.int64, mode="r+", shape=(self.HEADER_WORDS,))
+        self._allocate(state_dim)
+        self._cursor, self._size = int(self._header[4]), int(self._header[5])
+        pending = int(self._header[8])
+        if pending != self._NO_PENDING and self._size == self.capacity:
+            last = self.capacity - 1
+            if pending != last:
+                self._records[pending] = self._records[last]
+            self._cursor = self._size = last
+            self._header[4] = self._header[5] = last
+        self._header[8] = self._NO_PENDING
+        self._restored(self._size)
+
+    def _read_header(self, path):
+        if not os.path.exists(path) or os.path.getsize(path) < self.HEADER_WORDS * 8:
+            return None
+        header = np.fromfile(path, dtype=np.int64, count=self.HEADER_WORDS)
+        if header[0] != self.MAGIC or header[1] != self.VERSION:
+            return None
+        return header.tolist()
+
+    def _create(self, path):
+        header = np.zeros(self.HEADER_WORDS, dtype=np.int64)
+        header[:4] = self.MAGIC, self.VERSION, self.capacity, self.state_dim
+        header[6:9] = int(self.prenormalized), self.state_dtype.itemsize, self._NO_PENDING
+        with open(path, "wb") as f:
+            header.tofile(f)
+            f.truncate(self.HEADER_WORDS * 8 + self.capacity * self._record.itemsize)
+
+    def _allocate(self, state_dim: int):
+        self._records = np.memmap(self.path, dtype=self._record, mode="r+", offset=self.HEADER_WORDS * 8,
+                                  shape=(self.capacity,))
+        for column in self._record.names:
+            setattr(self, column, self._records[column])
+
+    def push(self, state, action, reward, next_state, done):
+        self._header[8] = self._cursor
+        super().push(state, action, reward, next_state, done)
+        self._header[4] = self._cursor
+        self._header[5] = self._size
+        self._header[8] = self._NO_PENDING
+
+    def flush(self):
+        self._records.flush()
+        self._header.flush()
+
+
+class PrioritizedMmapReplayBuffer(MmapReplayBuffer, PrioritizedReplayBuffer):
+    """MmapReplayBuffer sampled by priority. Priorities aren't persisted:
+    restored transitions all re-enter at the initial maximum priority,
+    exactly like freshly pushed ones."""
+
+
+def make_replay_buffer(capacity: int, prioritized: bool = False, path: str = None, seed: int = None,
+                       prenormalized: bool = False):
+    """The ReplayBuffer variant for a (prioritized, persisted-at-`path`)
+    combination, in the compact storage mode if `prenormalized`."""
+    if path is None:
+        cls = PrioritizedReplayBuffer if prioritized else ReplayBuffer
+        return cls(capacity, seed=seed, prenormalized=prenormalized)
+    cls = PrioritizedMmapReplayBuffer if prioritized else MmapReplayBuffer
+    return cls(path, capacity, seed=seed, prenormalized=prenormalized)
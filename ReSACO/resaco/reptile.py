@@ -1,8 +1,18 @@
-"""Reptile-based meta-training: Outer Loop (Algorithm 1) + Inner Loop (Algorithm 2)."""
+"""Reptile-based meta-training: Outer Loop (Algorithm 1) + Inner Loop (Algorithm 2).
+
+outer_loop(meta_batch_size=M, num_workers=W) is batched Reptile: each outer
+step refines M sampled scenarios from the same theta and moves theta
+towards the average of the M results. With W > 0 worker processes run
+those Inner Loops in parallel; each keeps one local SACAgent for the whole
+run, so only theta and the theta_k go between processes. Every Inner Loop
+reseeds torch, its env and its replay buffer from a seed drawn in the
+parent, so the result doesn't depend on W or on scheduling.
+"""
 
-import copy
 import random
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
 import torch
 
 from . import config
@@ -11,9 +21,18 @@ from .sac import SACAgent
 
 
 def _interpolate_params(theta, theta_k, alpha):
-    """theta <- theta + alpha * (theta_k - theta)   (Eq. 8)"""
+    """theta <- theta + alpha * (theta_k - theta)   (Eq. 8)
+
+    Flat checkpoints (resaco/flat_params.py) interpolate one whole vector
+    per group; nested ones per state_dict entry."""
     new_theta = {}
     for group in theta:
+        if isinstance(theta[group], torch.Tensor):
+            new_theta[group] = theta[group] + alpha * (theta_k[group] - theta[group])
+            continue
+        if not isinstance(theta[group], dict):  # the flat "format" tag
+            new_theta[group] = theta[group]
+            continue
         new_theta[group] = {}
         for key in theta[group]:
             new_theta[group][key] = theta[group][key] + alpha * (
@@ -22,19 +41,65 @@ def _interpolate_params(theta, theta_k, alpha):
     return new_theta
 
 
-def inner_loop(theta, scenario, num_inner_updates: int, agent_kwargs=None, seed=None):
+def _average_params(thetas):
+    """Element-wise mean of several parameter sets of the same format."""
+    first = thetas[0]
+    mean = {}
+    for group in first:
+        if isinstance(first[group], torch.Tensor):
+            mean[group] = torch.stack([t[group] for t in thetas]).mean(dim=0)
+        elif isinstance(first[group], dict):
+            mean[group] = {key: torch.stack([t[group][key] for t in thetas]).mean(dim=0)
+                           for key in first[group]}
+        else:
+            mean[group] = first[group]
+    return mean
+
+
+def inner_loop(theta, scenario, num_inner_updates: int, agent_kwargs=None, seed=None,
+               warm_start=None, agent=None):
     """Algorithm 2: refine a local copy of theta on scenario `scenario` for
-    `num_inner_updates` SAC iterations. Returns the refined local theta_k."""
-    agent_kwargs = agent_kwargs or {}
-    local_agent = SACAgent(**agent_kwargs)
+    `num_inner_updates` SAC iterations. Returns the refined local theta_k.
+    `warm_start` (resaco/warm_start.py WarmStartStates for this scenario)
+    starts the env from a burned-in state instead of an empty cluster.
+
+    `agent`, if given, is reused as the local agent (reset_training_state()
+    then load theta) instead of building a new SACAgent -- outer_loop does
+    this so a compiled update is compiled once, not every outer iteration."""
+    if agent is None:
+        local_agent = SACAgent(**(agent_kwargs or {}))
+    else:
+        local_agent = agent
+        local_agent.reset_training_state(seed=seed)
     local_agent.load_params(theta)
 
-    env = MECOffloadEnv(scenario, seed=seed)
+    env = MECOffloadEnv(scenario, seed=seed, warm_start=warm_start)
     local_agent.sac_update_loop(env, num_transitions=num_inner_updates)
 
     return local_agent.get_params()
 
 
+_worker_agent = None  # a meta-batch worker process's local SACAgent
+
+
+def _init_meta_worker(agent_kwargs):
+    global _worker_agent
+    torch.set_num_threads(1)  # one core per worker; W workers use W cores
+    _worker_agent = SACAgent(**agent_kwargs)
+
+
+def _seeded_inner_loop(agent, theta, scenario, num_inner_updates, seed, warm_start):
+    # per-task torch seed, so in-process (W=0) and pool (W>0) runs match;
+    # fork_rng keeps it from reseeding the caller's global torch RNG
+    with torch.random.fork_rng():
+        torch.manual_seed(seed)
+        return inner_loop(theta, scenario, num_inner_updates, seed=seed, warm_start=warm_start, agent=agent)
+
+
+def _meta_worker_task(task):
+    return _seeded_inner_loop(_worker_agent, *task)
+
+
 def outer_loop(
     scenarios,
     num_outer_iterations: int = config.NUM_OUTER_ITERATIONS,
@@ -44,10 +109,20 @@ def outer_loop(
     seed: int = None,
     progress_every: int = 20,
     reward_log=None,
+    warm_start_cache=None,
+    meta_batch_size: int = config.META_BATCH_SIZE,
+    num_workers: int = config.META_NUM_WORKERS,
 ):
     """Algorithm 1: repeatedly sample a scenario, refine a local copy via
     the Inner Loop, and shift the global meta-parameter theta towards it.
 
+    With a resaco/warm_start.py WarmStartCache, every Inner Loop and
+    progress evaluation starts from a burned-in state of its scenario.
+
+    `meta_batch_size` > 1 or `num_workers` > 0 switches to batched Reptile
+    (see the module docstring); the progress evaluation then uses each
+    batch's first scenario.
+
     Returns the final meta-learned parameter theta*.
     """
     agent_kwargs = agent_kwargs or {}
@@ -55,32 +130,77 @@ def outer_loop(
 
     global_agent = SACAgent(**agent_kwargs)
     theta = global_agent.get_params()
-
-    for k in range(1, num_outer_iterations + 1):
-        scenario = rng.choice(scenarios)
-        theta_k = inner_loop(
-            theta, scenario, num_inner_updates, agent_kwargs=agent_kwargs, seed=rng.randint(0, 2**31)
-        )
-        theta = _interpolate_params(theta, theta_k, meta_lr)
-
-        if reward_log is not None or (progress_every and k % progress_every == 0):
-            eval_agent = SACAgent(**agent_kwargs)
-            eval_agent.load_params(theta)
-            avg_reward = _evaluate(eval_agent, scenario, seed=rng.randint(0, 2**31))
-            if reward_log is not None:
-                reward_log.append(avg_reward)
-            if progress_every and k % progress_every == 0:
-                print(f"[Outer Loop] iter {k}/{num_outer_iterations} avg_reward={avg_reward:.3f}")
+    batched = meta_batch_size > 1 or num_workers > 0
+    # reused by every in-process Inner Loop; pool workers keep their own
+    local_agent = SACAgent(**agent_kwargs) if num_workers == 0 else None
+    pool = None
+    if batched and num_workers > 0:
+        pool = ProcessPoolExecutor(num_workers, mp_context=torch.multiprocessing.get_context("spawn"),
+                                   initializer=_init_meta_worker, initargs=(agent_kwargs,))
+
+    try:
+        for k in range(1, num_outer_iterations + 1):
+            theta, scenario, warm_start = _outer_step(
+                theta, scenarios, rng, num_inner_updates, meta_lr, agent_kwargs, warm_start_cache,
+                meta_batch_size, batched, local_agent, pool)
+
+            if reward_log is not None or (progress_every and k % progress_every == 0):
+                global_agent.load_params(theta)
+                avg_reward = _evaluate(global_agent, scenario, seed=rng.randint(0, 2**31),
+                                       warm_start=warm_start)
+                if reward_log is not None:
+                    reward_log.append(avg_reward)
+                if progress_every and k % progress_every == 0:
+                    print(f"[Outer Loop] iter {k}/{num_outer_iterations} avg_reward={avg_reward:.3f}")
+    finally:
+        if pool is not None:
+            pool.shutdown()
 
     return theta
 
 
-def _evaluate(agent, scenario, num_steps: int = 50, seed=None):
-    env = MECOffloadEnv(scenario, seed=seed)
-    state = env.reset()
+def _outer_step(theta, scenarios, rng, num_inner_updates, meta_lr, agent_kwargs, warm_start_cache,
+                meta_batch_size, batched, local_agent, pool):
+    """One Outer Loop iteration; returns (new theta, scenario, warm start)
+    with the scenario the progress evaluation should use."""
+    def warm_start_for(scenario):
+        return warm_start_cache.get(scenario) if warm_start_cache is not None else None
+
+    if not batched:
+        scenario = rng.choice(scenarios)
+        warm_start = warm_start_for(scenario)
+        theta_k = inner_loop(
+            theta, scenario, num_inner_updates, agent_kwargs=agent_kwargs, seed=rng.randint(0, 2**31),
+            warm_start=warm_start, agent=local_agent,
+        )
+        return _interpolate_params(theta, theta_k, meta_lr), scenario, warm_start
+
+    batch = [rng.choice(scenarios) for _ in range(meta_batch_size)]
+    tasks = [(theta, scenario, num_inner_updates, rng.randint(0, 2**31), warm_start_for(scenario))
+             for scenario in batch]
+    if pool is not None:
+        thetas = list(pool.map(_meta_worker_task, tasks))
+    else:
+        thetas = [_seeded_inner_loop(local_agent, *task) for task in tasks]
+    theta = _interpolate_params(theta, _average_params(thetas), meta_lr)
+    return theta, batch[0], warm_start_for(batch[0])
+
+
+def _evaluate(agent, scenario, num_steps: int = 50, seed=None, warm_start=None, num_envs: int = 1):
+    """Average greedy reward per step. `num_envs` > 1 averages over that
+    many envs (seeds seed, seed+1, ...; all unseeded if `seed` is None)
+    stepped in lockstep, with one batched agent.select_actions() per
+    step."""
+    if num_envs == 1:
+        seeds = [seed]
+    else:
+        seeds = [None] * num_envs if seed is None else [seed + i for i in range(num_envs)]
+    envs = [MECOffloadEnv(scenario, seed=s, warm_start=warm_start) for s in seeds]
+    states = [env.reset() for env in envs]
     total = 0.0
     for _ in range(num_steps):
-        action = agent.select_action(state, greedy=True)
-        state, reward, _, _ = env.step(action)
-        total += reward
-    return total / num_steps
+        actions = agent.select_actions(np.stack(states), greedy=True)
+        for i, env in enumerate(envs):
+            states[i], reward, _, _ = env.step(int(actions[i]))
+            total += reward
+    return total / (num_steps * num_envs)
@@ -0,0 +1,92 @@
+"""Block-wise pre-drawn random streams for resaco/env.py.
+
+MECOffloadEnv makes about eight separate random.Random calls per step
+(three expovariate() for the task, three random() for bandwidth, one
+expovariate() for the inter-arrival time, plus gauss()/random() inside
+_poisson_sample). expovariate() and gauss() are a few lines of pure-Python
+math on top of the underlying C draw. BlockRandom draws each kind of
+variate from numpy.random.Generator thousands at a time and hands them out
+from a cursor, so every call is a list index plus at most one multiply.
+
+It implements exactly the subset of random.Random's interface env.py uses
+(random, expovariate, gauss, getstate, setstate), so it is a drop-in
+replacement for MECOffloadEnv.rng. It is *not* seed-compatible with
+random.Random -- the same seed gives a different (equally valid) stream --
+which is why MECOffloadEnv keeps random.Random as its default backend and
+only uses this one when asked (rng_backend="block").
+"""
+
+import numpy as np
+
+DEFAULT_BLOCK_SIZE = 4096
+
+_UNIFORM, _EXPONENTIAL, _NORMAL = 0, 1, 2
+_DRAWS = ("random", "standard_exponential", "standard_normal")
+
+
+class BlockRandom:
+    """random.Random-compatible (for env.py's purposes) RNG backed by
+    numpy.random.Generator, with every variate pre-drawn in blocks of
+    `block_size`. Each variate kind gets its own independent child stream
+    (spawned from one SeedSequence), so how many uniforms a step happens to
+    consume never shifts the exponential or normal streams.
+
+    The cursor logic is deliberately inlined into each public method
+    rather than shared through a helper -- one Python frame per draw
+    instead of two is most of the point of this class.
+    """
+
+    def __init__(self, seed: int = None, block_size: int = DEFAULT_BLOCK_SIZE):
+        self._block_size = block_size
+        self._gens = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(3)]
+        # generator state from just before each stream's current block was
+        # drawn -- lets getstate() be a few small dicts + cursors instead
+        # of a copy of every pre-drawn block.
+        self._block_states = [None, None, None]
+        self._uniform = self._draw_block(_UNIFORM)
+        self._exponential = self._draw_block(_EXPONENTIAL)
+        self._normal = self._draw_block(_NORMAL)
+        self._u_pos = self._e_pos = self._n_pos = 0
+
+    def _draw_block(self, stream: int) -> list:
+        gen = self._gens[stream]
+        self._block_states[stream] = gen.bit_generator.state
+        return getattr(gen, _DRAWS[stream])(self._block_size).tolist()
+
+    # ------------------------------------------------------------------
+    def random(self) -> float:
+        pos = self._u_pos
+        if pos >= self._block_size:
+            self._uniform = self._draw_block(_UNIFORM)
+            pos = 0
+        self._u_pos = pos + 1
+        return self._uniform[pos]
+
+    def expovariate(self, lambd: float) -> float:
+        pos = self._e_pos
+        if pos >= self._block_size:
+            self._exponential = self._draw_block(_EXPONENTIAL)
+            pos = 0
+        self._e_pos = pos + 1
+        return self._exponential[pos] / lambd
+
+    def gauss(self, mu: float = 0.0, sigma: float = 1.0) -> float:
+        pos = self._n_pos
+        if pos >= self._block_size:
+            self._normal = self._draw_block(_NORMAL)
+            pos = 0
+        self._n_pos = pos + 1
+        return mu + sigma * self._normal[pos]
+
+    # ------------------------------------------------------------------
+    def getstate(self):
+        return (tuple(self._block_states), (self._u_pos, self._e_pos, self._n_pos))
+
+    def setstate(self, state):
+        block_states, positions = state
+        for stream, generator_state in enumerate(block_states):
+            self._gens[stream].bit_generator.state = generator_state
+        self._uniform = self._draw_block(_UNIFORM)
+        self._exponential = self._draw_block(_EXPONENTIAL)
+        self._normal = self._draw_block(_NORMAL)
+        self._u_pos, self._e_pos, self._n_pos = positions
@@ -4,6 +4,10 @@ Discrete-action SAC: since the offloading action space is finite, the
 expectations in the soft Bellman target (Eq. 10) and the actor objective
 (Eq. 12) are computed exactly as probability-weighted sums over the twin
 critics' Q-value vectors, instead of Monte-Carlo sampling.
+
+The twin critics (and their targets) are one CriticEnsemble each, so both
+members are evaluated by a single batched forward; checkpoints still hold
+them as separate "critic1"/"critic2" Critic state_dicts.
 """
 
 import copy
@@ -12,29 +16,41 @@ import torch
 import torch.nn.functional as F
 
 from . import config
-from .networks import Actor, Critic
+from .compiled import CompiledOrEager
+from .flat_params import FLAT_FORMAT, flatten_parameters, is_flat, load_parameter_vector, parameter_vector
+from .networks import Actor, CriticEnsemble
 from .normalize import normalize_state
 from .replay_buffer import ReplayBuffer
 
 
 class SACAgent:
+    """`use_compile=True` runs the critic and actor losses through
+    torch.compile (resaco/compiled.py), silently staying eager wherever
+    that isn't available. `flat_params=True` keeps the actor, the critics
+    and the target critics in one contiguous buffer each
+    (resaco/flat_params.py): the soft target update and a get_params()
+    snapshot become single tensor ops, and get_params() returns the flat
+    checkpoint format."""
+
     def __init__(self, state_dim=config.STATE_DIM, action_dim=config.ACTION_DIM,
-                 hidden_sizes=config.HIDDEN_SIZES, device="cpu"):
+                 hidden_sizes=config.HIDDEN_SIZES, device="cpu", use_compile: bool = False,
+                 compile_backend: str = config.COMPILE_BACKEND, flat_params: bool = False):
         self.device = torch.device(device)
         self.state_dim = state_dim
         self.action_dim = action_dim
 
         self.actor = Actor(state_dim, action_dim, hidden_sizes).to(self.device)
-        self.critic1 = Critic(state_dim, action_dim, hidden_sizes).to(self.device)
-        self.critic2 = Critic(state_dim, action_dim, hidden_sizes).to(self.device)
-        self.target_critic1 = copy.deepcopy(self.critic1)
-        self.target_critic2 = copy.deepcopy(self.critic2)
+        self.critics = CriticEnsemble(state_dim, action_dim, hidden_sizes).to(self.device)  # Q1, Q2
+        self.target_critics = copy.deepcopy(self.critics)
+        self.flat_params = flat_params
+        self._flat = {}  # group -> contiguous parameter buffer, when flat_params
+        if flat_params:
+            self._flat = {"actor": flatten_parameters(self.actor),
+                          "critics": flatten_parameters(self.critics),
+                          "target_critics": flatten_parameters(self.target_critics)}
 
         self.actor_optim = torch.optim.Adam(self.actor.parameters(), lr=config.ACTOR_LR)
-        self.critic_optim = torch.optim.Adam(
-            list(self.critic1.parameters()) + list(self.critic2.parameters()),
-            lr=config.CRITIC_LR,
-        )
+        self.critic_optim = torch.optim.Adam(self.critics.parameters(), lr=config.CRITIC_LR)
 
         self.gamma = config.DISCOUNT_GAMMA
         self.tau = config.ENTROPY_TAU  # entropy temperature (paper's tau)
@@ -42,23 +58,45 @@ class SACAgent:
 
         self.replay_buffer = ReplayBuffer(config.REPLAY_BUFFER_SIZE)
 
+        self._critic_loss_fn = CompiledOrEager(self._critic_loss, use_compile, compile_backend)
+        self._actor_loss_fn = CompiledOrEager(self._actor_loss, use_compile, compile_backend)
+
+    def reset_training_state(self, seed: int = None):
+        """Empties the replay buffer and the optimizers' moment estimates,
+        so the next load_params() leaves this agent exactly as a freshly
+        built one would be -- lets the Reptile Inner Loop reuse one agent
+        (and its compiled update, if any) for every outer iteration.
+        `seed` seeds the new replay buffer's sampling."""
+        self.replay_buffer = ReplayBuffer(self.replay_buffer.capacity, seed=seed)
+        self.actor_optim.state.clear()
+        self.critic_optim.state.clear()
+
     # ------------------------------------------------------------------
     # Parameter (de)serialization -- used by the Reptile Outer Loop to copy
     # theta -> theta_k and to apply theta <- theta + alpha*(theta_k - theta)
     # ------------------------------------------------------------------
     def get_params(self):
+        if self.flat_params:
+            return {"format": FLAT_FORMAT, "actor": parameter_vector(self.actor, self._flat["actor"]),
+                    "critics": parameter_vector(self.critics, self._flat["critics"])}
         return {
             "actor": copy.deepcopy(self.actor.state_dict()),
-            "critic1": copy.deepcopy(self.critic1.state_dict()),
-            "critic2": copy.deepcopy(self.critic2.state_dict()),
+            "critic1": self.critics.member_state_dict(0),
+            "critic2": self.critics.member_state_dict(1),
         }
 
     def load_params(self, params):
+        """Accepts both checkpoint formats: nested state_dicts
+        ("actor"/"critic1"/"critic2") or flat ("actor"/"critics" vectors)."""
+        if is_flat(params):
+            load_parameter_vector(self.actor, params["actor"], self._flat.get("actor"))
+            load_parameter_vector(self.critics, params["critics"], self._flat.get("critics"))
+            load_parameter_vector(self.target_critics, params["critics"], self._flat.get("target_critics"))
+            return
         self.actor.load_state_dict(params["actor"])
-        self.critic1.load_state_dict(params["critic1"])
-        self.critic2.load_state_dict(params["critic2"])
-        self.target_critic1.load_state_dict(params["critic1"])
-        self.target_critic2.load_state_dict(params["critic2"])
+        for index, key in enumerate(("critic1", "critic2")):
+            self.critics.load_member_state_dict(index, params[key])
+            self.target_critics.load_member_state_dict(index, params[key])
 
     # ------------------------------------------------------------------
     def select_action(self, state, greedy: bool = False) -> int:
@@ -70,6 +108,17 @@ class SACAgent:
                 action, _, _ = self.actor.sample(state_t)
         return int(action.item())
 
+    def select_actions(self, states, greedy: bool = False):
+        """select_action() for a (B, STATE_DIM) batch of states in one
+        forward pass. Returns a (B,) int64 NumPy array."""
+        states_t = torch.as_tensor(normalize_state(states), dtype=torch.float32, device=self.device)
+        with torch.no_grad():
+            if greedy:
+                actions = self.actor.act_greedy(states_t)
+            else:
+                actions, _, _ = self.actor.sample(states_t)
+        return actions.cpu().numpy()
+
     # ------------------------------------------------------------------
     def update(self, batch_size: int = config.BATCH_SIZE):
         """One SAC-Update step (Algorithm 3, lines 8-12): sample a
@@ -77,67 +126,115 @@ class SACAgent:
         if len(self.replay_buffer) < batch_size:
             return None
 
-        state, action, reward, next_state, done = self.replay_buffer.sample(batch_size)
-        state = torch.as_tensor(normalize_state(state), dtype=torch.float32, device=self.device)
-        action = torch.as_tensor(action, dtype=torch.long, device=self.device)
-        reward = torch.as_tensor(reward, dtype=torch.float32, device=self.device)
-        next_state = torch.as_tensor(normalize_state(next_state), dtype=torch.float32, device=self.device)
-        done = torch.as_tensor(done, dtype=torch.float32, device=self.device)
+        batch = self.replay_buffer.sample(batch_size)
+        state, action, reward, next_state, done = self._batch_tensors(*batch[:5])
+        weights = None
+        if self.replay_buffer.prioritized:
+            weights = torch.as_tensor(batch[5], dtype=torch.float32, device=self.device)
 
-        critic_loss = self._update_critic(state, action, reward, next_state, done)
+        critic_loss, td_error = self._update_critic(state, action, reward, next_state, done, weights)
+        if weights is not None:
+            self.replay_buffer.update_priorities(batch[6], td_error.cpu().numpy())
         actor_loss = self._update_actor(state)
         self._soft_update_targets()
 
         return {"critic_loss": critic_loss, "actor_loss": actor_loss}
 
-    def _update_critic(self, state, action, reward, next_state, done):
+    def update_many(self, num_updates: int, batch_size: int = config.BATCH_SIZE):
+        """`num_updates` SAC-Update steps back to back, for update-to-data
+        ratios above 1. All the mini-batches are drawn in one vectorized
+        replay_buffer.sample_many() call, normalized and moved to tensors
+        once, then consumed one per step -- the per-step sampling and
+        conversion overhead that dominates update() at BATCH_SIZE=64 is paid
+        once. Each step sees the networks the previous one left, exactly as
+        `num_updates` update() calls would (with the same sampled indices).
+        Returns the list of per-step results ([] below batch_size). With a
+        prioritized buffer, whose priorities change after every step, this
+        is just update() in a loop."""
+        if len(self.replay_buffer) < batch_size:
+            return []
+        if self.replay_buffer.prioritized:
+            return [self.update(batch_size=batch_size) for _ in range(num_updates)]
+
+        state, action, reward, next_state, done = self._batch_tensors(
+            *self.replay_buffer.sample_many(num_updates, batch_size))
+        stats = []
+        for i in range(num_updates):
+            critic_loss, _ = self._update_critic(state[i], action[i], reward[i], next_state[i], done[i])
+            actor_loss = self._update_actor(state[i])
+            self._soft_update_targets()
+            stats.append({"critic_loss": critic_loss, "actor_loss": actor_loss})
+        return stats
+
+    def _batch_tensors(self, state, action, reward, next_state, done):
+        if not self.replay_buffer.prenormalized:  # compact buffers normalize once, on push
+            state, next_state = normalize_state(state), normalize_state(next_state)
+        return (torch.as_tensor(state, dtype=torch.float32, device=self.device),
+                torch.as_tensor(action, dtype=torch.long, device=self.device),
+                torch.as_tensor(reward, dtype=torch.float32, device=self.device),
+                torch.as_tensor(next_state, dtype=torch.float32, device=self.device),
+                torch.as_tensor(done, dtype=torch.float32, device=self.device))
+
+    def _update_critic(self, state, action, reward, next_state, done, weights=None):
+        """Soft Bellman critic step (Eqs. 10-11). With importance-sampling
+        `weights` (prioritized replay) each transition's squared error is
+        scaled by its weight. Returns (loss, |TD error|), the latter the
+        twin critics' mean absolute error per transition -- the new
+        priorities for a PrioritizedReplayBuffer."""
+        loss, td_error = self._critic_loss_fn(state, action, reward, next_state, done, weights)
+        self.critic_optim.zero_grad()
+        loss.backward()
+        self.critic_optim.step()
+        return float(loss.item()), td_error
+
+    def _critic_loss(self, state, action, reward, next_state, done, weights=None):
         with torch.no_grad():
             next_probs = self.actor.action_probs(next_state)
             next_log_probs = torch.log(next_probs + 1e-8)
-            q1_next = self.target_critic1(next_state)
-            q2_next = self.target_critic2(next_state)
-            q_next = torch.min(q1_next, q2_next)
+            q_next = self.target_critics(next_state).min(dim=0).values
             # E_{a' ~ pi}[Q(s',a') - tau * log pi(a'|s')], exact discrete expectation
             v_next = (next_probs * (q_next - self.tau * next_log_probs)).sum(dim=-1)
             target = reward + self.gamma * (1.0 - done) * v_next  # Eq. (10)
 
-        q1 = self.critic1(state).gather(1, action.unsqueeze(1)).squeeze(1)
-        q2 = self.critic2(state).gather(1, action.unsqueeze(1)).squeeze(1)
-        loss = F.mse_loss(q1, target) + F.mse_loss(q2, target)  # Eq. (11)
-
-        self.critic_optim.zero_grad()
-        loss.backward()
-        self.critic_optim.step()
-        return float(loss.item())
+        q = self.critics(state)
+        q1, q2 = q.gather(2, action.view(1, -1, 1).expand(len(q), -1, 1)).squeeze(2)
+        if weights is None:
+            loss = F.mse_loss(q1, target) + F.mse_loss(q2, target)  # Eq. (11)
+        else:
+            loss = (weights * ((q1 - target) ** 2 + (q2 - target) ** 2)).mean()
+        td_error = 0.5 * ((q1 - target).abs() + (q2 - target).abs()).detach()
+        return loss, td_error
 
     def _update_actor(self, state):
-        probs = self.actor.action_probs(state)
-        log_probs = torch.log(probs + 1e-8)
-        with torch.no_grad():
-            q1 = self.critic1(state)
-            q2 = self.critic2(state)
-            q = torch.min(q1, q2)
-        # maximize E_{a~pi}[Q(s,a) - tau*log pi(a|s)]  ==  minimize -(...)  (Eq. 12)
-        actor_loss = (probs * (self.tau * log_probs - q)).sum(dim=-1).mean()
-
+        actor_loss = self._actor_loss_fn(state)
         self.actor_optim.zero_grad()
         actor_loss.backward()
         self.actor_optim.step()
         return float(actor_loss.item())
 
+    def _actor_loss(self, state):
+        probs = self.actor.action_probs(state)
+        log_probs = torch.log(probs + 1e-8)
+        with torch.no_grad():
+            q = self.critics(state).min(dim=0).values
+        # maximize E_{a~pi}[Q(s,a) - tau*log pi(a|s)]  ==  minimize -(...)  (Eq. 12)
+        return (probs * (self.tau * log_probs - q)).sum(dim=-1).mean()
+
     def _soft_update_targets(self):
         with torch.no_grad():
-            for target_param, param in zip(self.target_critic1.parameters(), self.critic1.parameters()):
-                target_param.mul_(self.rho).add_(param, alpha=1 - self.rho)  # Eq. (13)
-            for target_param, param in zip(self.target_critic2.parameters(), self.critic2.parameters()):
-                target_param.mul_(self.rho).add_(param, alpha=1 - self.rho)
+            if self.flat_params:
+                self._flat["target_critics"].mul_(self.rho).add_(self._flat["critics"], alpha=1 - self.rho)
+                return
+            for target_param, param in zip(self.target_critics.parameters(), self.critics.parameters()):
+                target_param.mul_(self.rho).add_(param, alpha=1 - self.rho)  # Eq. (13), both twins at once
 
     # ------------------------------------------------------------------
     def sac_update_loop(self, env, num_transitions: int, greedy_action: bool = False,
-                         batch_size: int = config.BATCH_SIZE):
+                         batch_size: int = config.BATCH_SIZE, updates_per_step: int = 1):
         """Runs the full SAC-Update transition-collection loop (Algorithm 3):
         interact with `env` for `num_transitions` steps, storing transitions
-        and performing one gradient update per step.
+        and performing one gradient update per step -- or, with
+        `updates_per_step` > 1, that many per step via update_many().
 
         `num_transitions` is meant to be "N inner SAC-Update iterations"
         (Algorithm 2's N) -- i.e. N real gradient steps. update() is a no-op
@@ -164,8 +261,38 @@ class SACAgent:
             action = self.select_action(state, greedy=greedy_action)
             next_state, reward, done, info = env.step(action)
             self.replay_buffer.push(state, action, reward, next_state, float(done))
-            result = self.update(batch_size=batch_size)
-            if result is not None:
-                stats.append(result)
+            if updates_per_step == 1:
+                result = self.update(batch_size=batch_size)
+                if result is not None:
+                    stats.append(result)
+            else:
+                stats.extend(self.update_many(updates_per_step, batch_size=batch_size))
             state = next_state
         return stats
+
+    def shared_update_loop(self, env, num_transitions: int, greedy_action: bool = False,
+                           batch_size: int = config.BATCH_SIZE):
+        """sac_update_loop for a MultiAgentMECOffloadEnv: this one policy
+        acts for all K controlled devices (as the bridge does for every
+        simulated device it serves), all K decisions of a tick coming from
+        one batched actor forward pass. Every device's transition goes into
+        the replay buffer, and -- as in sac_update_loop -- there is one
+        gradient update per counted transition, after the same
+        `batch_size` warm-up; `num_transitions` is rounded up to whole ticks.
+        """
+        states = env.reset()
+        num_agents = len(states)
+        stats = []
+        counted = 0
+        while counted < num_transitions:
+            actions = self.select_actions(states, greedy=greedy_action)
+            next_states, rewards, dones, info = env.step(actions)
+            warm = len(self.replay_buffer) >= batch_size
+            for k in range(num_agents):
+                self.replay_buffer.push(states[k], int(actions[k]), float(rewards[k]),
+                                        next_states[k], float(dones[k]))
+            if warm:
+                stats.extend(self.update_many(num_agents, batch_size=batch_size))
+                counted += num_agents
+            states = next_states
+        return stats
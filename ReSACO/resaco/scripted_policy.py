@@ -0,0 +1,78 @@
+"""TorchScript export of actors, for serving without the agent classes.
+
+export_scripted_actor() wraps an Actor's MLP in NormalizedActor (the
+fixed normalize._SCALE division as a buffer in front of it), traces it
+and freezes the graph -- weights inlined as constants, no Python module
+attributes left to look up -- then saves it with torch.jit.save. The
+result is a self-contained artifact: raw (B, STATE_DIM) float32 states
+in, (B, ACTION_DIM) logits out. ScriptedPolicy loads one and exposes the
+agents' select_action/select_actions interface, so FrozenPolicyAgent can
+serve it; the served graph can also be benchmarked, diffed and versioned
+independently of networks.py.
+"""
+
+import warnings
+
+import torch
+import torch.nn as nn
+
+from . import config
+from .normalize import _SCALE
+
+
+class NormalizedActor(nn.Module):
+    """Actor.net with the state normalization folded in: raw states -> logits."""
+
+    def __init__(self, actor):
+        super().__init__()
+        self.register_buffer("inv_scale", torch.as_tensor(1.0 / _SCALE, dtype=torch.float32))
+        self.net = actor.net
+
+    def forward(self, states):
+        return self.net(states * self.inv_scale)
+
+
+def export_scripted_actor(actor, path: str):
+    """Traces, freezes and saves `actor` (a networks.Actor) to `path`."""
+    module = NormalizedActor(actor).eval()
+    with torch.no_grad(), warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)  # torch.jit's deprecation notices
+        traced = torch.jit.trace(module, torch.zeros(1, config.STATE_DIM))
+        torch.jit.save(torch.jit.freeze(traced), path)
+
+
+class ScriptedPolicy:
+    """A TorchScript-exported actor: raw state(s) -> greedy or sampled actions."""
+
+    def __init__(self, module):
+        self.module = module
+
+    @classmethod
+    def load(cls, path: str):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", FutureWarning)
+            return cls(torch.jit.load(path, map_location="cpu"))
+
+    def logits(self, states):
+        states_t = torch.as_tensor(states, dtype=torch.float32)
+        with torch.inference_mode():
+            return self.module(states_t.reshape(-1, states_t.shape[-1])).reshape(*states_t.shape[:-1], -1)
+
+    def select_action(self, state, greedy: bool = True) -> int:
+        if greedy:
+            with torch.inference_mode():
+                return int(self.module(torch.as_tensor(state, dtype=torch.float32).unsqueeze(0)).argmax())
+        return int(self.select_actions(state, greedy=False))
+
+    def select_actions(self, states, greedy: bool = True):
+        """A (B,) int64 NumPy array of actions for a (B, STATE_DIM) batch
+        (or a 0-d array for one state)."""
+        logits = self.logits(states)
+        if greedy:
+            return torch.argmax(logits, dim=-1).numpy()
+        probs = torch.softmax(logits, dim=-1)
+        return torch.multinomial(probs.reshape(-1, probs.shape[-1]), 1).reshape(probs.shape[:-1]).numpy()
+
+    def get_params(self):
+        raise TypeError("a TorchScript export has no agent parameters to save; "
+                        "copy its file, or save the original checkpoint instead")
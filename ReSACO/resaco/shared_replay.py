@@ -0,0 +1,187 @@
+"""Replay buffer in multiprocessing.shared_memory, for one learner process
+fed by several env-collector processes.
+
+Every training path (sac_update_loop, DDPGAgent.train_loop, the Reptile
+Inner Loop) steps its env and learns in one Python thread, so env stepping
+and gradient updates take turns on one core. SharedReplayBuffer puts the
+ring buffer's columns in a shared-memory block: collector processes attach
+to it by name and push() transitions, while the learner's agent samples
+from the very same pages -- sample() gathers only the mini-batch, nothing
+else is ever copied. It subclasses ReplayBuffer with the same
+push/sample/len interface, so it drops into SACAgent.replay_buffer or
+DDPGAgent.replay_buffer with no change to their update code.
+
+The write cursor and count live in the block's header and are only ever
+read or advanced under one multiprocessing lock; a push() holds it while
+writing its record and a sample() while gathering, so a sampled row is
+never half-written. Both critical sections are a few microseconds.
+
+start_collectors() is the collector side: it shares an actor's parameters
+(share_memory(), so collectors act with the learner's current policy as
+it trains, Hogwild-style, like a3c.py) and spawns one process per
+scenario, each stepping its own MECOffloadEnv.
+"""
+
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+
+from . import config
+from .env import MECOffloadEnv
+from .normalize import normalize_state
+from .replay_buffer import ReplayBuffer
+
+_HEADER_BYTES = 16  # int64 cursor, int64 count
+
+
+def _layout(capacity: int, state_dim: int, state_dtype, action_dtype):
+    """(name, dtype, shape, byte offset) of every column, and total bytes."""
+    columns, offset = [], _HEADER_BYTES
+    for name, dtype, shape in (("state", state_dtype, (capacity, state_dim)),
+                               ("next_state", state_dtype, (capacity, state_dim)),
+                               ("action", action_dtype, (capacity,)),
+                               ("reward", np.float32, (capacity,)),
+                               ("done", np.bool_, (capacity,))):
+        columns.append((name, dtype, shape, offset))
+        offset += int(np.prod(shape)) * np.dtype(dtype).itemsize
+    return columns, offset
+
+
+class SharedReplayBuffer(ReplayBuffer):
+    """ReplayBuffer over a shared-memory block. The creating process owns
+    the block (and must eventually unlink() it); other processes attach()
+    with the picklable handle() -- pass it as a Process argument, since the
+    lock inside can only travel that way. The compact prenormalized mode
+    works as in ReplayBuffer."""
+
+    def __init__(self, capacity: int, state_dim: int = config.STATE_DIM, seed: int = None,
+                 name: str = None, lock=None, prenormalized: bool = False, state_dtype=None):
+        super().__init__(capacity, seed=seed, prenormalized=prenormalized, state_dtype=state_dtype)
+        self.state_dim = state_dim
+        columns, nbytes = _layout(capacity, state_dim, self.state_dtype,
+                                  np.int16 if prenormalized else np.int32)
+        self._owner = name is None
+        self._shm = shared_memory.SharedMemory(name=name, create=self._owner, size=nbytes)
+        self._lock = lock if lock is not None else mp.get_context("spawn").Lock()
+        self._counters = np.ndarray((2,), dtype=np.int64, buffer=self._shm.buf)
+        if self._owner:
+            self._counters[:] = 0
+        for column, dtype, shape, offset in columns:
+            setattr(self, column, np.ndarray(shape, dtype=dtype, buffer=self._shm.buf, offset=offset))
+
+    def handle(self):
+        return (self._shm.name, self.capacity, self.state_dim, self._lock, self.prenormalized,
+                self.state_dtype.str)
+
+    @classmethod
+    def attach(cls, handle, seed: int = None):
+        name, capacity, state_dim, lock, prenormalized, state_dtype = handle
+        return cls(capacity, state_dim, seed=seed, name=name, lock=lock, prenormalized=prenormalized,
+                   state_dtype=state_dtype)
+
+    def push(self, state, action, reward, next_state, done):
+        if self.prenormalized:
+            state, next_state = normalize_state(state), normalize_state(next_state)
+        with self._lock:
+            i = int(self._counters[0])
+            self.state[i] = state
+            self.action[i] = action
+            self.reward[i] = reward
+            self.next_state[i] = next_state
+            self.done[i] = done
+            self._counters[0] = (i + 1) % self.capacity
+            self._counters[1] = min(int(self._counters[1]) + 1, self.capacity)
+
+    def sample(self, batch_size: int):
+        with self._lock:
+            size = int(self._counters[1])
+            idx = self.rng.integers(0, size, size=min(batch_size, size))
+            return self._gather(idx)
+
+    def sample_many(self, num_batches: int, batch_size: int):
+        with self._lock:
+            size = int(self._counters[1])
+            idx = self.rng.integers(0, size, size=(num_batches, min(batch_size, size)))
+            return self._gather(idx)
+
+    def __len__(self):
+        return int(self._counters[1])
+
+    def close(self):
+        """Detaches this process's views. The owner also unlink()s."""
+        for column in ("_counters", "state", "next_state", "action", "reward", "done"):
+            setattr(self, column, None)
+        self._shm.close()
+
+    def unlink(self):
+        self._shm.unlink()
+
+
+def collector_worker(handle, actor, scenario, num_transitions: int, seed: int, env_kwargs=None):
+    """Collector process body: steps its own env with the (shared) actor's
+    stochastic policy and pushes `num_transitions` transitions."""
+    torch.set_num_threads(1)  # collectors shouldn't fight the learner for intra-op threads
+    torch.manual_seed(seed)
+    buffer = SharedReplayBuffer.attach(handle)
+    env = MECOffloadEnv(scenario, seed=seed, **(env_kwargs or {}))
+    state = env.reset()
+    for _ in range(num_transitions):
+        state_t = torch.as_tensor(normalize_state(state), dtype=torch.float32).unsqueeze(0)
+        with torch.no_grad():
+            action, _, _ = actor.sample(state_t)
+        action = int(action.item())
+        next_state, reward, done, info = env.step(action)
+        buffer.push(state, action, reward, next_state, float(done))
+        state = next_state
+    buffer.close()
+
+
+def start_collectors(buffer: SharedReplayBuffer, actor, scenarios, num_transitions: int,
+                     seed: int = 0, env_kwargs=None):
+    """Spawns one collector process per scenario (seeds seed, seed+1, ...)
+    pushing into `buffer`, all acting with `actor`'s live shared weights.
+    Returns the started processes; join() them when done."""
+    actor.share_memory()
+    ctx = mp.get_context("spawn")
+    processes = [ctx.Process(target=collector_worker, daemon=True,
+                             args=(buffer.handle(), actor, scenario, num_transitions, seed + i, env_kwargs))
+                 for i, scenario in enumerate(scenarios)]
+    for process in processes:
+        process.start()
+    return processes
+
+
+def train_with_collectors(agent, scenarios, transitions_per_collector: int,
+                          batch_size: int = config.BATCH_SIZE, seed: int = 0):
+    """SAC/DDPG training with env stepping moved to collector processes:
+    swaps `agent`'s replay buffer for a SharedReplayBuffer, starts one
+    collector per scenario, and calls agent.update() back to back until
+    every collector has finished. Returns the update stats. The shared
+    block is released afterwards and `agent` gets its original replay
+    buffer back, untouched.
+
+    Collectors always sample from the actor's softmax, so for a DDPGAgent
+    they explore stochastically rather than epsilon-greedily."""
+    original = agent.replay_buffer
+    buffer = SharedReplayBuffer(original.capacity, seed=seed)
+    agent.replay_buffer = buffer
+    processes = start_collectors(buffer, agent.actor, scenarios, transitions_per_collector, seed)
+    stats = []
+    try:
+        while any(p.is_alive() for p in processes):
+            if len(buffer) < batch_size:
+                time.sleep(0.01)
+                continue
+            result = agent.update(batch_size=batch_size)
+            if result is not None:
+                stats.append(result)
+        for process in processes:
+            process.join()
+    finally:
+        agent.replay_buffer = original
+        buffer.close()
+        buffer.unlink()
+    return stats
@@ -0,0 +1,190 @@
+"""Trace-driven task replay from real EdgeCloudSim runs.
+
+With deep_file_log_enabled=true, EdgeCloudSim's SimLogger writes one line
+per finished task to "<prefix>_SUCCESS.log" / "<prefix>_FAIL.log"
+(SimLogger.LogItem.toString, ';'-delimited):
+
+    taskId;deviceId;datacenterId;hostId;vmId;vmType;taskType;taskLength;
+    inputSize;outputSize;startTime;endTime;...
+
+convert_logs() turns any number of those files into one compact binary
+trace -- a .npy file of fixed-width TRACE_DTYPE records sorted by arrival
+time -- streaming each log line by line, without ever holding a whole
+log in memory. TraceMECOffloadEnv then memory-maps that trace and replays
+its tasks (length, upload, download) and inter-arrival gaps in place of
+MECOffloadEnv's synthetic exponential draws: stepping is a couple of
+array reads, no text parsing, and the OS pages in only the part of a
+multi-GB trace actually being replayed.
+
+Everything else -- tier capacities, background contention from the
+scenario's other devices, bandwidth, reward/failure -- is exactly
+MECOffloadEnv's, driven by the scenario passed in alongside the trace.
+"""
+
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+from . import config
+from .env import EnvSnapshot, MECOffloadEnv, Task
+from .scenario import Scenario
+
+# Field order of SimLogger.LogItem.toString(taskId)
+_DEVICE_ID, _TASK_TYPE, _TASK_LENGTH, _INPUT_SIZE, _OUTPUT_SIZE, _START_TIME = 1, 6, 7, 8, 9, 10
+
+TRACE_DTYPE = np.dtype([
+    ("arrival", "<f8"),     # task start time (s)
+    ("length", "<f4"),      # L, MI
+    ("upload", "<f4"),      # U, KB -- same units as AppProfile.data_upload
+    ("download", "<f4"),    # D, KB
+    ("device_id", "<i4"),
+    ("task_type", "<i2"),   # index into applications.xml's app list
+])
+
+_CHUNK_LINES = 1 << 16
+
+
+def _iter_log_chunks(path):
+    """Yields TRACE_DTYPE arrays of up to _CHUNK_LINES parsed records."""
+    rows = []
+    with open(path, "r") as f:
+        for line in f:
+            if not line or line[0] == "#":
+                continue
+            fields = line.split(";")
+            if len(fields) <= _START_TIME:
+                continue
+            rows.append((float(fields[_START_TIME]), float(fields[_TASK_LENGTH]),
+                         float(fields[_INPUT_SIZE]), float(fields[_OUTPUT_SIZE]),
+                         int(fields[_DEVICE_ID]), int(fields[_TASK_TYPE])))
+            if len(rows) >= _CHUNK_LINES:
+                yield np.array(rows, dtype=TRACE_DTYPE)
+                rows = []
+    if rows:
+        yield np.array(rows, dtype=TRACE_DTYPE)
+
+
+def _count_records(path) -> int:
+    count = 0
+    with open(path, "r") as f:
+        for line in f:
+            if line and line[0] != "#" and line.count(";") >= _START_TIME:
+                count += 1
+    return count
+
+
+def convert_logs(log_paths, out_path: str) -> int:
+    """Converts SimLogger _SUCCESS.log/_FAIL.log files into one .npy trace
+    at `out_path`, sorted by arrival time. Returns the number of records.
+
+    Two streaming passes per log (count, then parse straight into an
+    unsorted scratch memmap next to `out_path`), then a stable argsort of
+    the arrival column alone and a chunked gather of the records, in that
+    order, into the output memmap. Peak memory is the arrival column plus
+    its permutation (16 bytes per record) and one chunk of records --
+    never the records themselves.
+    """
+    log_paths = list(log_paths)
+    total = sum(_count_records(path) for path in log_paths)
+    scratch_path = out_path + ".unsorted.npy"
+    scratch = np.lib.format.open_memmap(scratch_path, mode="w+", dtype=TRACE_DTYPE, shape=(total,))
+    try:
+        offset = 0
+        for path in log_paths:
+            for chunk in _iter_log_chunks(path):
+                scratch[offset:offset + len(chunk)] = chunk
+                offset += len(chunk)
+        order = np.argsort(scratch["arrival"], kind="stable")
+        trace = np.lib.format.open_memmap(out_path, mode="w+", dtype=TRACE_DTYPE, shape=(total,))
+        for start in range(0, total, _CHUNK_LINES):
+            trace[start:start + _CHUNK_LINES] = scratch[order[start:start + _CHUNK_LINES]]
+        trace.flush()
+        del trace
+    finally:
+        del scratch
+        os.remove(scratch_path)
+    return total
+
+
+def load_trace(path: str) -> np.ndarray:
+    """Memory-maps a convert_logs() trace read-only."""
+    trace = np.load(path, mmap_mode="r")
+    if trace.dtype != TRACE_DTYPE:
+        raise ValueError(f"{path} is not a resaco task trace (dtype {trace.dtype})")
+    return trace
+
+
+@dataclass
+class TraceEnvSnapshot(EnvSnapshot):
+    cursor: int = 0
+
+
+class TraceMECOffloadEnv(MECOffloadEnv):
+    """MECOffloadEnv whose own task stream is replayed from a trace.
+
+    `trace` is a path to a convert_logs() .npy file or an already-loaded
+    TRACE_DTYPE array. `device_id` restricts replay to one simulated
+    device's tasks (the trace otherwise interleaves every device's);
+    `task_type` likewise restricts it to one app type. Each reset() starts
+    at a random position (drawn from this env's rng), and replay wraps
+    around at the end of the trace, so episodes of any length work and
+    different seeds see different stretches of it.
+    """
+
+    def __init__(self, trace, scenario: Scenario, num_edge_servers: int = config.NUM_EDGE_SERVERS,
+                 seed: int = None, device_id: int = None, task_type: int = None, **env_kwargs):
+        self.trace = load_trace(trace) if isinstance(trace, (str, os.PathLike)) else trace
+        # Column views stay memory-mapped; only a device/app filter
+        # materializes anything (an index array over matching rows).
+        self._rows = None
+        if device_id is not None or task_type is not None:
+            mask = np.ones(len(self.trace), dtype=bool)
+            if device_id is not None:
+                mask &= self.trace["device_id"] == device_id
+            if task_type is not None:
+                mask &= self.trace["task_type"] == task_type
+            self._rows = np.flatnonzero(mask)
+        self._n_records = len(self.trace) if self._rows is None else len(self._rows)
+        if self._n_records < 2:
+            raise ValueError("trace needs at least two matching records to replay inter-arrival gaps")
+        self._arrival = self.trace["arrival"]
+        self._length = self.trace["length"]
+        self._upload = self.trace["upload"]
+        self._download = self.trace["download"]
+        self._cursor = -1
+        super().__init__(scenario, num_edge_servers=num_edge_servers, seed=seed, **env_kwargs)
+
+    def _row(self, position: int) -> int:
+        position %= self._n_records
+        return position if self._rows is None else int(self._rows[position])
+
+    # ------------------------------------------------------------------
+    def _sample_task(self) -> Task:
+        self._cursor = (self._cursor + 1) % self._n_records
+        row = self._row(self._cursor)
+        return Task(length=max(float(self._length[row]), 1.0),
+                    data_upload=max(float(self._upload[row]), 1.0),
+                    data_download=max(float(self._download[row]), 1.0),
+                    required_core=self.scenario.app_profile.required_core)
+
+    def _next_interarrival(self) -> float:
+        if self._cursor + 1 >= self._n_records:
+            # wrapping around: no real gap to the first record, so fall
+            # back to the scenario's mean inter-arrival time
+            return max(self.scenario.app_profile.poisson_interarrival, 0.1)
+        gap = float(self._arrival[self._row(self._cursor + 1)] - self._arrival[self._row(self._cursor)])
+        return max(gap, 0.0)
+
+    def reset(self) -> np.ndarray:
+        self._cursor = int(self.rng.random() * self._n_records) - 1
+        return super().reset()
+
+    # ------------------------------------------------------------------
+    def snapshot(self) -> TraceEnvSnapshot:
+        snapshot = super().snapshot()
+        return TraceEnvSnapshot(**vars(snapshot), cursor=self._cursor)
+
+    def restore(self, snapshot: TraceEnvSnapshot):
+        super().restore(snapshot)
+        self._cursor = snapshot.cursor
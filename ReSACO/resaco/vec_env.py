@@ -0,0 +1,234 @@
+"""Batched (vectorized) version of resaco/env.py's MECOffloadEnv.
+
+Holds B fully independent environments -- each with its own scenario,
+clock, utilization pools and pending releases -- as NumPy arrays, and
+steps all of them with a single step(actions) call. Same state/action/
+reward/failure model as MECOffloadEnv (see its module docstring); only the
+bookkeeping is different:
+
+  - utilization is one (B, N+2) array whose column layout matches the
+    action space exactly (0 = device, 1..N = edge servers, N+1 = cloud),
+    so "the VM this action targets" is a plain fancy-index, not a branch;
+  - pending releases live in flat (time, env, slot, delta) arrays and are
+    expired with one masked bincount per step instead of a Python loop;
+  - every random draw (task sizes, bandwidth, inter-arrival, background
+    Poisson batch) is one numpy.random.Generator call for all B envs.
+
+Statistically equivalent to B MECOffloadEnv instances, not sample-for-
+sample identical: the random streams come from numpy.random.Generator
+rather than random.Random, and the background batch is drawn with
+Generator.poisson directly instead of MECOffloadEnv._poisson_sample's
+Knuth / normal-approximation split.
+"""
+
+import numpy as np
+
+from . import config
+from .env import _SATURATION_CEILING
+
+
+class VecMECOffloadEnv:
+    """B independent MECOffloadEnvs stepped in lockstep.
+
+    `scenarios` gives one Scenario per environment (repeat the same one,
+    e.g. `[scenario] * 64`, for B seeds of a single scenario). step()
+    returns (states, rewards, dones, info) with states of shape
+    (B, STATE_DIM) float32, rewards/dones of shape (B,), and info a dict of
+    (B,) arrays: "failed", "network_fail", "vm_fail", "service_time" and
+    "delay" (the last two NaN wherever the task failed).
+    """
+
+    def __init__(self, scenarios, num_edge_servers: int = config.NUM_EDGE_SERVERS,
+                 seed: int = None):
+        self.scenarios = list(scenarios)
+        if not self.scenarios:
+            raise ValueError("VecMECOffloadEnv needs at least one scenario")
+        self.num_envs = len(self.scenarios)
+        self.n_edge = num_edge_servers
+        self.n_slots = num_edge_servers + 2  # device + N edge servers + cloud
+        self.rng = np.random.default_rng(seed)
+
+        profiles = [s.app_profile for s in self.scenarios]
+        self._interarrival = np.array([max(p.poisson_interarrival, 0.1) for p in profiles])
+        self._task_length = np.array([p.task_length for p in profiles], dtype=np.float64)
+        # (B, 3) exponential means for (length, upload, download) -- same
+        # max(mean, 1.0) guard as MECOffloadEnv._sample_task.
+        self._task_means = np.array(
+            [[max(p.task_length, 1.0), max(p.data_upload, 1.0), max(p.data_download, 1.0)]
+             for p in profiles],
+        )
+        # (B, N+2) utilization each action's task would occupy on its VM
+        self._mu_required = np.array(
+            [[p.vm_utilization_on_mobile] + [p.vm_utilization_on_edge] * self.n_edge
+             + [p.vm_utilization_on_cloud] for p in profiles],
+            dtype=np.float64,
+        )
+        self._background_devices = np.array(
+            [max(s.number_of_mobile_devices - 1, 0) for s in self.scenarios], dtype=np.float64,
+        )
+        self._mips = np.array(
+            [config.MOBILE_VM_MIPS] + [config.EDGE_VM_MIPS] * self.n_edge + [config.CLOUD_VM_MIPS],
+            dtype=np.float64,
+        )
+        self._bw_max = np.array(
+            [config.WLAN_BANDWIDTH_MBPS, config.MAN_BANDWIDTH_MBPS, config.WAN_BANDWIDTH_MBPS],
+            dtype=np.float64,
+        )
+        self._rows = np.arange(self.num_envs)
+
+        self.utilization = np.zeros((self.num_envs, self.n_slots))
+        self.clock = np.zeros(self.num_envs)
+        self.tasks = np.zeros((self.num_envs, 3))      # L, U, D
+        self.bandwidth = np.zeros((self.num_envs, 3))  # b_wlan, b_man, b_wan
+
+        # Flat pending-release table, grown by doubling; only the first
+        # _n_pending entries are live.
+        self._rel_time = np.empty(0)
+        self._rel_flat = np.empty(0, dtype=np.int64)  # env * n_slots + slot
+        self._rel_delta = np.empty(0)
+        self._n_pending = 0
+
+    # ------------------------------------------------------------------
+    def _sample_tasks(self):
+        draws = self.rng.standard_exponential((self.num_envs, 3)) * self._task_means
+        np.maximum(draws, 1.0, out=self.tasks)
+
+    def _sample_bandwidth(self):
+        self.bandwidth[:] = self._bw_max * (1.0 - 0.5 * self.rng.random((self.num_envs, 3)))
+
+    def _build_states(self) -> np.ndarray:
+        states = np.empty((self.num_envs, 4 + self.n_edge + 1 + 3), dtype=np.float32)
+        states[:, 0:3] = self.tasks
+        states[:, 3:3 + self.n_slots] = self.utilization
+        states[:, 3 + self.n_slots:] = self.bandwidth
+        return states
+
+    def _push_releases(self, release_time, flat_index, delta):
+        n = len(release_time)
+        if n == 0:
+            return
+        end = self._n_pending + n
+        if end > len(self._rel_time):
+            capacity = max(2 * len(self._rel_time), end, 1024)
+            for name in ("_rel_time", "_rel_flat", "_rel_delta"):
+                old = getattr(self, name)
+                grown = np.empty(capacity, dtype=old.dtype)
+                grown[:self._n_pending] = old[:self._n_pending]
+                setattr(self, name, grown)
+        self._rel_time[self._n_pending:end] = release_time
+        self._rel_flat[self._n_pending:end] = flat_index
+        self._rel_delta[self._n_pending:end] = delta
+        self._n_pending = end
+
+    def _release_expired(self):
+        n = self._n_pending
+        if n == 0:
+            return
+        flat = self._rel_flat[:n]
+        expired = self._rel_time[:n] <= self.clock[flat // self.n_slots]
+        if not expired.any():
+            return
+        freed = np.bincount(flat[expired], weights=self._rel_delta[:n][expired],
+                            minlength=self.utilization.size)
+        util = self.utilization.reshape(-1)
+        util -= freed
+        np.maximum(util, 0.0, out=util)
+
+        keep = ~expired
+        kept = int(keep.sum())
+        self._rel_time[:kept] = self._rel_time[:n][keep]
+        self._rel_flat[:kept] = flat[keep]
+        self._rel_delta[:kept] = self._rel_delta[:n][keep]
+        self._n_pending = kept
+
+    # ------------------------------------------------------------------
+    def reset(self) -> np.ndarray:
+        self.utilization[:] = 0.0
+        self.clock[:] = 0.0
+        self._n_pending = 0
+        self._sample_tasks()
+        self._sample_bandwidth()
+        return self._build_states()
+
+    def step(self, actions):
+        """Applies one offloading decision per environment. `actions` is an
+        int array of shape (B,) with values in {0..N+1}."""
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.num_envs,):
+            raise ValueError(f"expected actions of shape ({self.num_envs},), got {actions.shape}")
+        if actions.size and (actions.min() < 0 or actions.max() >= self.n_slots):
+            raise ValueError(f"actions must be in 0..{self.n_slots - 1}, got {actions.min()}..{actions.max()}")
+        self._release_expired()
+
+        rows = self._rows
+        length, upload, download = self.tasks.T
+        wlan, man, wan = self.bandwidth.T
+
+        # MECOffloadEnv._transfer_delay for every env and link at once
+        data_mbit = (upload + download) / 1000.0 * 8.0
+        d_wlan = config.WAN_PROPAGATION_DELAY + data_mbit / wlan
+        d_man = config.WAN_PROPAGATION_DELAY + data_mbit / man
+        d_wan = config.WAN_PROPAGATION_DELAY + data_mbit / wan
+        is_cloud = actions == self.n_slots - 1
+        delay = np.where(actions == 0, 0.0,
+                         np.where(is_cloud, d_wlan + d_wan, d_wlan + d_man * 0.1))
+
+        mu_required = self._mu_required[rows, actions]
+        mu_current = self.utilization[rows, actions]
+        network_fail = delay > config.TMAX_SECONDS
+        vm_fail = (mu_current + mu_required) > 100.0
+        failed = network_fail | vm_fail
+
+        process_time = length / self._mips[actions]
+        service_time = process_time + delay
+        rewards = np.where(failed, -(config.TMAX_SECONDS + 1.0), -service_time)
+
+        ok = ~failed
+        ok_rows, ok_slots = rows[ok], actions[ok]
+        self.utilization[ok_rows, ok_slots] += mu_required[ok]
+        self._push_releases(self.clock[ok] + process_time[ok],
+                            ok_rows * self.n_slots + ok_slots, mu_required[ok])
+
+        # advance every env's clock by its own Poisson inter-arrival time
+        elapsed = self.rng.standard_exponential(self.num_envs) * self._interarrival
+        self.clock += elapsed
+        self._inject_background_load(elapsed)
+
+        self._sample_tasks()
+        self._sample_bandwidth()
+
+        info = {
+            "failed": failed,
+            "network_fail": network_fail,
+            "vm_fail": vm_fail,
+            "service_time": np.where(failed, np.nan, service_time),
+            "delay": np.where(failed, np.nan, delay),
+        }
+        return self._build_states(), rewards, np.zeros(self.num_envs, dtype=bool), info
+
+    def _inject_background_load(self, elapsed):
+        """Vectorized MECOffloadEnv._inject_background_load: one Poisson
+        batch per env, split 80/20 edge/cloud, edge share spread evenly
+        across the N edge servers, all capped at _SATURATION_CEILING."""
+        lam = self._background_devices / self._interarrival * elapsed
+        n_arrivals = self.rng.poisson(lam).astype(np.float64)
+        edge_share = np.rint(n_arrivals * 0.8)
+        cloud_share = n_arrivals - edge_share
+        n_slots = self.n_slots
+
+        if self.n_edge > 0:
+            edge_util = self.utilization[:, 1:1 + self.n_edge]
+            desired = (edge_share / self.n_edge * self._mu_required[:, 1])[:, None]
+            amount = np.minimum(desired, np.maximum(0.0, _SATURATION_CEILING - edge_util))
+            edge_util += amount
+            env_idx, server = np.nonzero(amount > 0)
+            release = self.clock[env_idx] + self._task_length[env_idx] / config.EDGE_VM_MIPS
+            self._push_releases(release, env_idx * n_slots + 1 + server, amount[env_idx, server])
+
+        cloud_util = self.utilization[:, n_slots - 1]
+        amount = np.minimum(cloud_share * self._mu_required[:, n_slots - 1],
+                            np.maximum(0.0, _SATURATION_CEILING - cloud_util))
+        self.utilization[:, n_slots - 1] += amount
+        (env_idx,) = np.nonzero(amount > 0)
+        release = self.clock[env_idx] + self._task_length[env_idx] / config.CLOUD_VM_MIPS
+        self._push_releases(release, env_idx * n_slots + n_slots - 1, amount[env_idx])
@@ -0,0 +1,119 @@
+"""Burned-in starting states for MECOffloadEnv.reset().
+
+A fresh MECOffloadEnv starts with every pool at zero utilization and no
+outstanding tasks -- an empty cluster the background load then takes a
+while to fill. Short rollouts (the Reptile Inner Loop's N=50, the
+Outer Loop's 50-step _evaluate, short compare_algorithms.py runs) spend a
+real share of their steps in that unrepresentative transient.
+
+WarmStartCache burns an env in once per (app_profile.name,
+number_of_mobile_devices), keeps a spread of post-burn-in states --
+utilization plus every outstanding release, with release times stored
+relative to that moment's clock -- and saves them to
+"<cache_dir>/<app>_<devices>.npz". MECOffloadEnv(..., warm_start=states)
+then starts each reset() from one of them, picked with the env's own rng
+(only the pools are restored, never the RNG state, so different seeds
+still diverge immediately).
+"""
+
+import os
+import random
+from dataclasses import dataclass
+
+import numpy as np
+
+from . import config
+from .env import MECOffloadEnv
+from .scenario import Scenario
+
+
+@dataclass
+class WarmStartStates:
+    """S burned-in env states. State i's outstanding releases are
+    entries release_ptr[i]:release_ptr[i+1] of the flat release_* arrays."""
+
+    utilization: np.ndarray     # (S, N+2), env.py's slot layout
+    release_offset: np.ndarray  # seconds until release, from the state's clock
+    release_slot: np.ndarray
+    release_delta: np.ndarray
+    release_ptr: np.ndarray     # (S+1,)
+
+    def __len__(self):
+        return len(self.utilization)
+
+    def state(self, index: int):
+        """(utilization, [(offset, slot, delta), ...]) of state `index`."""
+        lo, hi = int(self.release_ptr[index]), int(self.release_ptr[index + 1])
+        releases = list(zip(self.release_offset[lo:hi].tolist(), self.release_slot[lo:hi].tolist(),
+                            self.release_delta[lo:hi].tolist()))
+        return self.utilization[index], releases
+
+
+def burn_in_states(scenario: Scenario, num_edge_servers: int = config.NUM_EDGE_SERVERS,
+                   num_states: int = config.WARM_START_NUM_STATES,
+                   burn_in_steps: int = config.WARM_START_BURN_IN_STEPS,
+                   stride: int = config.WARM_START_STRIDE, seed: int = 0) -> WarmStartStates:
+    """Steps a fresh env `burn_in_steps` times under uniformly random
+    actions, then records a state every `stride` steps until it has
+    `num_states`. Random actions put load on every tier, so the states
+    don't encode any one policy's habits."""
+    env = MECOffloadEnv(scenario, num_edge_servers=num_edge_servers, seed=seed)
+    actions = random.Random(seed)
+    env.reset()
+    utilization, offsets, slots, deltas, ptr = [], [], [], [], [0]
+    for step in range(burn_in_steps + num_states * stride):
+        env.step(actions.randrange(num_edge_servers + 2))
+        if step >= burn_in_steps and (step - burn_in_steps) % stride == stride - 1:
+            env._release_expired()  # only what is actually still running
+            utilization.append(env._util_np.copy())
+            for release_time, _, slot, delta in env._pending_release:
+                offsets.append(release_time - env.clock)
+                slots.append(slot)
+                deltas.append(delta)
+            ptr.append(len(offsets))
+    return WarmStartStates(
+        utilization=np.array(utilization),
+        release_offset=np.array(offsets, dtype=np.float64),
+        release_slot=np.array(slots, dtype=np.int64),
+        release_delta=np.array(deltas, dtype=np.float64),
+        release_ptr=np.array(ptr, dtype=np.int64),
+    )
+
+
+class WarmStartCache:
+    """On-disk (plus in-memory) cache of burn_in_states() results, keyed
+    by (app_profile.name, number_of_mobile_devices)."""
+
+    def __init__(self, cache_dir: str, num_edge_servers: int = config.NUM_EDGE_SERVERS,
+                 num_states: int = config.WARM_START_NUM_STATES,
+                 burn_in_steps: int = config.WARM_START_BURN_IN_STEPS,
+                 stride: int = config.WARM_START_STRIDE):
+        self.cache_dir = cache_dir
+        self.num_edge_servers = num_edge_servers
+        self.num_states = num_states
+        self.burn_in_steps = burn_in_steps
+        self.stride = stride
+        self._memory = {}
+
+    def path(self, scenario: Scenario) -> str:
+        return os.path.join(self.cache_dir,
+                            f"{scenario.app_profile.name}_{scenario.number_of_mobile_devices}.npz")
+
+    def get(self, scenario: Scenario) -> WarmStartStates:
+        key = (scenario.app_profile.name, scenario.number_of_mobile_devices)
+        if key in self._memory:
+            return self._memory[key]
+        path = self.path(scenario)
+        states = None
+        if os.path.exists(path):
+            with np.load(path) as data:
+                # a cache built for a different edge-server count is stale
+                if data["utilization"].shape[1] == self.num_edge_servers + 2:
+                    states = WarmStartStates(**{name: data[name] for name in data.files})
+        if states is None:
+            states = burn_in_states(scenario, self.num_edge_servers, self.num_states,
+                                    self.burn_in_steps, self.stride)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            np.savez(path, **vars(states))
+        self._memory[key] = states
+        return states
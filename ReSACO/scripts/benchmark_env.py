@@ -0,0 +1,121 @@
+"""Environment throughput benchmarks, all on the same scenario:
+
+  - transitions per second per core for the scalar MECOffloadEnv vs. the
+    batched VecMECOffloadEnv at several batch sizes;
+  - MECOffloadEnv.step cost as the number of outstanding (not yet
+    released) tasks grows -- should stay flat, since releases are popped
+    from a time-ordered heap rather than rescanned every step;
+  - MECOffloadEnv.step cost with the default random.Random backend vs.
+    resaco/rng.py's block-pre-drawn BlockRandom (rng_backend="block");
+  - MECOffloadEnv steps per second vs. number_of_mobile_devices for each
+    background model: the default per-step Poisson lump and resaco/
+    background.py's device-level simulation (background_mode="devices").
+
+Usage:
+    python scripts/benchmark_env.py [--steps N] [--batch-sizes 1 16 64 256] [--devices D]
+                                    [--pending-sizes 0 1000 10000 50000]
+                                    [--device-counts 200 500 1000 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from dataclasses import replace
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resaco import config
+from resaco.env import MECOffloadEnv
+from resaco.scenario import sample_scenario
+from resaco.vec_env import VecMECOffloadEnv
+
+
+def bench_scalar(scenario, steps, seed, **env_kwargs):
+    env = MECOffloadEnv(scenario, seed=seed, **env_kwargs)
+    env.reset()
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, config.ACTION_DIM, size=steps).tolist()
+    start = time.perf_counter()
+    for action in actions:
+        env.step(action)
+    return steps / (time.perf_counter() - start)
+
+
+def bench_vec(scenario, steps, batch_size, seed):
+    env = VecMECOffloadEnv([scenario] * batch_size, seed=seed)
+    env.reset()
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, config.ACTION_DIM, size=(steps, batch_size))
+    start = time.perf_counter()
+    for row in actions:
+        env.step(row)
+    return steps * batch_size / (time.perf_counter() - start)
+
+
+def bench_pending(scenario, steps, pending, seed):
+    """Microseconds per MECOffloadEnv.step with `pending` extra far-future
+    releases outstanding (zero-utilization, so they never change behavior,
+    only the size of the release structure step() has to deal with)."""
+    env = MECOffloadEnv(scenario, seed=seed)
+    env.reset()
+    for i in range(pending):
+        env._occupy(1 + i % env.n_edge, 0.0, 1e12)
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, config.ACTION_DIM, size=steps).tolist()
+    start = time.perf_counter()
+    for action in actions:
+        env.step(action)
+    return (time.perf_counter() - start) / steps * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, default=5000,
+                         help="env.step() calls per measurement (each is B transitions for the batched env)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 64, 256])
+    parser.add_argument("--devices", type=int, default=1000,
+                         help="number_of_mobile_devices for the benchmark scenario")
+    parser.add_argument("--pending-sizes", type=int, nargs="+", default=[0, 1000, 10000, 50000],
+                         help="outstanding-release counts to time MECOffloadEnv.step against")
+    parser.add_argument("--device-counts", type=int, nargs="+", default=[200, 500, 1000, 2000],
+                         help="number_of_mobile_devices values to time each background model at")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    scenario = replace(sample_scenario(random.Random(args.seed)), number_of_mobile_devices=args.devices)
+    print(f"Scenario: app={scenario.app_profile.name} devices={scenario.number_of_mobile_devices}")
+
+    scalar = bench_scalar(scenario, args.steps, args.seed)
+    print(f"{'MECOffloadEnv':24s} {scalar:12,.0f} transitions/s  (1.0x)")
+    for batch_size in args.batch_sizes:
+        rate = bench_vec(scenario, args.steps, batch_size, args.seed)
+        print(f"{'VecMECOffloadEnv B=' + str(batch_size):24s} {rate:12,.0f} transitions/s  "
+              f"({rate / scalar:.1f}x)")
+
+    print("\nMECOffloadEnv.step cost vs. outstanding releases:")
+    for pending in args.pending_sizes:
+        cost = bench_pending(scenario, args.steps, pending, args.seed)
+        print(f"  pending={pending:7,d}  {cost:8.2f} us/step")
+
+    print("\nMECOffloadEnv.step cost by RNG backend:")
+    costs = {}
+    for rng_backend in ("python", "block"):
+        costs[rng_backend] = 1e6 / bench_scalar(scenario, args.steps, args.seed, rng_backend=rng_backend)
+        print(f"  {rng_backend:8s} {costs[rng_backend]:8.2f} us/step")
+    print(f"  saved    {costs['python'] - costs['block']:8.2f} us/step")
+
+    print("\nMECOffloadEnv steps/s vs. device count, by background model:")
+    print(f"  {'D':>8s} {'poisson':>12s} {'devices':>12s}")
+    for devices in args.device_counts:
+        scaled = replace(scenario, number_of_mobile_devices=devices)
+        rates = [bench_scalar(scaled, args.steps, args.seed, background_mode=mode)
+                 for mode in ("poisson", "devices")]
+        print(f"  {devices:8,d} {rates[0]:12,.0f} {rates[1]:12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
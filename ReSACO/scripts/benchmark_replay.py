@@ -0,0 +1,86 @@
+"""Replay-buffer benchmarks at the default REPLAY_BUFFER_SIZE capacity:
+
+  - sample(BATCH_SIZE) cost at several fill levels -- should stay flat,
+    since sampling is a vectorized index draw plus one gather per column;
+  - push() cost per transition;
+  - bytes of storage per transition;
+  - the same for the compact storage mode (prenormalized=True: states
+    normalized on push and stored as float16), whose sample() also saves
+    the per-batch normalize_state() the agents otherwise run;
+  - the same push/sample costs for PrioritizedReplayBuffer, whose sum-tree
+    sampling and priority update should also stay flat (O(log capacity)).
+
+Usage:
+    python scripts/benchmark_replay.py [--fills 1000 10000 50000 100000] [--samples N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resaco import config
+from resaco.normalize import normalize_state
+from resaco.replay_buffer import PrioritizedReplayBuffer, ReplayBuffer
+
+
+def _fill(buf, n, seed=0):
+    rng = np.random.default_rng(seed)
+    states = rng.random((n + 1, config.STATE_DIM)).astype(np.float32) * 100
+    actions = rng.integers(0, config.ACTION_DIM, n).tolist()
+    start = time.perf_counter()
+    for i in range(n):
+        buf.push(states[i], actions[i], -1.0, states[i + 1], 0.0)
+    return (time.perf_counter() - start) / max(n, 1) * 1e6
+
+
+def bench_sample(buf, samples, batch_size=config.BATCH_SIZE):
+    """sample() plus the normalization an agent's update() would apply."""
+    start = time.perf_counter()
+    for _ in range(samples):
+        batch = buf.sample(batch_size)
+        if not buf.prenormalized:
+            normalize_state(batch[0])
+            normalize_state(batch[3])
+    return (time.perf_counter() - start) / samples * 1e6
+
+
+def storage_bytes(buf) -> int:
+    return sum(getattr(buf, name).nbytes for name in ("state", "action", "reward", "next_state", "done"))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fills", type=int, nargs="+", default=[1000, 10000, 50000, 100000])
+    parser.add_argument("--samples", type=int, default=2000, help="sample() calls per measurement")
+    args = parser.parse_args()
+
+    for prenormalized in (False, True):
+        print(f"ReplayBuffer(capacity={config.REPLAY_BUFFER_SIZE:,}, prenormalized={prenormalized}), "
+              f"batch={config.BATCH_SIZE}:")
+        for fill in args.fills:
+            buf = ReplayBuffer(config.REPLAY_BUFFER_SIZE, prenormalized=prenormalized)
+            push_us = _fill(buf, fill)
+            sample_us = bench_sample(buf, args.samples)
+            print(f"  fill={fill:7,d}  push {push_us:6.2f} us  sample {sample_us:7.2f} us")
+        print(f"  storage: {storage_bytes(buf) / buf.capacity:.0f} bytes/transition")
+
+    print(f"PrioritizedReplayBuffer(capacity={config.REPLAY_BUFFER_SIZE:,}), sample + update_priorities:")
+    errors = np.random.default_rng(1).random(config.BATCH_SIZE)
+    for fill in args.fills:
+        buf = PrioritizedReplayBuffer(config.REPLAY_BUFFER_SIZE)
+        push_us = _fill(buf, fill)
+        start = time.perf_counter()
+        for _ in range(args.samples):
+            batch = buf.sample(config.BATCH_SIZE)
+            buf.update_priorities(batch[6], errors[:len(batch[6])])
+        sample_us = (time.perf_counter() - start) / args.samples * 1e6
+        print(f"  fill={fill:7,d}  push {push_us:6.2f} us  sample {sample_us:7.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""SAC-Update wall-time benchmark: milliseconds per gradient step on a
+replay buffer pre-filled with random transitions (CPU by default), for
+update() and for update_many(k) at each --updates-per-call k.
+
+Usage:
+    python scripts/benchmark_update.py [--updates N] [--batch-size B] [--device cpu]
+                                       [--updates-per-call 4 16]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import torch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resaco import config
+from resaco.sac import SACAgent
+
+
+def filled_agent(num_transitions: int = 5000, seed: int = 0, **agent_kwargs) -> SACAgent:
+    torch.manual_seed(seed)
+    agent = SACAgent(**agent_kwargs)
+    rng = np.random.default_rng(seed)
+    states = rng.random((num_transitions + 1, config.STATE_DIM)) * 100
+    actions = rng.integers(0, config.ACTION_DIM, num_transitions)
+    for i in range(num_transitions):
+        agent.replay_buffer.push(states[i], int(actions[i]), -rng.random(), states[i + 1], 0.0)
+    return agent
+
+
+def ms_per_update(agent, updates: int, batch_size: int = config.BATCH_SIZE, warmup: int = 50,
+                  per_call: int = None) -> float:
+    """update() per step, or update_many(per_call) calls if given."""
+    if per_call:
+        def step():
+            agent.update_many(per_call, batch_size=batch_size)
+        calls, warmup = max(updates // per_call, 1), max(warmup // per_call, 1)
+    else:
+        def step():
+            agent.update(batch_size=batch_size)
+        calls, per_call = updates, 1
+    for _ in range(warmup):
+        step()
+    start = time.perf_counter()
+    for _ in range(calls):
+        step()
+    return (time.perf_counter() - start) / (calls * per_call) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--updates", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=config.BATCH_SIZE)
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--updates-per-call", type=int, nargs="*", default=[4, 16])
+    parser.add_argument("--compile", action="store_true",
+                        help="also time use_compile=True (pays one-time compilation first)")
+    args = parser.parse_args()
+
+    agent = filled_agent(device=args.device)
+    print(f"SACAgent.update(batch={args.batch_size}) on {args.device}, "
+          f"torch threads={torch.get_num_threads()}:")
+    print(f"  update():          {ms_per_update(agent, args.updates, args.batch_size):.2f} ms/update")
+    for k in args.updates_per_call:
+        ms = ms_per_update(agent, args.updates, args.batch_size, per_call=k)
+        print(f"  update_many({k:3d}): {ms:.2f} ms/update")
+    if args.compile:
+        compiled = filled_agent(device=args.device, use_compile=True)
+        start = time.perf_counter()
+        compiled.update(batch_size=args.batch_size)
+        compile_s = time.perf_counter() - start
+        ms = ms_per_update(compiled, args.updates, args.batch_size)
+        status = "compiled" if compiled._critic_loss_fn.active else "fell back to eager"
+        print(f"  update(), use_compile ({status}, first call {compile_s:.1f} s): {ms:.2f} ms/update")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,8 +10,35 @@ device count -- so bumping device_count here (scenario_for_device_count)
 just updates number_of_mobile_devices and env.py's own background-load
 injection does the rest, without requiring a full multi-agent simulator.
 
+Alongside each algorithm's own metrics, evaluate() scores every decision
+against a per-step oracle from env.step_all_actions() -- the best
+immediate reward any of the N+2 targets would have given the same task
+in the same env state -- and reports the average regret (oracle reward
+minus the reward actually obtained) and how often the agent matched the
+oracle. The oracle is myopic (one step, no lookahead), so it bounds
+per-decision quality, not long-run return.
+
+With --agents K > 1, each algorithm is instead evaluated on
+resaco/multi_agent_env.py's MultiAgentMECOffloadEnv: K devices all
+running the same policy against the same shared edge/cloud pools (the
+contention the bridge sees when it serves many simulated devices), with
+metrics pooled over every device's decisions. The oracle there scores
+each device's task on its own, so regret also picks up collisions between
+the K devices.
+
+--background-mode picks env.py's background model for the (single-agent)
+sweep: "fluid" (resaco/background.py's closed-form mean-field update)
+keeps every device count at the same per-step cost, "devices" simulates
+each background device individually.
+
+--warm-start starts each (single-agent, poisson-background) evaluation
+from a burned-in env state (resaco/warm_start.py, cached under
+<checkpoints-dir>/warm_start/) rather than an empty cluster, so short
+--episode-steps runs aren't dominated by the fill-up transient.
+
 Usage:
-    python scripts/compare_algorithms.py [--episode-steps N] [--seed S]
+    python scripts/compare_algorithms.py [--episode-steps N] [--seed S] [--agents K]
+                                         [--background-mode poisson|devices|fluid] [--warm-start]
 """
 
 import argparse
@@ -20,16 +47,19 @@ import os
 import sys
 from dataclasses import replace
 
+import numpy as np
 import torch
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from resaco import config
 from resaco.env import MECOffloadEnv
+from resaco.multi_agent_env import MultiAgentMECOffloadEnv
 from resaco.sac import SACAgent
 from resaco.baselines.ddpg import DDPGAgent
 from resaco.baselines.a2c import A2CAgent
 from resaco.scenario import sample_scenario
+from resaco.warm_start import WarmStartCache
 
 
 DEVICE_COUNTS = list(range(200, 2001, 200))
@@ -48,27 +78,40 @@ def _load(agent, params):
     return agent
 
 
-def evaluate(agent, scenario, episode_steps, seed):
-    env = MECOffloadEnv(scenario, seed=seed)
-    state = env.reset()
+def evaluate(agent, scenario, episode_steps, seed, background_mode="poisson", warm_start=None,
+             num_envs=1):
+    """`num_envs` > 1 runs that many independent envs (seeds seed,
+    seed+1, ...) in lockstep, choosing all their actions with one
+    agent.select_actions() call per step, and pools the metrics."""
+    envs = [MECOffloadEnv(scenario, seed=seed + i, background_mode=background_mode, warm_start=warm_start)
+            for i in range(num_envs)]
+    states = [env.reset() for env in envs]
 
     service_times, process_times, network_delays = [], [], []
     completed = failed_network = failed_vm = 0
+    regret = 0.0
+    oracle_matches = 0
 
     for _ in range(episode_steps):
-        action = agent.select_action(state, greedy=True)
-        state, reward, done, info = env.step(action)
-        if info["failed"]:
-            if info.get("network_fail"):
-                failed_network += 1
-            if info.get("vm_fail"):
-                failed_vm += 1
-        else:
-            completed += 1
-            service_times.append(info["service_time"])
-            network_delays.append(info["delay"])
-            process_times.append(info["service_time"] - info["delay"])
+        actions = agent.select_actions(np.stack(states), greedy=True)
+        for i, env in enumerate(envs):
+            all_rewards, _ = env.step_all_actions()
+            states[i], reward, done, info = env.step(int(actions[i]))
+            best = float(all_rewards.max())
+            regret += best - reward
+            oracle_matches += reward >= best
+            if info["failed"]:
+                if info.get("network_fail"):
+                    failed_network += 1
+                if info.get("vm_fail"):
+                    failed_vm += 1
+            else:
+                completed += 1
+                service_times.append(info["service_time"])
+                network_delays.append(info["delay"])
+                process_times.append(info["service_time"] - info["delay"])
 
+    decisions = episode_steps * num_envs
     total = completed + failed_network + failed_vm
     avg = lambda xs: (sum(xs) / len(xs)) if xs else float("nan")
     return {
@@ -78,6 +121,48 @@ def evaluate(agent, scenario, episode_steps, seed):
         "avg_service_time": avg(service_times),
         "avg_processing_time": avg(process_times),
         "avg_network_delay": avg(network_delays),
+        "avg_regret": regret / decisions if decisions else float("nan"),
+        "oracle_match_rate": oracle_matches / decisions if decisions else float("nan"),
+    }
+
+
+def evaluate_shared(agent, scenario, episode_steps, seed, num_agents):
+    """evaluate() on a MultiAgentMECOffloadEnv: `episode_steps` ticks of
+    `num_agents` decisions each, all from `agent`, metrics pooled."""
+    env = MultiAgentMECOffloadEnv(scenario, num_agents, seed=seed)
+    states = env.reset()
+
+    service_times, network_delays = [], []
+    failed_network = failed_vm = 0
+    regret = 0.0
+    oracle_matches = 0
+
+    for _ in range(episode_steps):
+        actions = agent.select_actions(states, greedy=True)
+        all_rewards, _ = env.step_all_actions()
+        states, rewards, dones, info = env.step(actions)
+        best = all_rewards.max(axis=1)
+        regret += float((best - rewards).sum())
+        oracle_matches += int((rewards >= best).sum())
+        failed_network += int(info["network_fail"].sum())
+        failed_vm += int(info["vm_fail"].sum())
+        ok = ~info["failed"]
+        service_times.extend(info["service_time"][ok].tolist())
+        network_delays.extend(info["delay"][ok].tolist())
+
+    completed = len(service_times)
+    total = completed + failed_network + failed_vm
+    decisions = episode_steps * num_agents
+    avg = lambda xs: (sum(xs) / len(xs)) if xs else float("nan")
+    return {
+        "completion_rate": completed / total if total else float("nan"),
+        "network_fail_rate": failed_network / total if total else float("nan"),
+        "vm_fail_rate": failed_vm / total if total else float("nan"),
+        "avg_service_time": avg(service_times),
+        "avg_processing_time": avg([st - d for st, d in zip(service_times, network_delays)]),
+        "avg_network_delay": avg(network_delays),
+        "avg_regret": regret / decisions if decisions else float("nan"),
+        "oracle_match_rate": oracle_matches / decisions if decisions else float("nan"),
     }
 
 
@@ -93,11 +178,23 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--episode-steps", type=int, default=500)
     parser.add_argument("--seed", type=int, default=123)
+    parser.add_argument("--agents", type=int, default=1,
+                        help="controlled devices sharing the edge/cloud pools (>1: MultiAgentMECOffloadEnv)")
     parser.add_argument("--checkpoints-dir", type=str, default=os.path.join(
         os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "checkpoints"))
     parser.add_argument("--out-csv", type=str, default=os.path.join(
         os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "checkpoints", "comparison.csv"))
+    parser.add_argument("--background-mode", choices=["poisson", "devices", "fluid"], default="poisson",
+                        help="MECOffloadEnv background model (single-agent evaluation only)")
+    parser.add_argument("--warm-start", action="store_true",
+                        help="start each evaluation from a cached burned-in env state")
+    parser.add_argument("--envs", type=int, default=1,
+                        help="independent envs per (single-agent) evaluation, stepped in lockstep with "
+                             "one batched action selection per step")
     args = parser.parse_args()
+    if args.warm_start and (args.agents > 1 or args.background_mode != "poisson"):
+        parser.error("--warm-start needs --agents 1 and --background-mode poisson")
+    warm_start_cache = WarmStartCache(os.path.join(args.checkpoints_dir, "warm_start")) if args.warm_start else None
 
     agents = {}
     for name, (filename, loader) in ALGORITHMS.items():
@@ -119,14 +216,23 @@ def main():
     for device_count in DEVICE_COUNTS:
         scenario = scenario_for_device_count(base_scenario, device_count)
         for name, agent in agents.items():
-            metrics = evaluate(agent, scenario, args.episode_steps, seed=args.seed + device_count)
+            if args.agents > 1:
+                metrics = evaluate_shared(agent, scenario, args.episode_steps,
+                                          seed=args.seed + device_count, num_agents=args.agents)
+            else:
+                metrics = evaluate(agent, scenario, args.episode_steps, seed=args.seed + device_count,
+                                   background_mode=args.background_mode,
+                                   warm_start=warm_start_cache.get(scenario) if warm_start_cache else None,
+                                   num_envs=args.envs)
             row = {"algorithm": name, "devices": device_count, **metrics}
             rows.append(row)
             print(f"devices={device_count:5d}  {name:8s}  "
                   f"completion={metrics['completion_rate']*100:6.2f}%  "
                   f"service_time={metrics['avg_service_time']:.3f}s  "
                   f"net_fail={metrics['network_fail_rate']*100:5.2f}%  "
-                  f"vm_fail={metrics['vm_fail_rate']*100:5.2f}%")
+                  f"vm_fail={metrics['vm_fail_rate']*100:5.2f}%  "
+                  f"regret={metrics['avg_regret']:.3f}s  "
+                  f"oracle_match={metrics['oracle_match_rate']*100:5.1f}%")
 
     os.makedirs(os.path.dirname(args.out_csv), exist_ok=True)
     with open(args.out_csv, "w", newline="") as f:
@@ -0,0 +1,49 @@
+"""Convert EdgeCloudSim per-task logs into a compact binary task trace for
+resaco/trace.py's TraceMECOffloadEnv.
+
+Needs a simulation run with deep_file_log_enabled=true in
+default_config.properties, which makes SimLogger write
+"<prefix>_SUCCESS.log" and "<prefix>_FAIL.log" per scenario. Both should
+usually be converted together -- failed tasks were still generated, so
+leaving them out would thin out the replayed arrival process.
+
+Usage:
+    python scripts/convert_traces.py OUT.npy LOG [LOG ...]
+    python scripts/convert_traces.py OUT.npy --log-dir ../EdgeCloudSim/scripts/ReSACO/output/...
+"""
+
+import argparse
+import glob
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resaco.trace import convert_logs, load_trace
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("out", type=str, help="output trace path (.npy)")
+    parser.add_argument("logs", type=str, nargs="*", help="SimLogger _SUCCESS.log/_FAIL.log files")
+    parser.add_argument("--log-dir", type=str, default=None,
+                         help="also convert every *_SUCCESS.log/*_FAIL.log under this directory (recursive)")
+    args = parser.parse_args()
+
+    logs = list(args.logs)
+    if args.log_dir:
+        for pattern in ("*_SUCCESS.log", "*_FAIL.log"):
+            logs.extend(sorted(glob.glob(os.path.join(args.log_dir, "**", pattern), recursive=True)))
+    if not logs:
+        parser.error("no log files given (pass LOG paths and/or --log-dir)")
+
+    print(f"Converting {len(logs)} log file(s)...")
+    count = convert_logs(logs, args.out)
+    trace = load_trace(args.out)
+    span = float(trace["arrival"][-1] - trace["arrival"][0]) if count else 0.0
+    print(f"Wrote {count:,} tasks ({os.path.getsize(args.out) / 1e6:.1f} MB, "
+          f"{span:.0f}s of simulated time) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Distills one served algorithm's actor into a compact decision tree
+(resaco/distill.py) that the bridge serves under "<NAME>_TREE".
+
+Collects --states states from MECOffloadEnv rollouts across a
+sample_scenario_pool, with the teacher acting; labels them with its greedy
+action; fits the tree; and reports greedy agreement with the teacher on
+--holdout fresh states (other scenarios and seeds), tree size and
+per-decision cost against the teacher. Writes "<checkpoint>_tree.npz"
+next to the checkpoint -- for an adapting algo, a snapshot of its
+online-adapted checkpoint if there is one.
+
+Usage:
+    python scripts/distill_policy.py [--algo A2C_BASELINE] [--max-depth 10] [--states 20000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import torch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resaco.distill import collect_states, fit_tree
+from bridge.inference_server import ALGO_REGISTRY, DISTILLED_REGISTRY, _adapted_path, _export_path
+
+
+def _us_per_call(fn, states, repeats: int = 2000) -> float:
+    start = time.perf_counter()
+    for i in range(repeats):
+        fn(states[i % len(states)])
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--algo", choices=sorted(ALGO_REGISTRY), default="A2C_BASELINE")
+    parser.add_argument("--checkpoints-dir", type=str, default=os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "checkpoints"))
+    parser.add_argument("--states", type=int, default=20000, help="teacher-labelled training states")
+    parser.add_argument("--holdout", type=int, default=5000, help="fresh states agreement is measured on")
+    parser.add_argument("--scenarios", type=int, default=8)
+    parser.add_argument("--max-depth", type=int, default=10)
+    parser.add_argument("--min-samples-leaf", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    filename, agent_cls, _, persist = ALGO_REGISTRY[args.algo]
+    original_path = os.path.join(args.checkpoints_dir, filename)
+    source = _adapted_path(original_path) if persist and os.path.exists(_adapted_path(original_path)) \
+        else original_path
+    if not os.path.exists(source):
+        sys.exit(f"No checkpoint at {original_path}. Run train_meta.py / train_baselines.py first.")
+    teacher = agent_cls()
+    teacher.load_params(torch.load(source, map_location="cpu"))
+
+    print(f"Distilling {args.algo} ({os.path.basename(source)}) from {args.states} states "
+          f"over {args.scenarios} scenarios...")
+    states = collect_states(teacher, args.states, args.scenarios, seed=args.seed)
+    labels = teacher.select_actions(states, greedy=True)
+    tree = fit_tree(states, labels, max_depth=args.max_depth, min_samples_leaf=args.min_samples_leaf)
+
+    holdout = collect_states(teacher, args.holdout, args.scenarios, seed=args.seed + 10_000)
+    train_agreement = float(np.mean(tree.select_actions(states) == labels))
+    holdout_agreement = float(np.mean(tree.select_actions(holdout) == teacher.select_actions(holdout, greedy=True)))
+
+    out_path = _export_path(original_path, "_tree.npz")
+    tree.save(out_path)
+    name = next(name for name, algo in DISTILLED_REGISTRY.items() if algo == args.algo)
+    print(f"  {tree.num_nodes} nodes, depth {tree.depth}; greedy agreement "
+          f"{train_agreement * 100:.1f}% (train) / {holdout_agreement * 100:.1f}% (held out)")
+    print(f"  teacher {_us_per_call(lambda s: teacher.select_action(s, greedy=True), holdout):.1f} us -> "
+          f"tree {_us_per_call(tree.select_action, holdout):.1f} us per decision")
+    print(f"Saved -> {out_path} (served by the bridge as {name})")
+
+
+if __name__ == "__main__":
+    main()
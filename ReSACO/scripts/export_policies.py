@@ -0,0 +1,76 @@
+"""Exports every served algorithm's trained actor for lightweight inference,
+next to each bridge checkpoint: "<checkpoint>.npz" (resaco/numpy_policy.py,
+normalization folded into the first layer) and "<checkpoint>_scripted.pt"
+(resaco/scripted_policy.py, a frozen TorchScript graph with normalization
+inside). Reports each export's greedy agreement with the agent and its
+per-decision cost.
+
+The bridge serves A2C_BASELINE/A3C_BASELINE from these files when they
+are at least as new as their checkpoints; the adapting algos always
+serve their live networks, so their exports are only for offline use
+(an adapted checkpoint is exported in preference to the original).
+
+Usage:
+    python scripts/export_policies.py [--checkpoints-dir DIR]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import torch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resaco.numpy_policy import NumpyPolicy, export_actor
+from resaco.quantized_policy import record_gate_states
+from resaco.scripted_policy import ScriptedPolicy, export_scripted_actor
+from bridge.inference_server import ALGO_REGISTRY, _adapted_path, _export_path
+
+
+def _us_per_call(fn, states, repeats: int = 2000) -> float:
+    for state in states[:50]:
+        fn(state)
+    start = time.perf_counter()
+    for i in range(repeats):
+        fn(states[i % len(states)])
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--checkpoints-dir", type=str, default=os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "checkpoints"))
+    args = parser.parse_args()
+
+    states = record_gate_states(num_states=1000)  # env rollouts, any STATE_DIM
+
+    for algo, (filename, agent_cls, _, persist) in ALGO_REGISTRY.items():
+        original_path = os.path.join(args.checkpoints_dir, filename)
+        source = _adapted_path(original_path) if persist else original_path
+        if not os.path.exists(source):
+            source = original_path
+        if not os.path.exists(source):
+            print(f"{algo:14s} no checkpoint at {original_path}, skipped")
+            continue
+        agent = agent_cls()
+        agent.load_params(torch.load(source, map_location="cpu"))
+
+        npz_path = _export_path(original_path, ".npz")
+        scripted_path = _export_path(original_path, "_scripted.pt")
+        export_actor(agent.actor, npz_path)
+        export_scripted_actor(agent.actor, scripted_path)
+        greedy = agent.select_actions(states, greedy=True)
+        print(f"{algo:14s} agent: {_us_per_call(lambda s: agent.select_action(s, greedy=True), states):.1f} "
+              f"us per decision")
+        for path, policy in ((npz_path, NumpyPolicy.load(npz_path)),
+                             (scripted_path, ScriptedPolicy.load(scripted_path))):
+            agreement = float(np.mean(policy.select_actions(states) == greedy))
+            print(f"{'':14s} -> {os.path.basename(path):22s} greedy agreement {agreement * 100:.1f}%  "
+                  f"{_us_per_call(policy.select_action, states):.1f} us per decision")
+
+
+if __name__ == "__main__":
+    main()
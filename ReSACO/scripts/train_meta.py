@@ -1,10 +1,14 @@
 """Run the ReSACO Meta-Learning Phase (Algorithm 1) and save theta*.
 
 Usage:
-    python scripts/train_meta.py [--scenarios M] [--outer K] [--inner N] [--out PATH]
+    python scripts/train_meta.py [--scenarios M] [--outer K] [--inner N] [--out PATH] [--warm-start]
 
 Defaults reproduce the paper's Section V-B-1 setup (M=10, K=300, N=50), but
-these can be scaled down for a quick smoke test.
+these can be scaled down for a quick smoke test. --warm-start starts every
+Inner Loop from a burned-in env state (resaco/warm_start.py, cached under
+checkpoints/warm_start/) instead of an empty cluster. --meta-batch-size M
+--workers W runs batched Reptile: M Inner Loops per outer step, from the
+same theta, in W parallel worker processes (resaco/reptile.py).
 """
 
 import argparse
@@ -18,6 +22,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from resaco import config
 from resaco.reptile import outer_loop
 from resaco.scenario import sample_scenario_pool
+from resaco.warm_start import WarmStartCache
 
 
 def main():
@@ -28,7 +33,22 @@ def main():
     parser.add_argument("--seed", type=int, default=42)
     parser.add_argument("--out", type=str, default=os.path.join(
         os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "checkpoints", "theta_star.pt"))
+    parser.add_argument("--warm-start", action="store_true",
+                        help="start each Inner Loop from a cached burned-in env state")
+    parser.add_argument("--compile", action="store_true",
+                        help="torch.compile the SAC update (falls back to eager if unavailable)")
+    parser.add_argument("--flat-params", action="store_true",
+                        help="keep each network in one contiguous buffer; saves theta* in the flat format")
+    parser.add_argument("--meta-batch-size", type=int, default=config.META_BATCH_SIZE,
+                        help="Inner Loops per outer step, averaged into one Reptile update (batched Reptile)")
+    parser.add_argument("--workers", type=int, default=config.META_NUM_WORKERS,
+                        help="worker processes running each meta-batch's Inner Loops in parallel (0: in-process)")
     args = parser.parse_args()
+    agent_kwargs = {}
+    if args.compile:
+        agent_kwargs["use_compile"] = True
+    if args.flat_params:
+        agent_kwargs["flat_params"] = True
 
     os.makedirs(os.path.dirname(args.out), exist_ok=True)
 
@@ -43,7 +63,9 @@ def main():
               f"{p.vm_utilization_on_cloud:.2f}/{p.vm_utilization_on_mobile:.1f}")
 
     print(f"\nRunning Outer Loop: K={args.outer} outer iterations, "
-          f"N={args.inner} inner SAC updates per iteration...")
+          f"N={args.inner} inner SAC updates per iteration"
+          + (f", meta-batches of {args.meta_batch_size} on {args.workers or 'no'} worker processes"
+             if args.meta_batch_size > 1 or args.workers else "") + "...")
     reward_log = []
     theta_star = outer_loop(
         scenarios,
@@ -52,6 +74,11 @@ def main():
         seed=args.seed,
         progress_every=max(1, args.outer // 15),
         reward_log=reward_log,
+        agent_kwargs=agent_kwargs or None,
+        meta_batch_size=args.meta_batch_size,
+        num_workers=args.workers,
+        warm_start_cache=(WarmStartCache(os.path.join(os.path.dirname(args.out), "warm_start"))
+                          if args.warm_start else None),
     )
 
     torch.save(theta_star, args.out)
@@ -0,0 +1,92 @@
+"""Validation harness for MECOffloadEnv(background_mode="fluid").
+
+Runs the same scenario, seed and (random) agent actions under the default
+stochastic background injection ("poisson") and under the fluid mean-field
+update ("fluid") across a device-count sweep, and compares the edge/cloud
+utilization each produces once past the initial transient:
+
+  - mean, standard deviation and 10th/50th/90th percentiles per mode;
+  - the 1-Wasserstein distance between the two empirical distributions
+    (in utilization percentage points: how far, on average, one
+    distribution's mass has to move to become the other);
+  - steps per second per mode, to show the fluid mode's cost staying flat
+    as device count grows.
+
+The fluid mode only tracks the mean, so expect matching means (below
+saturation) and a much narrower spread, not identical distributions.
+
+Usage:
+    python scripts/validate_fluid_background.py [--steps N] [--burn-in N] [--devices 200 600 1000 ...]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from dataclasses import replace
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resaco import config
+from resaco.env import MECOffloadEnv
+from resaco.scenario import sample_scenario
+
+
+def utilization_samples(scenario, background_mode, steps, burn_in, seed):
+    """Returns (edge, cloud, steps_per_second): every edge server's and the
+    cloud's utilization after each of `steps` post-burn-in steps."""
+    env = MECOffloadEnv(scenario, seed=seed, background_mode=background_mode)
+    env.reset()
+    actions = np.random.default_rng(seed).integers(0, config.ACTION_DIM, size=burn_in + steps).tolist()
+    for action in actions[:burn_in]:
+        env.step(action)
+    edge = np.empty((steps, env.n_edge))
+    cloud = np.empty(steps)
+    start = time.perf_counter()
+    for i, action in enumerate(actions[burn_in:]):
+        env.step(action)
+        edge[i] = env.mu_edge
+        cloud[i] = env.mu_cloud
+    return edge.ravel(), cloud, steps / (time.perf_counter() - start)
+
+
+def wasserstein(a, b) -> float:
+    """1-Wasserstein distance between two 1-D empirical distributions."""
+    quantiles = np.linspace(0.0, 1.0, 201)
+    return float(np.mean(np.abs(np.quantile(a, quantiles) - np.quantile(b, quantiles))))
+
+
+def _summary(x) -> str:
+    p10, p50, p90 = np.percentile(x, [10, 50, 90])
+    return f"{x.mean():7.1f} {x.std():6.1f} {p10:6.1f} {p50:6.1f} {p90:6.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, default=3000)
+    parser.add_argument("--burn-in", type=int, default=200)
+    parser.add_argument("--devices", type=int, nargs="+", default=list(range(200, 2001, 400)))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    base = sample_scenario(random.Random(args.seed))
+    print(f"Scenario: app={base.app_profile.name}")
+    header = f"{'mean':>7s} {'std':>6s} {'p10':>6s} {'p50':>6s} {'p90':>6s}"
+    print(f"{'devices':>7s} {'pool':5s} {'mode':7s} {header}  {'W1':>6s} {'steps/s':>9s}")
+    for devices in args.devices:
+        scenario = replace(base, number_of_mobile_devices=devices)
+        results = {mode: utilization_samples(scenario, mode, args.steps, args.burn_in, args.seed)
+                   for mode in ("poisson", "fluid")}
+        for pool, column in (("edge", 0), ("cloud", 1)):
+            distance = wasserstein(results["poisson"][column], results["fluid"][column])
+            for mode, samples in results.items():
+                w1 = f"{distance:6.1f}" if mode == "fluid" else " " * 6
+                print(f"{devices:7d} {pool:5s} {mode:7s} {_summary(samples[column])}  {w1} "
+                      f"{samples[2]:9,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Tests for resaco/background.py's background engines, as driven through
+MECOffloadEnv(background_mode="devices" / "fluid")."""
+
+import numpy as np
+import pytest
+
+from resaco import config
+from resaco.env import MECOffloadEnv, _SATURATION_CEILING
+from resaco.scenario import AppProfile, Scenario
+
+
+def _make_scenario(number_of_mobile_devices=1, poisson_interarrival=2.0):
+    profile = AppProfile(
+        name="TEST_APP", usage_percentage=100.0, poisson_interarrival=poisson_interarrival,
+        delay_sensitivity=0.5, active_period=30.0, idle_period=30.0,
+        data_upload=200.0, data_download=200.0, task_length=3000.0, required_core=1,
+        vm_utilization_on_edge=10.0, vm_utilization_on_cloud=1.0, vm_utilization_on_mobile=5.0,
+    )
+    return Scenario(app_profile=profile, number_of_mobile_devices=number_of_mobile_devices)
+
+
+def _devices_env(number_of_mobile_devices, poisson_interarrival=2.0, seed=0):
+    return MECOffloadEnv(_make_scenario(number_of_mobile_devices=number_of_mobile_devices,
+                                        poisson_interarrival=poisson_interarrival),
+                         seed=seed, background_mode="devices")
+
+
+def test_unknown_background_mode_raises():
+    with pytest.raises(ValueError):
+        MECOffloadEnv(_make_scenario(), background_mode="bogus")
+
+
+def test_device_level_contention_scales_with_device_count():
+    low = _devices_env(2, poisson_interarrival=5.0, seed=1)
+    high = _devices_env(2000, poisson_interarrival=5.0, seed=1)
+    low.reset()
+    high.reset()
+    for _ in range(20):
+        low.step(0)
+        high.step(0)
+    assert sum(high.mu_edge) > sum(low.mu_edge)
+    assert high.mu_cloud > low.mu_cloud
+
+
+def test_device_level_arrivals_match_the_merged_device_rate():
+    background = _devices_env(401, poisson_interarrival=4.0, seed=4)._background  # 400 others: 100/s
+    counts = [len(background._arrivals(0.5 * (i + 1))) for i in range(2000)]
+    assert np.mean(counts) == pytest.approx(50.0, rel=0.02)
+    assert np.var(counts) == pytest.approx(50.0, rel=0.15)  # Poisson: variance = mean
+    window = background._arrivals(1000.75)
+    assert len(window) and window.min() > 1000.0 and window.max() <= 1000.75
+
+
+def test_device_level_contention_never_exceeds_saturation_ceiling():
+    env = _devices_env(2000, poisson_interarrival=1.0, seed=2)
+    env.reset()
+    for _ in range(50):
+        env.step(0)
+        assert np.all(env._util_np <= _SATURATION_CEILING + 1e-9)
+
+
+def test_device_level_releases_account_for_edge_and_cloud_utilization():
+    # The agent only ever runs locally, so every bit of edge/cloud
+    # utilization must be backed by an outstanding background release.
+    env = _devices_env(300, seed=3)
+    env.reset()
+    background = env._background
+    for _ in range(200):
+        env.step(0)
+        assert np.all(background._rel_time > env.clock)
+        assert np.all(np.diff(background._rel_time) >= 0)
+    outstanding = np.bincount(background._rel_slot, weights=background._rel_delta,
+                              minlength=env.n_edge + 2)
+    np.testing.assert_allclose(env.mu_edge, outstanding[1:-1], atol=1e-9)
+    assert abs(env.mu_cloud - outstanding[-1]) < 1e-9
+
+
+def test_device_level_mode_leaves_agent_task_stream_unchanged():
+    # The engine draws from its own numpy stream, so the agent's tasks are
+    # exactly those of a contention-free env with the same seed.
+    alone = MECOffloadEnv(_make_scenario(number_of_mobile_devices=1), seed=4)
+    devices = _devices_env(500, seed=4)
+    alone.reset()
+    devices.reset()
+    for _ in range(30):
+        s1, _, _, _ = alone.step(0)
+        s2, _, _, _ = devices.step(0)
+        np.testing.assert_array_equal(s1[:3], s2[:3])
+
+
+@pytest.mark.parametrize("background_mode", ["devices", "fluid"])
+def test_restore_replays_identical_trajectory(background_mode):
+    env = MECOffloadEnv(_make_scenario(number_of_mobile_devices=1000), seed=5,
+                        background_mode=background_mode)
+    env.reset()
+    for step in range(25):
+        env.step(step % config.ACTION_DIM)
+    snap = env.snapshot()
+    first = [env.step(step % config.ACTION_DIM) for step in range(40)]
+    env.restore(snap)
+    second = [env.step(step % config.ACTION_DIM) for step in range(40)]
+    for (s1, r1, _, _), (s2, r2, _, _) in zip(first, second):
+        assert r1 == r2
+        np.testing.assert_array_equal(s1, s2)
+
+
+def _naive_admission(engine, arrivals, slots, release, util):
+    """Arrival-by-arrival reference for DeviceLevelBackground._admit."""
+    util = util.copy()
+    queued = sorted(zip(engine._rel_time.tolist(), engine._rel_slot.tolist(), engine._rel_delta.tolist()))
+    running = []  # (release_time, slot, delta) of tasks admitted here
+    admitted = []
+    for t, slot, end in zip(arrivals.tolist(), slots.tolist(), release.tolist()):
+        for entry in [e for e in queued + running if e[0] <= t]:
+            util[entry[1]] -= entry[2]
+            (queued if entry in queued else running).remove(entry)
+        mu = engine._mu_required[slot]
+        ok = util[slot] + mu <= engine.ceiling
+        if ok:
+            util[slot] += mu
+            running.append((end, slot, mu))
+        admitted.append(ok)
+    return np.array(admitted)
+
+
+def test_admission_matches_an_arrival_by_arrival_event_loop():
+    env = _devices_env(2000, poisson_interarrival=1.0, seed=6)
+    env.reset()
+    for _ in range(5):
+        env.step(0)  # leave some background tasks queued
+    engine = env._background
+    rng = np.random.default_rng(0)
+    n = 400
+    arrivals = np.sort(env.clock + rng.uniform(0.0, 2.0, n))
+    slots = rng.integers(1, env.n_edge + 2, n)
+    release = arrivals + rng.exponential(0.3, n)
+    util = env._util_np.copy()
+    expected = _naive_admission(engine, arrivals, slots, release, util)
+    assert 0 < expected.sum() < n  # actually contended
+    np.testing.assert_array_equal(engine._admit(arrivals, slots, release, util), expected)
+
+
+def _light_scenario(number_of_mobile_devices, poisson_interarrival):
+    # small per-task utilization, so neither mode gets near the ceiling
+    profile = AppProfile(
+        name="TEST_APP", usage_percentage=100.0, poisson_interarrival=poisson_interarrival,
+        delay_sensitivity=0.5, active_period=30.0, idle_period=30.0,
+        data_upload=200.0, data_download=200.0, task_length=15000.0, required_core=1,
+        vm_utilization_on_edge=0.2, vm_utilization_on_cloud=0.05, vm_utilization_on_mobile=5.0,
+    )
+    return Scenario(app_profile=profile, number_of_mobile_devices=number_of_mobile_devices)
+
+
+def _mean_utilization(scenario, background_mode, steps=3000, burn_in=200, seed=8):
+    env = MECOffloadEnv(scenario, seed=seed, background_mode=background_mode)
+    env.reset()
+    edge = cloud = 0.0
+    for step in range(burn_in + steps):
+        env.step(0)
+        if step >= burn_in:
+            edge += float(np.mean(env.mu_edge))
+            cloud += env.mu_cloud
+    return edge / steps, cloud / steps
+
+
+def test_fluid_mode_matches_stochastic_injection_mean_below_saturation():
+    for interarrival in (2.0, 7.0):
+        scenario = _light_scenario(200, interarrival)
+        poisson_edge, poisson_cloud = _mean_utilization(scenario, "poisson")
+        fluid_edge, fluid_cloud = _mean_utilization(scenario, "fluid")
+        assert abs(fluid_edge - poisson_edge) < 0.05 * poisson_edge
+        assert abs(fluid_cloud - poisson_cloud) < 0.05 * poisson_cloud
+
+
+def test_fluid_mode_respects_saturation_ceiling_with_agent_load():
+    env = MECOffloadEnv(_make_scenario(number_of_mobile_devices=2000, poisson_interarrival=1.0),
+                        seed=9, background_mode="fluid")
+    env.reset()
+    for step in range(100):
+        env.step(1 + step % env.n_edge)
+        assert np.all(env._util_np <= _SATURATION_CEILING + 1e-9)
+        assert np.all(env._util_np >= 0.0)
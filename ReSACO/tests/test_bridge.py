@@ -45,6 +45,7 @@ def test_load_agents_missing_checkpoint_falls_back_to_random_init(tmp_path):
     assert set(missing) == set(srv.ALGO_REGISTRY.keys())
     assert loaded == []
     assert resumed == []
+    assert list(tmp_path.iterdir()) == []  # replay persistence is opt-in
 
 
 def test_persist_capable_agent_gets_correct_adapted_save_path(tmp_path):
@@ -77,10 +78,11 @@ def test_each_algo_has_its_own_independent_lock():
     """Regression test: a single shared lock would serialize every algo's
     ACT/OUTCOME behind e.g. RESACO's blocking autosave disk write, even
     though the algos share no state that needs protecting together. Locks
-    must be distinct objects, one per ALGO_REGISTRY entry."""
-    assert set(srv._locks.keys()) == set(srv.ALGO_REGISTRY.keys())
+    must be distinct objects, one per ALGO_REGISTRY/DISTILLED_REGISTRY entry."""
+    served = set(srv.ALGO_REGISTRY) | set(srv.DISTILLED_REGISTRY)
+    assert set(srv._locks.keys()) == served
     lock_ids = {id(lock) for lock in srv._locks.values()}
-    assert len(lock_ids) == len(srv.ALGO_REGISTRY), "some algos share the same lock object"
+    assert len(lock_ids) == len(served), "some algos share the same lock object"
 
 
 def test_locking_one_algo_does_not_block_another():
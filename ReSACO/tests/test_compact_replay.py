@@ -0,0 +1,73 @@
+"""Tests for the replay buffers' compact storage mode (prenormalized=True):
+normalize once on push, float16 states, float32 sampled batches."""
+
+import numpy as np
+import torch
+
+import resaco.sac as sac
+from resaco import config
+from resaco.normalize import _SCALE, normalize_state
+from resaco.replay_buffer import MmapReplayBuffer, ReplayBuffer
+from resaco.shared_replay import SharedReplayBuffer
+
+
+def _raw_transitions(n, seed=0):
+    rng = np.random.default_rng(seed)
+    states = rng.random((n + 1, config.STATE_DIM)) * 1.2 * _SCALE
+    return states, rng.integers(0, config.ACTION_DIM, n), -rng.random(n)
+
+
+def _fill(buf, n=200, seed=0):
+    states, actions, rewards = _raw_transitions(n, seed)
+    for i in range(n):
+        buf.push(states[i].tolist(), int(actions[i]), rewards[i], states[i + 1].tolist(), float(i % 7 == 0))
+    return states
+
+
+def _storage_bytes(buf):
+    return sum(getattr(buf, name).nbytes for name in ("state", "action", "reward", "next_state", "done"))
+
+
+def test_compact_buffer_stores_normalized_float16_and_upcasts_samples():
+    compact, raw = ReplayBuffer(500, seed=0, prenormalized=True), ReplayBuffer(500, seed=0)
+    _fill(compact)
+    _fill(raw)
+    assert compact.state.dtype == np.float16
+    assert _storage_bytes(compact) * 1.9 <= _storage_bytes(raw)
+
+    state, action, reward, next_state, done = compact.sample(64)
+    assert state.dtype == next_state.dtype == np.float32
+    raw_state, raw_action, _, raw_next, _ = raw.sample(64)  # same seed -> same indices
+    np.testing.assert_array_equal(action, raw_action)
+    np.testing.assert_allclose(state, normalize_state(raw_state), rtol=1e-3, atol=1e-3)
+    np.testing.assert_allclose(next_state, normalize_state(raw_next), rtol=1e-3, atol=1e-3)
+
+
+def test_sac_update_skips_normalization_for_compact_buffers(monkeypatch):
+    calls = []
+    monkeypatch.setattr(sac, "normalize_state", lambda s: calls.append(1) or normalize_state(s))
+    agent = sac.SACAgent()
+    agent.replay_buffer = ReplayBuffer(500, seed=0, prenormalized=True)
+    _fill(agent.replay_buffer)
+    torch.manual_seed(0)
+    assert agent.update() is not None
+    assert calls == []
+
+
+def test_compact_mode_in_mmap_and_shared_buffers(tmp_path):
+    path = str(tmp_path / "replay.bin")
+    states = _fill(MmapReplayBuffer(path, capacity=300, prenormalized=True), n=10)
+    reopened = MmapReplayBuffer(path, capacity=300, prenormalized=True)
+    assert len(reopened) == 10 and reopened.state.dtype == np.float16
+    np.testing.assert_allclose(reopened.state[:10], normalize_state(states[:10]), rtol=1e-3, atol=1e-3)
+    assert len(MmapReplayBuffer(path, capacity=300)) == 0  # other storage mode: stale, recreated
+
+    shared = SharedReplayBuffer(300, prenormalized=True)
+    try:
+        attached = SharedReplayBuffer.attach(shared.handle())
+        _fill(attached, n=10)
+        np.testing.assert_allclose(shared.state[:10], normalize_state(states[:10]), rtol=1e-3, atol=1e-3)
+        attached.close()
+    finally:
+        shared.close()
+        shared.unlink()
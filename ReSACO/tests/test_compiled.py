@@ -0,0 +1,91 @@
+"""Tests for resaco/compiled.py's opt-in compiled update path: numerical
+parity with eager, silent fallback, and the agent reuse that keeps
+compilation cached across Reptile Inner Loops."""
+
+import numpy as np
+import pytest
+import torch
+
+from resaco import compiled, config
+from resaco.baselines.ddpg import DDPGAgent
+from resaco.replay_buffer import ReplayBuffer
+from resaco.sac import SACAgent
+
+
+def _filled(agent_cls, **kwargs):
+    torch.manual_seed(0)
+    agent = agent_cls(**kwargs)
+    agent.replay_buffer = ReplayBuffer(1000, seed=0)
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        agent.replay_buffer.push(rng.random(config.STATE_DIM) * 100, int(rng.integers(config.ACTION_DIM)),
+                                 -rng.random(), rng.random(config.STATE_DIM) * 100, 0.0)
+    return agent
+
+
+def _assert_params_close(a, b):
+    a, b = a.get_params(), b.get_params()
+    for group in a:
+        torch.testing.assert_close(a[group], b[group], rtol=1e-4, atol=1e-5)
+
+
+def test_compiled_update_matches_eager():
+    # aot_eager traces forward+backward like inductor does, without the
+    # C++ codegen that would make this test take tens of seconds
+    for agent_cls in (SACAgent, DDPGAgent):
+        eager = _filled(agent_cls)
+        fast = _filled(agent_cls, use_compile=True, compile_backend="aot_eager")
+        for _ in range(3):
+            eager.update(batch_size=32)
+            fast.update(batch_size=32)
+        assert fast._critic_loss_fn.active and fast._actor_loss_fn.active
+        _assert_params_close(eager, fast)
+
+
+def test_compile_failure_falls_back_to_eager(monkeypatch):
+    def broken_compile(fn, **kwargs):
+        def run(*args):
+            raise RuntimeError("no compiler")
+        return run
+
+    monkeypatch.setattr(compiled.torch, "compile", broken_compile)
+    eager, fallback = _filled(SACAgent), _filled(SACAgent, use_compile=True)
+    assert fallback._critic_loss_fn.active
+    eager.update()
+    fallback.update()
+    assert not fallback._critic_loss_fn.active
+    _assert_params_close(eager, fallback)
+
+
+def test_errors_after_the_first_compiled_call_are_not_swallowed(monkeypatch):
+    calls = []
+
+    def flaky_compile(fn, **kwargs):
+        def run(*args):
+            calls.append(args)
+            if len(calls) > 1:
+                raise ValueError("shape mismatch")
+            return fn(*args)
+        return run
+
+    monkeypatch.setattr(compiled.torch, "compile", flaky_compile)
+    loss = compiled.CompiledOrEager(lambda x: x * 2, enabled=True)
+    assert loss(3) == 6 and loss.active
+    with pytest.raises(ValueError):
+        loss(4)
+    assert loss.active  # a runtime error is not a reason to stop compiling
+
+    def failing_recompile(*args):
+        raise torch._dynamo.exc.TorchDynamoException("recompile failed")
+
+    loss._compiled = failing_recompile
+    assert loss(5) == 10 and not loss.active
+
+
+def test_reset_training_state_makes_a_reused_agent_fresh():
+    agent = _filled(SACAgent)
+    agent.update()
+    assert agent.critic_optim.state
+    agent.reset_training_state()
+    assert len(agent.replay_buffer) == 0
+    assert not agent.critic_optim.state and not agent.actor_optim.state
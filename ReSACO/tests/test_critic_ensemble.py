@@ -0,0 +1,41 @@
+"""Tests for resaco/networks.py's CriticEnsemble and SACAgent's use of it:
+the fused forward matches separate Critics, and checkpoints keep the
+plain per-critic "critic1"/"critic2" format."""
+
+import torch
+
+from resaco import config
+from resaco.networks import Critic, CriticEnsemble
+from resaco.reptile import _interpolate_params
+from resaco.sac import SACAgent
+
+
+def test_ensemble_forward_matches_separate_critics():
+    torch.manual_seed(0)
+    ensemble = CriticEnsemble(config.STATE_DIM, config.ACTION_DIM, config.HIDDEN_SIZES)
+    torch.manual_seed(0)
+    separate = [Critic(config.STATE_DIM, config.ACTION_DIM, config.HIDDEN_SIZES) for _ in range(2)]
+    state = torch.randn(32, config.STATE_DIM)
+    q = ensemble(state)
+    assert q.shape == (2, 32, config.ACTION_DIM)
+    for i, critic in enumerate(separate):
+        # same RNG draws as building the Critics one after another
+        torch.testing.assert_close(ensemble.member_state_dict(i), critic.state_dict())
+        torch.testing.assert_close(q[i], critic(state), rtol=1e-5, atol=1e-5)
+
+
+def test_params_keep_per_critic_checkpoint_format():
+    agent = SACAgent()
+    legacy = {"actor": agent.actor.state_dict(),
+              "critic1": Critic(config.STATE_DIM, config.ACTION_DIM, config.HIDDEN_SIZES).state_dict(),
+              "critic2": Critic(config.STATE_DIM, config.ACTION_DIM, config.HIDDEN_SIZES).state_dict()}
+    agent.load_params(legacy)
+    params = agent.get_params()
+    assert params["critic1"].keys() == legacy["critic1"].keys()
+    torch.testing.assert_close(params["critic1"], legacy["critic1"])
+    torch.testing.assert_close(params["critic2"], legacy["critic2"])
+    torch.testing.assert_close(agent.target_critics.member_state_dict(1), legacy["critic2"])
+
+    # Reptile interpolation still works key-by-key on the plain dicts
+    moved = _interpolate_params(params, SACAgent().get_params(), 0.5)
+    SACAgent().load_params(moved)
@@ -0,0 +1,45 @@
+"""Tests for resaco/distill.py's decision-tree distillation and the
+bridge's distilled "<NAME>_TREE" serving tier."""
+
+import numpy as np
+import torch
+
+import bridge.inference_server as srv
+from resaco import config
+from resaco.baselines.a2c import A2CAgent
+from resaco.distill import TreePolicy, collect_states, fit_tree
+
+
+def test_tree_fits_a_known_rule_exactly():
+    rng = np.random.default_rng(0)
+    states = rng.random((500, config.STATE_DIM)) * 100
+    labels = np.where(states[:, 3] <= 40, 0, np.where(states[:, 7] <= 70, 1, 2))
+    tree = fit_tree(states, labels, max_depth=4, min_samples_leaf=1)
+    assert (tree.select_actions(states) == labels).all()
+    assert tree.depth <= 4
+    assert [tree.select_action(s) for s in states[:50]] == labels[:50].tolist()
+
+
+def test_distilled_tree_agrees_with_teacher_and_round_trips(tmp_path):
+    torch.manual_seed(0)
+    teacher = A2CAgent()
+    states = collect_states(teacher, 2000, num_scenarios=2, seed=0)
+    tree = fit_tree(states, teacher.select_actions(states, greedy=True), max_depth=8)
+    holdout = collect_states(teacher, 500, num_scenarios=2, seed=100)
+    assert np.mean(tree.select_actions(holdout) == teacher.select_actions(holdout, greedy=True)) >= 0.8
+
+    tree.save(str(tmp_path / "a2c_tree.npz"))
+    loaded = TreePolicy.load(str(tmp_path / "a2c_tree.npz"))
+    np.testing.assert_array_equal(loaded.select_actions(holdout), tree.select_actions(holdout))
+
+
+def test_bridge_serves_distilled_trees_under_their_own_names(tmp_path):
+    rng = np.random.default_rng(0)
+    states = rng.random((100, config.STATE_DIM))
+    fit_tree(states, (states[:, 0] > 0.5).astype(int), max_depth=2).save(str(tmp_path / "a3c_tree.npz"))
+
+    srv.load_agents(str(tmp_path))
+    assert srv._runtimes["A3C_TREE"] == "tree" and "A2C_TREE" not in srv._agents
+    line = "ACT A3C_TREE r1 " + " ".join(["0.9"] * config.STATE_DIM)
+    assert srv.Handler._dispatch(None, line) == "1"
+    assert srv.Handler._dispatch(None, "OUTCOME A3C_TREE r1 -1.0 0 " + " ".join(["1"] * config.STATE_DIM)) == "OK"
@@ -1,3 +1,5 @@
+import numpy as np
+
 from resaco import config
 from resaco.env import MECOffloadEnv, _SATURATION_CEILING
 from resaco.scenario import AppProfile, Scenario
@@ -80,3 +82,84 @@ def test_zero_background_devices_is_a_no_op():
         env.step(0)  # device tier never touches mu_edge/mu_cloud
     assert sum(env.mu_edge) == 0.0
     assert env.mu_cloud == 0.0
+
+
+def test_pending_releases_account_for_all_outstanding_utilization():
+    # Every unit of utilization still held must be backed by exactly one
+    # not-yet-expired release entry -- nothing dropped, nothing released early.
+    env = MECOffloadEnv(_make_scenario(number_of_mobile_devices=300, poisson_interarrival=2.0), seed=7)
+    env.reset()
+    for step in range(200):
+        env.step(step % config.ACTION_DIM)
+        env._release_expired()
+        assert all(entry[0] > env.clock for entry in env._pending_release)
+    outstanding_edge = [0.0] * env.n_edge
+    outstanding_cloud = 0.0
+    for _, _, slot, delta in env._pending_release:
+        if 1 <= slot <= env.n_edge:
+            outstanding_edge[slot - 1] += delta
+        elif slot == env.n_edge + 1:
+            outstanding_cloud += delta
+    for held, owed in zip(env.mu_edge, outstanding_edge):
+        assert abs(held - owed) < 1e-6
+    assert abs(env.mu_cloud - outstanding_cloud) < 1e-6
+
+
+def test_default_copy_mode_returns_independent_states():
+    env = MECOffloadEnv(_make_scenario(), seed=8)
+    first = env.reset()
+    snapshot = first.copy()
+    for _ in range(3):
+        env.step(0)
+    np.testing.assert_array_equal(first, snapshot)
+
+
+def test_copy_false_reuses_two_alternating_state_buffers():
+    env = MECOffloadEnv(_make_scenario(), seed=9, copy=False)
+    state = env.reset()
+    state_snapshot = state.copy()
+    next_state, _, _, _ = env.step(0)
+    # the previous state is still intact one step later...
+    np.testing.assert_array_equal(state, state_snapshot)
+    assert not np.shares_memory(state, next_state)
+    # ...and its buffer is only reused by the step after that
+    third, _, _, _ = env.step(0)
+    assert np.shares_memory(state, third)
+
+
+def test_state_reflects_utilization_slots():
+    env = MECOffloadEnv(_make_scenario(vm_utilization_on_edge=12.5), seed=10)
+    env.reset()
+    state, _, _, info = env.step(3)  # edge server 3 -> utilization slot 3
+    assert not info["failed"]
+    assert env.mu_edge[2] == 12.5
+    assert state[3 + 3] == 12.5
+
+
+def test_step_all_actions_matches_step_for_every_action():
+    env = MECOffloadEnv(_make_scenario(number_of_mobile_devices=800, poisson_interarrival=2.0), seed=11)
+    env.reset()
+    for _ in range(30):
+        env.step(1)
+    rewards, failed = env.step_all_actions()
+    assert rewards.shape == failed.shape == (config.ACTION_DIM,)
+    snap = env.snapshot()
+    for action in range(config.ACTION_DIM):
+        env.restore(snap)
+        _, reward, _, info = env.step(action)
+        assert reward == rewards[action]
+        assert info["failed"] == failed[action]
+
+
+def test_restore_replays_identical_trajectory():
+    env = MECOffloadEnv(_make_scenario(number_of_mobile_devices=300, poisson_interarrival=2.0), seed=12)
+    env.reset()
+    for step in range(25):
+        env.step(step % config.ACTION_DIM)
+    snap = env.snapshot()
+    first = [env.step(step % config.ACTION_DIM) for step in range(40)]
+    env.restore(snap)
+    second = [env.step(step % config.ACTION_DIM) for step in range(40)]
+    for (s1, r1, _, _), (s2, r2, _, _) in zip(first, second):
+        assert r1 == r2
+        np.testing.assert_array_equal(s1, s2)
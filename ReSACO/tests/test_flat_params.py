@@ -0,0 +1,71 @@
+"""Tests for resaco/flat_params.py and the agents' flat_params=True mode:
+same training math, and flat and nested checkpoints load either way."""
+
+import numpy as np
+import torch
+
+from resaco import config
+from resaco.baselines.a2c import A2CAgent
+from resaco.baselines.ddpg import DDPGAgent
+from resaco.flat_params import FLAT_FORMAT, parameter_vector
+from resaco.replay_buffer import ReplayBuffer
+from resaco.reptile import _interpolate_params
+from resaco.sac import SACAgent
+
+
+def _filled_agent(seed, **kwargs):
+    torch.manual_seed(seed)
+    agent = SACAgent(**kwargs)
+    agent.replay_buffer = ReplayBuffer(1000, seed=seed)
+    rng = np.random.default_rng(seed)
+    for _ in range(200):
+        agent.replay_buffer.push(rng.random(config.STATE_DIM) * 100, int(rng.integers(config.ACTION_DIM)),
+                                 -rng.random(), rng.random(config.STATE_DIM) * 100, 0.0)
+    return agent
+
+
+def test_flat_parameters_are_views_of_one_buffer():
+    agent = SACAgent(flat_params=True)
+    flat = agent._flat["critics"]
+    assert sum(p.numel() for p in agent.critics.parameters()) == flat.numel()
+    flat.zero_()
+    assert all(not p.detach().any() for p in agent.critics.parameters())
+    assert agent.get_params()["format"] == FLAT_FORMAT
+
+
+def test_flat_training_matches_nested_training():
+    nested, flat = _filled_agent(5), _filled_agent(5, flat_params=True)
+    for _ in range(5):
+        nested.update()
+        flat.update()
+    assert torch.equal(parameter_vector(nested.actor), flat.get_params()["actor"])
+    assert torch.equal(parameter_vector(nested.target_critics), parameter_vector(flat.target_critics))
+
+
+def test_checkpoints_cross_load_and_interpolate_alike():
+    source, other = SACAgent(), SACAgent()
+    flat_agent = SACAgent(flat_params=True)
+    flat_agent.load_params(source.get_params())  # nested -> flat
+    assert torch.equal(flat_agent.get_params()["critics"], parameter_vector(source.critics))
+
+    nested_agent = SACAgent()
+    nested_agent.load_params(flat_agent.get_params())  # flat -> nested
+    assert torch.equal(parameter_vector(nested_agent.target_critics), parameter_vector(source.critics))
+
+    flat_other = SACAgent(flat_params=True)
+    flat_other.load_params(other.get_params())
+    nested_mix = _interpolate_params(source.get_params(), other.get_params(), 0.3)
+    flat_mix = _interpolate_params(flat_agent.get_params(), flat_other.get_params(), 0.3)
+    assert flat_mix["format"] == FLAT_FORMAT
+    nested_agent.load_params(nested_mix)
+    torch.testing.assert_close(flat_mix["actor"], parameter_vector(nested_agent.actor))
+
+
+def test_baselines_round_trip_flat_checkpoints():
+    for cls in (DDPGAgent, A2CAgent):
+        source, flat = cls(), cls(flat_params=True)
+        flat.load_params(source.get_params())
+        restored = cls()
+        restored.load_params(flat.get_params())
+        assert torch.equal(parameter_vector(restored.critic), parameter_vector(source.critic))
+        assert torch.equal(parameter_vector(restored.actor), parameter_vector(source.actor))
@@ -0,0 +1,82 @@
+"""Tests for MmapReplayBuffer in resaco/replay_buffer.py and the bridge's
+"<checkpoint>_replay.bin" files: experience survives reopening."""
+
+import numpy as np
+
+import bridge.inference_server as srv
+from resaco import config
+from resaco.replay_buffer import MmapReplayBuffer, PrioritizedMmapReplayBuffer
+
+
+def _push(buf, start, n, dim=3):
+    for i in range(start, start + n):
+        buf.push(state=np.full(dim, i), action=i % 5, reward=-float(i), next_state=np.full(dim, i + 1),
+                 done=float(i % 2))
+
+
+def test_reopen_restores_transitions_and_cursor(tmp_path):
+    path = str(tmp_path / "replay.bin")
+    buf = MmapReplayBuffer(path, capacity=10, state_dim=3)
+    _push(buf, 0, 13)  # wraps: slots hold 3..12
+    del buf
+
+    reopened = MmapReplayBuffer(path, capacity=10, state_dim=3, seed=0)
+    assert len(reopened) == 10
+    state, action, reward, next_state, done = reopened.sample(32)
+    i = state[:, 0].astype(int)
+    assert set(i.tolist()) <= set(range(3, 13))
+    np.testing.assert_array_equal(next_state[:, 0], i + 1)
+    np.testing.assert_array_equal(action, i % 5)
+    np.testing.assert_array_equal(reward, -i)
+    np.testing.assert_array_equal(done, i % 2)
+
+    _push(reopened, 13, 1)  # continues at the saved cursor, overwriting 3
+    assert 3 not in set(reopened.state[:, 0].astype(int).tolist())
+
+
+def test_reopen_drops_a_torn_write_into_a_full_buffer(tmp_path):
+    path = str(tmp_path / "replay.bin")
+    buf = MmapReplayBuffer(path, capacity=10, state_dim=3)
+    _push(buf, 0, 13)
+    # a crash part-way through the next push: slot marked pending, half written
+    buf._header[8] = buf._cursor
+    buf.state[buf._cursor] = -99.0
+    del buf
+
+    reopened = MmapReplayBuffer(path, capacity=10, state_dim=3)
+    assert len(reopened) == 9
+    assert sorted(reopened.state[:9, 0].astype(int).tolist()) == [4, 5, 6, 7, 8, 9, 10, 11, 12]
+    _push(reopened, 13, 1)
+    assert len(reopened) == 10 and len(MmapReplayBuffer(path, capacity=10, state_dim=3)) == 10
+
+
+def test_mismatched_file_is_recreated_empty(tmp_path):
+    path = str(tmp_path / "replay.bin")
+    _push(MmapReplayBuffer(path, capacity=10, state_dim=3), 0, 5)
+    assert len(MmapReplayBuffer(path, capacity=10, state_dim=4)) == 0
+    (tmp_path / "garbage.bin").write_bytes(b"not a replay buffer")
+    assert len(MmapReplayBuffer(str(tmp_path / "garbage.bin"), capacity=10, state_dim=3)) == 0
+
+
+def test_prioritized_reopen_samples_restored_transitions(tmp_path):
+    path = str(tmp_path / "replay.bin")
+    _push(PrioritizedMmapReplayBuffer(path, capacity=16, state_dim=3), 0, 6)
+    reopened = PrioritizedMmapReplayBuffer(path, capacity=16, state_dim=3, seed=0)
+    *_, weights, idx = reopened.sample(6)
+    assert set(idx.tolist()) <= set(range(6))
+    np.testing.assert_allclose(weights, 1.0)
+
+
+def test_bridge_replay_buffers_survive_restart(tmp_path):
+    srv.load_agents(str(tmp_path), persistent_replay=True)
+    agent = srv._agents["RESACO"]
+    state = [0.5] * config.STATE_DIM
+    for i in range(5):
+        agent.select_action(state, request_id=i)
+        agent.report_outcome(i, -1.0, state, False)
+    assert (tmp_path / "theta_star_replay.bin").exists()
+    assert not (tmp_path / "a2c_replay.bin").exists()
+
+    srv.load_agents(str(tmp_path), persistent_replay=True)  # "restart"
+    assert len(srv._agents["RESACO"].agent.replay_buffer) == 5
+    assert len(srv._agents["SAC_BASELINE"].agent.replay_buffer) == 0
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from resaco import config
+from resaco.multi_agent_env import MultiAgentMECOffloadEnv
+from resaco.sac import SACAgent
+from resaco.scenario import AppProfile, Scenario
+
+
+def _make_scenario(number_of_mobile_devices=1, poisson_interarrival=10.0,
+                    vm_utilization_on_mobile=5.0, vm_utilization_on_edge=10.0,
+                    vm_utilization_on_cloud=1.0, task_length=3000.0):
+    profile = AppProfile(
+        name="TEST_APP", usage_percentage=100.0,
+        poisson_interarrival=poisson_interarrival,
+        delay_sensitivity=0.5, active_period=30.0, idle_period=30.0,
+        data_upload=200.0, data_download=200.0, task_length=task_length,
+        required_core=1,
+        vm_utilization_on_edge=vm_utilization_on_edge,
+        vm_utilization_on_cloud=vm_utilization_on_cloud,
+        vm_utilization_on_mobile=vm_utilization_on_mobile,
+    )
+    return Scenario(app_profile=profile, number_of_mobile_devices=number_of_mobile_devices)
+
+
+def test_reset_and_step_return_one_float32_state_per_agent():
+    env = MultiAgentMECOffloadEnv(_make_scenario(), num_agents=6, seed=1)
+    states = env.reset()
+    assert states.shape == (6, config.STATE_DIM)
+    assert states.dtype == np.float32
+    states, rewards, dones, info = env.step(np.zeros(6, dtype=int))
+    assert states.shape == (6, config.STATE_DIM)
+    assert rewards.shape == dones.shape == info["failed"].shape == (6,)
+
+
+def test_step_rejects_wrong_action_shape():
+    env = MultiAgentMECOffloadEnv(_make_scenario(), num_agents=4, seed=2)
+    env.reset()
+    with pytest.raises(ValueError):
+        env.step(np.zeros(3, dtype=int))
+
+
+def test_non_default_edge_count_sizes_states_and_keeps_pending_releases():
+    env = MultiAgentMECOffloadEnv(_make_scenario(number_of_mobile_devices=50, task_length=1e6),
+                                  num_agents=3, num_edge_servers=4, seed=9)
+    assert env.reset().shape == (3, 4 + 4 + 1 + 3)
+    for _ in range(10):
+        states, _, _, info = env.step(np.array([5, 1, 4]))
+    assert states.shape == (3, 12)
+    assert env._n_pending > 0 and env._n_pending <= len(env._rel_time)
+    with pytest.raises(ValueError):
+        env.step(np.array([0, 0, 6]))
+
+
+def test_agents_picking_one_edge_server_share_its_capacity():
+    # 10% per task: exactly ten of the sixteen fit on one empty server.
+    env = MultiAgentMECOffloadEnv(_make_scenario(), num_agents=16, seed=3)
+    env.reset()
+    states, _, _, info = env.step(np.ones(16, dtype=int))
+    assert int((~info["vm_fail"]).sum()) == 10
+    assert env.mu_edge[0] == 100.0
+    # every agent observes the same shared pool
+    assert np.all(states[:, 4] == 100.0)
+
+
+def test_mobile_vms_are_per_agent():
+    env = MultiAgentMECOffloadEnv(_make_scenario(), num_agents=16, seed=4)
+    env.reset()
+    _, _, _, info = env.step(np.zeros(16, dtype=int))
+    assert not info["vm_fail"].any()
+    np.testing.assert_array_equal(env.mu_mobile, np.full(16, 5.0))
+
+
+def test_contended_target_admits_exactly_as_many_tasks_as_fit():
+    env = MultiAgentMECOffloadEnv(_make_scenario(), num_agents=40, seed=5)
+    env.reset()
+    rng = np.random.default_rng(0)
+    for _ in range(10):
+        actions = rng.integers(0, 3, size=40)  # crowd onto device / edge 1 / edge 2
+        env._release_expired()  # what step() does first
+        before = env.utilization.copy()
+        _, _, _, info = env.step(actions)
+        admitted = ~info["failed"]
+        for target in (1, 2):
+            on_target = actions == target
+            n_fit = int(np.floor((100.0 - before[40 + target - 1]) / 10.0 + 1e-9))
+            contenders = on_target & ~info["network_fail"]
+            assert int((admitted & on_target).sum()) == min(int(contenders.sum()), n_fit)
+
+
+def test_step_all_actions_matches_step_when_targets_do_not_collide():
+    env = MultiAgentMECOffloadEnv(_make_scenario(number_of_mobile_devices=300), num_agents=config.ACTION_DIM,
+                                  seed=6)
+    env.reset()
+    for _ in range(20):
+        rewards_all, failed_all = env.step_all_actions()
+        actions = np.arange(config.ACTION_DIM)  # one agent per target
+        _, rewards, _, info = env.step(actions)
+        np.testing.assert_array_equal(rewards, rewards_all[actions, actions])
+        np.testing.assert_array_equal(info["failed"], failed_all[actions, actions])
+
+
+def test_sac_agent_trains_against_shared_pools():
+    env = MultiAgentMECOffloadEnv(_make_scenario(number_of_mobile_devices=500), num_agents=8, seed=7)
+    agent = SACAgent()
+    stats = agent.shared_update_loop(env, num_transitions=32)
+    assert len(stats) == 32
+    assert len(agent.replay_buffer) >= config.BATCH_SIZE + 32
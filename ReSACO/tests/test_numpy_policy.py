@@ -0,0 +1,71 @@
+"""Tests for resaco/numpy_policy.py: exported actors match the torch
+Actor, the runtime needs no torch, and the bridge serves fresh exports."""
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+import torch
+
+import bridge.inference_server as srv
+from resaco import config
+from resaco.baselines.a2c import A2CAgent
+from resaco.normalize import _SCALE, normalize_state
+from resaco.numpy_policy import NumpyPolicy, export_actor
+from resaco.sac import SACAgent
+
+
+def _states(n, seed=0):
+    return np.random.default_rng(seed).random((n, config.STATE_DIM)) * 1.2 * _SCALE
+
+
+def test_exported_actor_matches_torch_actor(tmp_path):
+    agent = SACAgent()
+    export_actor(agent.actor, str(tmp_path / "actor.npz"))
+    policy = NumpyPolicy.load(str(tmp_path / "actor.npz"), seed=0)
+    states = _states(64)
+    with torch.no_grad():
+        expected = agent.actor.logits(torch.as_tensor(normalize_state(states))).numpy()
+    np.testing.assert_allclose(policy.logits(states), expected, rtol=1e-4, atol=1e-4)
+    assert (policy.select_actions(states) == agent.select_actions(states, greedy=True)).all()
+    assert policy.select_action(states[0]) == agent.select_action(states[0], greedy=True)
+
+    probs = torch.softmax(torch.as_tensor(expected[0]), dim=-1).numpy()
+    sampled = policy.select_actions(np.repeat(states[:1], 20000, axis=0), greedy=False)
+    np.testing.assert_allclose(np.bincount(sampled, minlength=config.ACTION_DIM) / 20000, probs, atol=0.02)
+
+
+def test_runtime_imports_without_torch():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "import sys, resaco.numpy_policy; assert 'torch' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+
+def test_bridge_serves_fresh_exports_only(tmp_path):
+    a2c = A2CAgent()
+    torch.save(a2c.get_params(), tmp_path / "a2c.pt")
+    torch.save(A2CAgent().get_params(), tmp_path / "a3c.pt")
+    export_actor(a2c.actor, str(tmp_path / "a2c.npz"))
+    export_actor(A2CAgent().actor, str(tmp_path / "a3c.npz"))
+    os.utime(tmp_path / "a3c.npz", (0, 0))  # older than its checkpoint: stale
+
+    srv.load_agents(str(tmp_path))
+    assert srv._runtimes["A2C_BASELINE"] == "numpy"
+    assert srv._runtimes["A3C_BASELINE"] == srv._runtimes["RESACO"] == "torch"
+    state = _states(1)[0]
+    assert srv._agents["A2C_BASELINE"].select_action(state, request_id=1) == a2c.select_action(state, greedy=True)
+
+
+def test_bridge_serving_only_exports_starts_without_torch(tmp_path):
+    a2c = A2CAgent()
+    torch.save(a2c.get_params(), tmp_path / "a2c.pt")
+    export_actor(a2c.actor, str(tmp_path / "a2c.npz"))
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = ("import sys; import bridge.inference_server as srv; "
+            f"srv.load_agents({str(tmp_path)!r}, algos=['A2C_BASELINE']); "
+            "assert srv._runtimes == {'A2C_BASELINE': 'numpy'}, srv._runtimes; "
+            f"print(srv.Handler._dispatch(None, 'ACT A2C_BASELINE r1 ' + ' '.join(['1'] * {config.STATE_DIM}))); "
+            "assert 'torch' not in sys.modules")
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, check=True, capture_output=True, text=True)
+    assert int(out.stdout) == a2c.select_action(np.ones(config.STATE_DIM), greedy=True)
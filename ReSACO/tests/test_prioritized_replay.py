@@ -0,0 +1,81 @@
+"""Tests for the sum tree and PrioritizedReplayBuffer in
+resaco/replay_buffer.py, and their wiring into SAC/DDPG updates and
+DeploymentAgent(prioritized_replay=True)."""
+
+import numpy as np
+
+import bridge.inference_server as srv
+from resaco import config
+from resaco.baselines.ddpg import DDPGAgent
+from resaco.deploy import DeploymentAgent
+from resaco.replay_buffer import PrioritizedReplayBuffer, SumTree
+from resaco.sac import SACAgent
+
+
+def test_sum_tree_find_matches_cumulative_sum():
+    rng = np.random.default_rng(0)
+    values = rng.random(37)
+    tree = SumTree(37)
+    tree.update(np.arange(37), values)
+    assert np.isclose(tree.total, values.sum())
+    targets = rng.random(500) * values.sum()
+    expected = np.searchsorted(np.cumsum(values), targets, side="right")
+    np.testing.assert_array_equal(tree.find(targets), expected)
+
+    tree.update([3, 3, 20], [0.0, 5.0, 0.0])  # repeated index: last write wins
+    values[3], values[20] = 5.0, 0.0
+    assert np.isclose(tree.total, values.sum())
+
+
+def _filled(capacity=100, n=50, seed=0):
+    buf = PrioritizedReplayBuffer(capacity, seed=seed)
+    for i in range(n):
+        buf.push(state=[i, i], action=i, reward=0.0, next_state=[i + 1, i + 1], done=0.0)
+    return buf
+
+
+def test_sampling_follows_priorities():
+    buf = _filled()
+    buf.update_priorities(np.arange(50), np.where(np.arange(50) == 7, 100.0, 0.01))
+    counts = np.zeros(50)
+    for _ in range(200):
+        _, action, _, _, _, weights, idx = buf.sample(16)
+        np.testing.assert_array_equal(action, idx)  # indices point at the sampled rows
+        assert weights.max() == 1.0 and np.all(weights > 0)
+        counts += np.bincount(idx, minlength=50)
+    p = buf.tree.leaves(np.arange(50)) / buf.tree.total
+    assert abs(counts[7] / counts.sum() - p[7]) < 0.05
+    assert counts[7] > 10 * counts[np.arange(50) != 7].max()
+
+
+def test_new_transitions_enter_at_max_priority():
+    buf = _filled(n=10)
+    buf.update_priorities([0, 1], [3.0, 0.5])
+    buf.push(state=[0, 0], action=0, reward=0.0, next_state=[0, 0], done=0.0)
+    assert np.isclose(buf.tree.leaves([10])[0], buf.tree.leaves([0])[0])
+
+
+def test_sac_and_ddpg_updates_refresh_priorities():
+    for agent in (SACAgent(), DDPGAgent()):
+        agent.replay_buffer = PrioritizedReplayBuffer(1000, seed=0)
+        rng = np.random.default_rng(0)
+        for _ in range(config.BATCH_SIZE * 2):
+            agent.replay_buffer.push(rng.random(config.STATE_DIM) * 100, int(rng.integers(config.ACTION_DIM)),
+                                     -rng.random(), rng.random(config.STATE_DIM) * 100, 0.0)
+        before = agent.replay_buffer.tree.leaves(np.arange(config.BATCH_SIZE * 2)).copy()
+        assert agent.update() is not None
+        assert not np.array_equal(agent.replay_buffer.tree.leaves(np.arange(config.BATCH_SIZE * 2)), before)
+
+
+def test_deployment_and_bridge_opt_in(tmp_path):
+    agent = DeploymentAgent(SACAgent(), prioritized_replay=True)
+    assert isinstance(agent.agent.replay_buffer, PrioritizedReplayBuffer)
+    state = [0.5] * config.STATE_DIM
+    for i in range(config.BATCH_SIZE + 2):
+        agent.select_action(state, request_id=i)
+        result = agent.report_outcome(i, -1.0, state, False)
+    assert result["update"] is not None
+
+    srv.load_agents(str(tmp_path), prioritized_replay=True)
+    assert isinstance(srv._agents["DDPG_BASELINE"].agent.replay_buffer, PrioritizedReplayBuffer)
+    assert not hasattr(srv._agents["A2C_BASELINE"].agent, "replay_buffer")
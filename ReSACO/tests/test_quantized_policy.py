@@ -0,0 +1,55 @@
+"""Tests for resaco/quantized_policy.py's gated int8 actors and the
+deployment wrappers' quantize=True mode."""
+
+import pytest
+import torch
+
+from resaco import config
+from resaco.baselines.a2c import A2CAgent
+from resaco.baselines.ddpg import DDPGAgent
+from resaco.deploy import DeploymentAgent, FrozenPolicyAgent
+from resaco.quantized_policy import QuantizationGateError, QuantizedPolicy, record_gate_states
+from resaco.sac import SACAgent
+
+
+@pytest.fixture(scope="module")
+def gate_states():
+    return record_gate_states(num_states=300, num_scenarios=3)
+
+
+def test_gate_accepts_close_int8_actor_and_refuses_below_threshold(gate_states):
+    assert gate_states.shape == (300, config.STATE_DIM)
+    actor = SACAgent().actor
+    policy = QuantizedPolicy.gated(actor, gate_states, min_agreement=0.9)
+    assert 0.9 <= policy.agreement <= 1.0
+    actions = policy.select_actions(gate_states[:16], greedy=True)
+    assert actions.shape == (16,) and policy.select_action(gate_states[0], greedy=True) == actions[0]
+    with pytest.raises(QuantizationGateError) as exc:
+        QuantizedPolicy.gated(actor, gate_states, min_agreement=1.01)
+    assert exc.value.agreement == policy.agreement
+
+
+def test_frozen_agent_serves_int8_only_past_the_gate(gate_states):
+    params = A2CAgent().get_params()
+    served = FrozenPolicyAgent(A2CAgent(), params, quantize=True, gate_states=gate_states, min_agreement=0.9)
+    assert served.quantized and served.quantization_agreement >= 0.9
+    assert 0 <= served.select_action(gate_states[0], request_id=1) < config.ACTION_DIM
+
+    refused = FrozenPolicyAgent(A2CAgent(), params, quantize=True, gate_states=gate_states, min_agreement=1.01)
+    assert not refused.quantized and refused.quantization_agreement == served.quantization_agreement
+    assert refused.select_action(gate_states[0], request_id=1) == refused.agent.select_action(gate_states[0],
+                                                                                               greedy=True)
+
+
+def test_deployment_agent_requantizes_as_it_adapts(gate_states):
+    for agent in (SACAgent(), DDPGAgent()):
+        deploy = DeploymentAgent(agent, quantize=True, gate_states=gate_states, min_agreement=0.0,
+                                 requantize_every=2)
+        assert deploy.quantized
+        first = deploy._policy
+        for i in range(6):
+            deploy.select_action(gate_states[i], request_id=i)
+            deploy.report_outcome(i, -1.0, gate_states[i + 1], min_buffer_before_update=2)
+        assert deploy._policy is not first  # rebuilt from the updated float actor
+        with torch.no_grad():
+            assert deploy._policy.actor.net[0].weight().dtype == torch.qint8
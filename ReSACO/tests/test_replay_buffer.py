@@ -37,3 +37,28 @@ def test_sample_caps_at_buffer_length():
         buf.push(state=[i], action=0, reward=0.0, next_state=[i], done=0.0)
     state, *_ = buf.sample(64)
     assert state.shape[0] == 3
+
+
+def test_wraparound_keeps_newest_transitions():
+    buf = ReplayBuffer(capacity=5)
+    for i in range(8):
+        buf.push(state=[i, i], action=i, reward=float(i), next_state=[i + 1, i + 1], done=0.0)
+    seen = set()
+    for _ in range(50):
+        _, action, _, _, _ = buf.sample(5)
+        seen.update(action.tolist())
+    assert seen == {3, 4, 5, 6, 7}
+
+
+def test_sampled_columns_stay_row_aligned_and_compact():
+    buf = ReplayBuffer(capacity=50, seed=0)
+    for i in range(30):
+        buf.push(state=np.full(3, i), action=i % 7, reward=-float(i), next_state=np.full(3, i + 1),
+                 done=float(i % 2))
+    state, action, reward, next_state, done = buf.sample(16)
+    assert state.dtype == next_state.dtype == np.float32
+    i = state[:, 0].astype(int)
+    np.testing.assert_array_equal(next_state[:, 0], i + 1)
+    np.testing.assert_array_equal(action, i % 7)
+    np.testing.assert_array_equal(reward, -i)
+    np.testing.assert_array_equal(done, i % 2)
@@ -8,6 +8,7 @@ many outer iterations ran.
 
 import torch
 
+from resaco import reptile
 from resaco.reptile import outer_loop
 from resaco.sac import SACAgent
 from resaco.scenario import sample_scenario_pool
@@ -39,3 +40,44 @@ def test_outer_loop_moves_theta_away_from_random_init():
         for k in theta_init["actor"]
     )
     assert actor_changed, "theta_star is identical to its random init -- Reptile Outer Loop did nothing"
+
+
+def test_meta_batch_is_identical_in_process_and_across_worker_processes():
+    # batched Reptile reseeds every Inner Loop from the parent's RNG, so
+    # running the meta-batch in a spawned worker must not change theta*
+    scenarios = sample_scenario_pool(3, seed=1)
+    results = []
+    for num_workers in (0, 1):
+        torch.manual_seed(7)
+        results.append(outer_loop(scenarios, num_outer_iterations=2, num_inner_updates=10, seed=3,
+                                  progress_every=0, meta_batch_size=2, num_workers=num_workers))
+    in_process, pooled = results
+    assert all(torch.equal(in_process[g][k], pooled[g][k]) for g in in_process for k in in_process[g])
+
+    torch.manual_seed(7)
+    theta_init = SACAgent().get_params()
+    assert any(not torch.equal(theta_init["actor"][k], in_process["actor"][k]) for k in theta_init["actor"])
+
+
+def test_in_process_meta_batch_leaves_global_torch_rng_alone():
+    agent = SACAgent()
+    scenario = sample_scenario_pool(1, seed=2)[0]
+    torch.manual_seed(11)
+    before = torch.get_rng_state()
+    reptile._seeded_inner_loop(agent, agent.get_params(), scenario, 5, 99, None)
+    assert torch.equal(torch.get_rng_state(), before)
+
+
+def test_unseeded_batched_evaluation_uses_unseeded_envs(monkeypatch):
+    seeds = []
+    real_env = reptile.MECOffloadEnv
+
+    def recording_env(scenario, seed=None, **kwargs):
+        seeds.append(seed)
+        return real_env(scenario, seed=seed, **kwargs)
+
+    monkeypatch.setattr(reptile, "MECOffloadEnv", recording_env)
+    scenario = sample_scenario_pool(1, seed=2)[0]
+    reptile._evaluate(SACAgent(), scenario, num_steps=2, num_envs=3)
+    reptile._evaluate(SACAgent(), scenario, num_steps=2, seed=5, num_envs=3)
+    assert seeds == [None, None, None, 5, 6, 7]
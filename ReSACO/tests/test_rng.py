@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from resaco.env import MECOffloadEnv
+from resaco.rng import BlockRandom
+from resaco.scenario import sample_scenario_pool
+
+
+def test_block_random_is_deterministic_per_seed():
+    a, b = BlockRandom(seed=7, block_size=16), BlockRandom(seed=7, block_size=16)
+    draws_a = [(a.random(), a.expovariate(2.0), a.gauss(1.0, 3.0)) for _ in range(100)]
+    draws_b = [(b.random(), b.expovariate(2.0), b.gauss(1.0, 3.0)) for _ in range(100)]
+    assert draws_a == draws_b
+
+
+def test_block_random_setstate_resumes_mid_block_and_across_refills():
+    rng = BlockRandom(seed=3, block_size=16)
+    for _ in range(21):  # past one refill, mid-way into the second block
+        rng.random()
+        rng.expovariate(1.0)
+    state = rng.getstate()
+    expected = [(rng.random(), rng.expovariate(1.0), rng.gauss()) for _ in range(40)]
+    rng.setstate(state)
+    assert [(rng.random(), rng.expovariate(1.0), rng.gauss()) for _ in range(40)] == expected
+
+
+def test_block_random_exponential_mean_matches_rate():
+    rng = BlockRandom(seed=1)
+    mean = sum(rng.expovariate(0.25) for _ in range(20000)) / 20000
+    assert abs(mean - 4.0) < 0.2
+
+
+def test_env_python_backend_stays_seed_compatible_with_random_random():
+    scenario = sample_scenario_pool(1, seed=2)[0]
+    env = MECOffloadEnv(scenario, seed=11)
+    reference = random.Random(11)
+    assert env.rng.getstate() == reference.getstate()
+
+
+def test_env_block_backend_is_reproducible():
+    scenario = sample_scenario_pool(1, seed=2)[0]
+    rewards = []
+    for _ in range(2):
+        env = MECOffloadEnv(scenario, seed=5, rng_backend="block")
+        env.reset()
+        rewards.append([env.step(step % 12)[1] for step in range(200)])
+    assert rewards[0] == rewards[1]
+
+
+def test_env_rejects_unknown_rng_backend():
+    with pytest.raises(ValueError):
+        MECOffloadEnv(sample_scenario_pool(1, seed=2)[0], rng_backend="nope")
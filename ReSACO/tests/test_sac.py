@@ -14,6 +14,7 @@ import torch
 
 from resaco import config
 from resaco.env import MECOffloadEnv
+from resaco.replay_buffer import ReplayBuffer
 from resaco.sac import SACAgent
 from resaco.scenario import AppProfile, Scenario
 
@@ -74,3 +75,34 @@ def test_select_action_within_action_space():
         assert 0 <= action < config.ACTION_DIM
     greedy_action = agent.select_action(state, greedy=True)
     assert 0 <= greedy_action < config.ACTION_DIM
+
+
+def _seeded_agent(seed):
+    torch.manual_seed(seed)
+    agent = SACAgent()
+    agent.replay_buffer = ReplayBuffer(1000, seed=seed)
+    env = MECOffloadEnv(_make_scenario(), seed=seed)
+    state = env.reset()
+    for i in range(200):
+        next_state, reward, done, _ = env.step(i % config.ACTION_DIM)
+        agent.replay_buffer.push(state, i % config.ACTION_DIM, reward, next_state, float(done))
+        state = next_state
+    return agent
+
+
+def test_update_many_matches_repeated_update():
+    one_by_one, batched = _seeded_agent(3), _seeded_agent(3)
+    for _ in range(5):
+        one_by_one.update()
+    stats = batched.update_many(5)
+    assert len(stats) == 5
+    a, b = one_by_one.get_params(), batched.get_params()
+    assert all(torch.equal(a[group][k], b[group][k]) for group in a for k in a[group])
+
+
+def test_sac_update_loop_updates_per_step():
+    env = MECOffloadEnv(_make_scenario(), seed=4)
+    agent = SACAgent()
+    stats = agent.sac_update_loop(env, num_transitions=10, updates_per_step=4)
+    assert len(stats) == 40
+    assert len(agent.replay_buffer) == config.BATCH_SIZE + 10
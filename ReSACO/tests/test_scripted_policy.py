@@ -0,0 +1,46 @@
+"""Tests for resaco/scripted_policy.py's TorchScript actor export and the
+bridge's numpy -> torchscript -> torch runtime preference."""
+
+import numpy as np
+import torch
+
+import bridge.inference_server as srv
+from resaco import config
+from resaco.baselines.a2c import A2CAgent
+from resaco.normalize import _SCALE, normalize_state
+from resaco.numpy_policy import export_actor
+from resaco.scripted_policy import ScriptedPolicy, export_scripted_actor
+
+
+def _states(n, seed=0):
+    return np.random.default_rng(seed).random((n, config.STATE_DIM)) * 1.2 * _SCALE
+
+
+def test_scripted_actor_matches_torch_actor(tmp_path):
+    agent = A2CAgent()
+    export_scripted_actor(agent.actor, str(tmp_path / "actor_scripted.pt"))
+    policy = ScriptedPolicy.load(str(tmp_path / "actor_scripted.pt"))
+    states = _states(32)
+    with torch.no_grad():
+        expected = agent.actor.logits(torch.as_tensor(normalize_state(states)))
+    torch.testing.assert_close(policy.logits(states), expected, rtol=1e-5, atol=1e-5)
+    assert (policy.select_actions(states) == agent.select_actions(states, greedy=True)).all()
+    assert policy.select_action(states[0]) == agent.select_action(states[0], greedy=True)
+    sampled = policy.select_actions(states, greedy=False)
+    assert sampled.shape == (32,) and ((sampled >= 0) & (sampled < config.ACTION_DIM)).all()
+
+
+def test_bridge_prefers_numpy_then_torchscript_then_torch(tmp_path):
+    for name in ("a2c", "a3c"):
+        agent = A2CAgent()
+        torch.save(agent.get_params(), tmp_path / f"{name}.pt")
+        export_scripted_actor(agent.actor, str(tmp_path / f"{name}_scripted.pt"))
+    export_actor(A2CAgent().actor, str(tmp_path / "a2c.npz"))
+
+    srv.load_agents(str(tmp_path))
+    assert srv._runtimes["A2C_BASELINE"] == "numpy"
+    assert srv._runtimes["A3C_BASELINE"] == "torchscript"
+    assert srv._runtimes["RESACO"] == "torch"  # adapting algos always serve their live networks
+
+    srv.load_agents(str(tmp_path), exported_policies=False)
+    assert srv._runtimes["A3C_BASELINE"] == "torch"
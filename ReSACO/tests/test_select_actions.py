@@ -0,0 +1,49 @@
+"""Tests for the agents' batched select_actions() and its users: the
+DeploymentAgent wrappers and the bridge's ACTN command."""
+
+import numpy as np
+import torch
+
+import bridge.inference_server as srv
+from resaco import config
+from resaco.baselines.a2c import A2CAgent
+from resaco.baselines.ddpg import DDPGAgent
+from resaco.deploy import DeploymentAgent
+from resaco.normalize import _SCALE
+from resaco.sac import SACAgent
+
+
+def _states(n, seed=0):
+    return np.random.default_rng(seed).random((n, config.STATE_DIM)) * 1.2 * _SCALE
+
+
+def test_select_actions_matches_select_action_per_state():
+    states = _states(16)
+    for cls in (SACAgent, DDPGAgent, A2CAgent):
+        agent = cls()
+        batched = agent.select_actions(states, greedy=True)
+        assert batched.shape == (16,) and batched.dtype == np.int64
+        assert batched.tolist() == [agent.select_action(s, greedy=True) for s in states]
+
+        torch.manual_seed(0)
+        sampled = agent.select_actions(states)
+        assert ((sampled >= 0) & (sampled < config.ACTION_DIM)).all()
+
+
+def test_deployment_agent_batch_decisions_take_outcomes():
+    deploy = DeploymentAgent(SACAgent())
+    states = _states(3)
+    actions = deploy.select_actions(states, request_ids=["a", "b", "c"])
+    assert len(actions) == 3 and all(isinstance(a, int) for a in actions)
+    assert deploy.report_outcome("b", -1.0, states[0])["recorded"]
+    assert deploy.report_outcome("b", -1.0, states[0]) is None
+
+
+def test_bridge_actn_returns_one_action_per_request(tmp_path):
+    srv.load_agents(str(tmp_path))
+    states = _states(2)
+    line = "ACTN RESACO 2 r1 r2 " + " ".join(str(v) for v in states.reshape(-1))
+    actions = srv.Handler._dispatch(None, line).split()
+    assert len(actions) == 2 and all(0 <= int(a) < config.ACTION_DIM for a in actions)
+    assert srv.Handler._dispatch(None, "OUTCOME RESACO r2 -1.0 0 " + " ".join(["1"] * config.STATE_DIM)) == "OK"
+    assert srv.Handler._dispatch(None, "ACTN RESACO 2 r3 1 2 3").startswith("ERROR")
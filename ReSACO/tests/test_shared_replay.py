@@ -0,0 +1,43 @@
+"""Tests for resaco/shared_replay.py: a replay buffer in shared memory,
+filled by collector processes and sampled by the learner."""
+
+import numpy as np
+
+from resaco import config
+from resaco.replay_buffer import PrioritizedReplayBuffer
+from resaco.sac import SACAgent
+from resaco.scenario import sample_scenario_pool
+from resaco.shared_replay import SharedReplayBuffer, train_with_collectors
+
+
+def test_attached_view_shares_storage_and_cursor():
+    owner = SharedReplayBuffer(capacity=5, state_dim=2, seed=0)
+    try:
+        other = SharedReplayBuffer.attach(owner.handle())
+        for i in range(4):
+            other.push(state=[i, i], action=i, reward=-float(i), next_state=[i + 1, i + 1], done=0.0)
+        for i in range(4, 7):
+            owner.push(state=[i, i], action=i, reward=-float(i), next_state=[i + 1, i + 1], done=0.0)
+        assert len(owner) == len(other) == 5
+        state, action, reward, next_state, done = owner.sample(64)
+        assert set(action.tolist()) <= {2, 3, 4, 5, 6}
+        np.testing.assert_array_equal(state[:, 0], action)
+        np.testing.assert_array_equal(next_state[:, 0], action + 1)
+        other.close()
+    finally:
+        owner.close()
+        owner.unlink()
+
+
+def test_train_with_collectors_runs_unchanged_agent_updates():
+    # one collector process keeps this test's spawn/torch-import cost down
+    agent = SACAgent()
+    agent.replay_buffer = PrioritizedReplayBuffer(agent.replay_buffer.capacity)
+    original = agent.replay_buffer
+    original.push(state=np.zeros(config.STATE_DIM), action=1, reward=-1.0,
+                  next_state=np.ones(config.STATE_DIM), done=0.0)
+    before = agent.get_params()["actor"]["net.0.weight"].clone()
+    stats = train_with_collectors(agent, sample_scenario_pool(1, seed=1), 300, batch_size=16)
+    assert stats
+    assert not agent.get_params()["actor"]["net.0.weight"].equal(before)
+    assert agent.replay_buffer is original and len(original) == 1  # restored, not replaced
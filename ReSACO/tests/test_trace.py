@@ -0,0 +1,97 @@
+"""Tests for resaco/trace.py: converting SimLogger SUCCESS/FAIL logs into a
+binary trace, and TraceMECOffloadEnv replaying it."""
+
+import numpy as np
+import pytest
+
+from resaco import config
+from resaco.scenario import AppProfile, Scenario
+from resaco.trace import TRACE_DTYPE, TraceMECOffloadEnv, convert_logs, load_trace
+
+
+def _make_scenario():
+    profile = AppProfile(
+        name="TEST_APP", usage_percentage=100.0, poisson_interarrival=8.0,
+        delay_sensitivity=0.5, active_period=30.0, idle_period=30.0,
+        data_upload=200.0, data_download=200.0, task_length=3000.0, required_core=1,
+        vm_utilization_on_edge=10.0, vm_utilization_on_cloud=1.0, vm_utilization_on_mobile=5.0,
+    )
+    return Scenario(app_profile=profile, number_of_mobile_devices=1)
+
+
+def _write_logs(tmp_path):
+    # taskId;deviceId;dc;host;vm;vmType;taskType;length;input;output;start;end;...
+    success = tmp_path / "SIMRESULT_SUCCESS.log"
+    success.write_text(
+        "#auto generated file!\n"
+        "3;0;1;0;0;1;2;3000;150;40;4.5;5.0;0.1;0.05;0.0;0.05;0.0\n"
+        "1;0;1;0;0;1;2;1000;100;20;1.0;1.5;0.1;0.05;0.0;0.05;0.0\n"
+        "4;7;1;0;0;1;0;9000;900;90;6.0;7.0;0.1;0.05;0.0;0.05;0.0\n"
+    )
+    fail = tmp_path / "SIMRESULT_FAIL.log"
+    fail.write_text(
+        "#auto generated file!\n"
+        "2;0;1;0;0;1;2;2000;120;30;2.5;2.5;1\n"
+    )
+    return [str(success), str(fail)]
+
+
+def test_convert_logs_merges_and_sorts_by_arrival(tmp_path):
+    out = tmp_path / "trace.npy"
+    assert convert_logs(_write_logs(tmp_path), str(out)) == 4
+
+    trace = load_trace(str(out))
+    assert trace.dtype == TRACE_DTYPE
+    assert isinstance(trace, np.memmap)
+    np.testing.assert_array_equal(trace["arrival"], [1.0, 2.5, 4.5, 6.0])
+    np.testing.assert_array_equal(trace["length"], [1000, 2000, 3000, 9000])
+    np.testing.assert_array_equal(trace["device_id"], [0, 0, 0, 7])
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["SIMRESULT_FAIL.log", "SIMRESULT_SUCCESS.log",
+                                                           "trace.npy"]  # scratch file removed
+
+
+def test_convert_logs_gathers_sorted_records_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr("resaco.trace._CHUNK_LINES", 3)
+    arrivals = np.random.default_rng(0).permutation(20) * 0.5
+    log = tmp_path / "SIMRESULT_SUCCESS.log"
+    log.write_text("".join(f"{i};{i};1;0;0;1;0;{1000 + i};10;10;{t};0\n" for i, t in enumerate(arrivals)))
+    out = tmp_path / "trace.npy"
+    assert convert_logs([str(log)], str(out)) == 20
+    trace = load_trace(str(out))
+    np.testing.assert_array_equal(trace["arrival"], np.sort(arrivals))
+    np.testing.assert_array_equal(trace["length"], 1000 + np.argsort(arrivals))
+
+
+def test_trace_env_replays_tasks_and_arrival_gaps(tmp_path):
+    out = tmp_path / "trace.npy"
+    convert_logs(_write_logs(tmp_path), str(out))
+    env = TraceMECOffloadEnv(str(out), _make_scenario(), seed=1, device_id=0)
+    env.reset()
+    env._cursor = -1  # pin replay to the start of the trace for the assertions below
+    env.current_task = env._sample_task()
+
+    lengths, clocks = [], []
+    for _ in range(2):
+        lengths.append(env.current_task.length)
+        env.step(0)
+        clocks.append(env.clock)
+    assert lengths == [1000.0, 2000.0]
+    assert clocks == [1.5, 3.5]  # gaps 2.5-1.0, 4.5-2.5
+    assert env.current_task.length == 3000.0
+
+
+def test_trace_env_state_carries_trace_task_fields(tmp_path):
+    out = tmp_path / "trace.npy"
+    convert_logs(_write_logs(tmp_path), str(out))
+    env = TraceMECOffloadEnv(str(out), _make_scenario(), seed=2)
+    state = env.reset()
+    assert state.shape == (config.STATE_DIM,)
+    trace = load_trace(str(out))
+    assert (state[0], state[1], state[2]) in set(zip(trace["length"], trace["upload"], trace["download"]))
+
+
+def test_trace_env_rejects_trace_too_short_to_replay(tmp_path):
+    out = tmp_path / "trace.npy"
+    convert_logs(_write_logs(tmp_path), str(out))
+    with pytest.raises(ValueError):
+        TraceMECOffloadEnv(str(out), _make_scenario(), device_id=7)
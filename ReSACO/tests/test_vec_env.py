@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from resaco import config
+from resaco.env import _SATURATION_CEILING
+from resaco.scenario import AppProfile, Scenario
+from resaco.vec_env import VecMECOffloadEnv
+
+
+def _make_scenario(number_of_mobile_devices=1, poisson_interarrival=10.0,
+                    vm_utilization_on_mobile=10.0, vm_utilization_on_edge=10.0,
+                    vm_utilization_on_cloud=1.0, task_length=3000.0):
+    profile = AppProfile(
+        name="TEST_APP", usage_percentage=100.0,
+        poisson_interarrival=poisson_interarrival,
+        delay_sensitivity=0.5, active_period=30.0, idle_period=30.0,
+        data_upload=200.0, data_download=200.0, task_length=task_length,
+        required_core=1,
+        vm_utilization_on_edge=vm_utilization_on_edge,
+        vm_utilization_on_cloud=vm_utilization_on_cloud,
+        vm_utilization_on_mobile=vm_utilization_on_mobile,
+    )
+    return Scenario(app_profile=profile, number_of_mobile_devices=number_of_mobile_devices)
+
+
+def test_reset_and_step_return_batched_float32_states():
+    env = VecMECOffloadEnv([_make_scenario()] * 8, seed=1)
+    states = env.reset()
+    assert states.shape == (8, config.STATE_DIM)
+    assert states.dtype == np.float32
+
+    states, rewards, dones, info = env.step(np.zeros(8, dtype=np.int64))
+    assert states.shape == (8, config.STATE_DIM)
+    assert rewards.shape == dones.shape == info["failed"].shape == (8,)
+
+
+def test_device_tier_reward_is_pure_processing_time():
+    env = VecMECOffloadEnv([_make_scenario(vm_utilization_on_mobile=5.0)] * 4, seed=2)
+    env.reset()
+    lengths = env.tasks[:, 0].copy()
+    _, rewards, _, info = env.step(np.zeros(4, dtype=np.int64))
+    assert not info["failed"].any()
+    np.testing.assert_array_equal(info["delay"], 0.0)
+    np.testing.assert_allclose(-rewards, lengths / config.MOBILE_VM_MIPS)
+
+
+def test_environments_do_not_share_utilization():
+    env = VecMECOffloadEnv([_make_scenario()] * 2, seed=3)
+    env.reset()
+    cloud = config.ACTION_DIM - 1
+    env.step(np.array([cloud, 0]))
+    assert env.utilization[0, cloud] > 0.0
+    assert env.utilization[1, cloud] == 0.0
+
+
+def test_occupied_capacity_is_released_after_processing_time():
+    # no background devices: the only edge load is the one task placed here
+    env = VecMECOffloadEnv([_make_scenario(poisson_interarrival=100.0)] * 3, seed=4)
+    env.reset()
+    env.step(np.ones(3, dtype=np.int64))
+    for _ in range(5):
+        env.step(np.zeros(3, dtype=np.int64))
+    assert np.all(env.utilization[:, 1] == 0.0)
+
+
+def test_background_contention_scales_with_device_count_per_env():
+    env = VecMECOffloadEnv([_make_scenario(number_of_mobile_devices=2, poisson_interarrival=5.0),
+                            _make_scenario(number_of_mobile_devices=2000, poisson_interarrival=5.0)],
+                           seed=5)
+    env.reset()
+    for _ in range(20):
+        env.step(np.zeros(2, dtype=np.int64))
+    edge_load = env.utilization[:, 1:1 + env.n_edge].sum(axis=1)
+    assert edge_load[1] > edge_load[0]
+    assert env.utilization[1, -1] > env.utilization[0, -1]
+
+
+def test_background_contention_never_exceeds_saturation_ceiling():
+    env = VecMECOffloadEnv([_make_scenario(number_of_mobile_devices=2000, poisson_interarrival=1.0)] * 4,
+                           seed=6)
+    env.reset()
+    for _ in range(50):
+        env.step(np.zeros(4, dtype=np.int64))
+    assert np.all(env.utilization[:, 1:] <= _SATURATION_CEILING + 1e-9)
+
+
+def test_non_default_edge_count_sizes_states_and_range_checks_actions():
+    env = VecMECOffloadEnv([_make_scenario()] * 2, num_edge_servers=4, seed=7)
+    assert env.reset().shape == (2, 4 + 4 + 1 + 3)
+    states, _, _, _ = env.step(np.array([5, 2]))
+    assert states.shape == (2, 12)
+    for bad in ([0, 6], [-1, 0]):
+        with pytest.raises(ValueError):
+            env.step(np.array(bad))
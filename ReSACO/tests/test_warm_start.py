@@ -0,0 +1,73 @@
+"""Tests for resaco/warm_start.py: burned-in reset states, cached on disk."""
+
+import numpy as np
+import pytest
+
+from resaco import warm_start
+from resaco.env import MECOffloadEnv
+from resaco.scenario import AppProfile, Scenario
+from resaco.warm_start import WarmStartCache, burn_in_states
+
+
+def _make_scenario(number_of_mobile_devices=400):
+    profile = AppProfile(
+        name="TEST_APP", usage_percentage=100.0, poisson_interarrival=2.0,
+        delay_sensitivity=0.5, active_period=30.0, idle_period=30.0,
+        data_upload=200.0, data_download=200.0, task_length=3000.0, required_core=1,
+        vm_utilization_on_edge=1.0, vm_utilization_on_cloud=0.5, vm_utilization_on_mobile=5.0,
+    )
+    return Scenario(app_profile=profile, number_of_mobile_devices=number_of_mobile_devices)
+
+
+def _small_cache(tmp_path):
+    return WarmStartCache(str(tmp_path), num_states=8, burn_in_steps=50, stride=3)
+
+
+def test_burned_in_states_are_loaded_and_consistent():
+    states = burn_in_states(_make_scenario(), num_states=8, burn_in_steps=50, stride=3)
+    assert len(states) == 8
+    assert states.release_ptr[-1] == len(states.release_offset)
+    assert np.all(states.release_offset > 0)
+    assert states.utilization[:, 1:].sum() > 0  # edge/cloud actually loaded
+    for i in range(len(states)):
+        utilization, releases = states.state(i)
+        held = np.zeros_like(utilization)
+        for _, slot, delta in releases:
+            held[slot] += delta
+        np.testing.assert_allclose(held, utilization, atol=1e-9)
+
+
+def test_cache_is_built_once_then_read_from_disk(tmp_path, monkeypatch):
+    scenario = _make_scenario()
+    built = _small_cache(tmp_path).get(scenario)
+    assert (tmp_path / "TEST_APP_400.npz").exists()
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("cache hit should not burn in again")
+
+    monkeypatch.setattr(warm_start, "burn_in_states", _fail)
+    loaded = _small_cache(tmp_path).get(scenario)
+    np.testing.assert_array_equal(loaded.utilization, built.utilization)
+    np.testing.assert_array_equal(loaded.release_offset, built.release_offset)
+
+
+def test_reset_starts_from_a_cached_state(tmp_path):
+    scenario = _make_scenario()
+    states = _small_cache(tmp_path).get(scenario)
+    env = MECOffloadEnv(scenario, seed=3, warm_start=states)
+    for _ in range(5):
+        env.reset()
+        assert env.clock == 0.0
+        match = [i for i in range(len(states)) if np.array_equal(env._util_np, states.utilization[i])]
+        assert match
+        _, releases = states.state(match[0])
+        assert len(env._pending_release) == len(releases)
+        assert all(entry[0] > 0 for entry in env._pending_release)
+        env.step(0)
+
+
+def test_warm_start_requires_default_background_mode(tmp_path):
+    scenario = _make_scenario()
+    states = _small_cache(tmp_path).get(scenario)
+    with pytest.raises(ValueError):
+        MECOffloadEnv(scenario, warm_start=states, background_mode="fluid")